@@ -343,7 +343,7 @@ class OpFromGraph(Op, HasInnerGraph):
         .. warning::
 
             rop overrides is ignored when `pytensor.gradient.Rop` is called with
-            `use_op_rop_implementation=False` (default). In this case the Lop
+            `use_op_rop_implementation=False`. In this case the Lop
             is used twice to obtain a mathematically equivalent Rop.
 
         strict: bool, default False
@@ -651,6 +651,8 @@ class OpFromGraph(Op, HasInnerGraph):
             Rop,
             wrt=inner_inputs,
             eval_points=eval_points,
+            # Outputs that don't depend on the inputs have zero tangents
+            disconnected_outputs="ignore",
             use_op_rop_implementation=True,
         )
 
@@ -721,6 +723,11 @@ class OpFromGraph(Op, HasInnerGraph):
 
     def R_op(self, inputs, eval_points):
         rop_op = self._build_and_cache_rop_op()
+        # The inputs that don't depend on the `wrt` of `Rop` have zero tangents
+        eval_points = [
+            inp.zeros_like() if ev is None else ev
+            for inp, ev in zip(inputs, eval_points, strict=True)
+        ]
         return rop_op(*inputs, *eval_points, return_list=True)
 
     def __call__(self, *inputs, **kwargs):
@@ -673,24 +673,17 @@ class ProfileStats:
 
         print(header_str, file=file)
 
-        topos = {}  # Only do the topo once per fct.
         atimes = []
         for (fgraph, a), t in self.apply_time.items():
-            if fgraph not in topos:
-                topo = fgraph.toposort()
-                topos[fgraph] = topo
-            else:
-                topo = topos[fgraph]
             atimes.append(
                 (
                     t * 100 / local_time,
                     t,
                     a,
-                    topo.index(a),
+                    fgraph.freeze().node_ids[a],
                     self.apply_callcount[(fgraph, a)],
                 )
             )
-        del topos
 
         atimes.sort(reverse=True, key=lambda t: (t[1], t[3]))
         tot = 0
@@ -1214,7 +1207,7 @@ class ProfileStats:
                 for key, val in nodes_mem.items()
             )
 
-            order = fgraph.toposort()
+            order = fgraph.freeze().nodes
             # A list of intermediate variable that are not need
             # after the execution of the corresponding node.
             # It mean that after executing the node,
@@ -937,6 +937,17 @@ def add_multiprocessing_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "openmp_tuned_minsize",
+        "If True, element wise ops use the minimum sizes for the openmp "
+        "parallelization measured on this machine by "
+        "pytensor.tensor.openmp_tuning.tune for their scalar operations, "
+        "dtype and number of threads, when they are available in the "
+        "compiledir, instead of openmp_elemwise_minsize.",
+        BoolParam(True),
+        in_c_key=False,
+    )
+
 
 def add_optimizer_configvars():
     config.add(
@@ -983,6 +994,24 @@ def add_optimizer_configvars():
         FloatParam(8),
         in_c_key=False,
     )
+    config.add(
+        "shape_feature__lazy",
+        "If True, the ShapeFeature used during rewrites only infers the shapes "
+        "that rewrites ask for, instead of the shapes of every variable in the "
+        "graph. This reduces memory usage and rewrite time on large graphs, "
+        "but shape information of replaced variables is merged less often.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+    config.add(
+        "rematerialize__memory_budget",
+        "Peak memory budget, in bytes, of the `rematerialize` rewrite. When it is "
+        "greater than 0, intermediate results are recomputed right before "
+        "their later uses, instead of being kept alive, until the estimated "
+        "peak memory of a function is within the budget. 0 disables it.",
+        IntParam(0, _is_greater_or_equal_0),
+        in_c_key=False,
+    )
     config.add(
         "cycle_detection",
         "If cycle_detection is set to regular, most inplaces are allowed,"
@@ -1111,6 +1140,15 @@ def add_numba_configvars():
         BoolParam(True),
         in_c_key=False,
     )
+    config.add(
+        "numba__parallel_blockwise",
+        (
+            "If True, split the batches of Blockwise Ops across threads with "
+            "Numba's parallel loops. The core Ops must not have side effects."
+        ),
+        BoolParam(False),
+        in_c_key=False,
+    )
 
 
 def _default_compiledirname() -> str:
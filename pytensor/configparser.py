@@ -134,12 +134,15 @@ class PyTensorConfigParser:
     # add_multiprocessing_configvars
     openmp: bool
     openmp_elemwise_minsize: int
+    openmp_tuned_minsize: bool
     # add_optimizer_configvars
     optimizer_excluding: str
     optimizer_including: str
     optimizer_requiring: str
     optdb__position_cutoff: float
     optdb__max_use_ratio: float
+    shape_feature__lazy: bool
+    rematerialize__memory_budget: int
     cycle_detection: str
     check_stack_trace: str
     # add_metaopt_configvars
@@ -159,6 +162,7 @@ class PyTensorConfigParser:
     numba__vectorize_target: str
     numba__fastmath: bool
     numba__cache: bool
+    numba__parallel_blockwise: bool
     # add_caching_dir_configvars
     compiledir_format: str
     base_compiledir: Path
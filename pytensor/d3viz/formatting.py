@@ -132,7 +132,12 @@ class PyDotFormatter:
             fgraph = FunctionGraph(inputs=graph_inputs(fct), outputs=fct)
 
         outputs = fgraph.outputs
-        topo = fgraph.toposort()
+        if isinstance(fct, Function):
+            # The graph of a compiled function doesn't change, so its snapshot
+            # is reused by later calls
+            topo = fgraph.freeze().nodes
+        else:
+            topo = fgraph.toposort()
         outputs = list(outputs)
 
         # Loop over apply nodes
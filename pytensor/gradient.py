@@ -2,7 +2,8 @@
 
 import time
 import warnings
-from collections.abc import Callable, Mapping, MutableSequence, Sequence
+from collections.abc import Callable, Iterator, Mapping, MutableSequence, Sequence
+from contextlib import contextmanager
 from functools import partial, reduce
 from typing import TYPE_CHECKING, Literal, TypeVar, Union, overload
 
@@ -29,6 +30,59 @@ V = TypeVar("V", bound=Variable | None)
 grad_time: float = 0.0
 
 
+class GradCache:
+    r"""The adjoints built by `grad`, for reuse by later calls.
+
+    The adjoints are keyed on the ``cost``, ``consider_constant`` and
+    ``known_grads`` arguments of `grad`.  Only the adjoints of the
+    `Variable`\s through which the gradient flows are kept, because they do
+    not depend on ``wrt``; later calls that differentiate the same cost,
+    possibly with respect to other variables, start from these adjoints
+    instead of redoing the whole backward pass, and their results share
+    the same sub-graphs.
+
+    """
+
+    def __init__(self):
+        # (cost, consider_constant, known_grads, add_names) -> {var: adjoint}
+        self.adjoints: dict[tuple, dict[Variable, Variable]] = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.adjoints)
+
+
+_GRAD_CACHE: GradCache | None = None
+
+
+@contextmanager
+def memoize_grads() -> Iterator[GradCache]:
+    r"""Reuse the adjoints built by the `grad` calls within this context manager.
+
+    .. code-block:: python
+
+        with memoize_grads() as cache:
+            g_x = grad(cost, x)
+            g_xy = grad(cost, [x, y])
+
+        assert g_xy[0] is g_x
+        assert cache.hits == 1
+
+    This also applies to the functions built on top of `grad`, like `hessian`.
+    The cache holds references to all the adjoints built within the context,
+    and is discarded when leaving it.
+
+    """
+    global _GRAD_CACHE
+    old_cache = _GRAD_CACHE
+    cache = GradCache()
+    try:
+        _GRAD_CACHE = cache
+        yield cache
+    finally:
+        _GRAD_CACHE = old_cache
+
+
 # TODO: Add `overload` variants
 def as_list_or_tuple(
     use_list: bool, use_tuple: bool, outputs: V | Sequence[V]
@@ -179,7 +233,28 @@ def pushforward_through_pullback(
     )
 
 
-def _rop_legacy(
+def _node_rop_through_pullback(
+    node: Apply, eval_points: Sequence[Variable | None]
+) -> Sequence[Variable | None]:
+    r"""Compute the R-operator of a single node through two applications of its pullback.
+
+    This is used for the `Op`\s that don't implement `Op.R_op`, so that only
+    their own (small) graphs, and not the whole graph, are differentiated twice.
+    """
+    inputs = [
+        inp for inp, ev in zip(node.inputs, eval_points, strict=True) if ev is not None
+    ]
+    tangents = [ev for ev in eval_points if ev is not None]
+    return pushforward_through_pullback(
+        node.outputs,
+        inputs,
+        tangents,
+        disconnected_outputs="ignore",
+        return_disconnected="none",
+    )
+
+
+def _rop_forward(
     f: Sequence[Variable],
     wrt: Sequence[Variable],
     eval_points: Sequence[Variable],
@@ -188,159 +263,88 @@ def _rop_legacy(
 ) -> Sequence[Variable | None]:
     """Computes the R-operator applied to `f` with respect to `wrt` at `eval_points`.
 
-    Mathematically this stands for the Jacobian of `f` right multiplied by the
-    `eval_points`.
+    The tangents are pushed forward, node by node in topological order, with
+    the `Op.R_op` method of each node; nodes whose `Op` doesn't implement it
+    fall back to `_node_rop_through_pullback`.  Variables that don't depend
+    on `wrt` have no tangent, which is signalled to `Op.R_op` by a ``None``
+    evaluation point.
 
-    Parameters
-    ----------
-    f
-        The outputs of the computational graph to which the R-operator is
-        applied.
-    wrt
-        Variables for which the R-operator of `f` is computed.
-    eval_points
-        Points at which to evaluate each of the variables in `wrt`.
-    disconnected_outputs
-        Defines the behaviour if some of the variables in `f`
-        have no dependency on any of the variable in `wrt` (or if
-        all links are non-differentiable). The possible values are:
-
-        - ``'ignore'``: considers that the gradient on these parameters is zero.
-        - ``'warn'``: consider the gradient zero, and print a warning.
-        - ``'raise'``: raise `DisconnectedInputError`.
-
-    return_disconnected
-        - ``'zero'`` : If ``wrt[i]`` is disconnected, return value ``i`` will be
-          ``wrt[i].zeros_like()``.
-        - ``'none'`` : If ``wrt[i]`` is disconnected, return value ``i`` will be
-          ``None``
-        - ``'disconnected'`` : returns variables of type `DisconnectedType`
-
-    Returns
-    -------
-    :class:`~pytensor.graph.basic.Variable` or list/tuple of Variables
-        A symbolic expression such obeying
-        ``R_op[i] = sum_j (d f[i] / d wrt[j]) eval_point[j]``,
-        where the indices in that expression are magic multidimensional
-        indices that specify both the position within a list and all
-        coordinates of the tensor elements.
-        If `f` is a list/tuple, then return a list/tuple with the results.
+    See `Rop` for a description of the parameters and return value.
     """
+    from pytensor.graph.basic import io_toposort
 
-    seen_nodes: dict[Apply, Sequence[Variable]] = {}
+    tangents: dict[Variable, Variable | None] = {}
+    for x, eval_point in zip(wrt, eval_points, strict=True):
+        tangents.setdefault(x, eval_point)
 
-    def _traverse(node):
-        """TODO: writeme"""
+    for node in io_toposort(wrt, f):
+        local_eval_points = [tangents.get(inp) for inp in node.inputs]
+        if all(ev is None for ev in local_eval_points):
+            continue
 
-        if node is None:
-            return
-
-        op = node.op
-        inputs = node.inputs
-
-        # Compute the evaluation points corresponding to each of the
-        # inputs of the node
-        local_eval_points = []
-        for inp in inputs:
-            if inp in wrt:
-                local_eval_points.append(eval_points[wrt.index(inp)])
-            elif inp.owner is None:
-                try:
-                    local_eval_points.append(inp.zeros_like())
-                except Exception:
-                    # None should be used for non-differentiable
-                    # arguments, like for example random states
-                    local_eval_points.append(None)
-            elif inp.owner in seen_nodes:
-                local_eval_points.append(
-                    seen_nodes[inp.owner][inp.owner.outputs.index(inp)]
-                )
-
-            else:
-                # We actually need to compute the R_op for this node
-
-                _traverse(inp.owner)
-                local_eval_points.append(
-                    seen_nodes[inp.owner][inp.owner.outputs.index(inp)]
-                )
         same_type_eval_points = []
-        for x, y in zip(inputs, local_eval_points, strict=True):
+        for x, y in zip(node.inputs, local_eval_points, strict=True):
             if y is not None:
-                if not isinstance(x, Variable):
-                    x = pytensor.tensor.as_tensor_variable(x)
-                if not isinstance(y, Variable):
-                    y = pytensor.tensor.as_tensor_variable(y)
                 try:
                     y = x.type.filter_variable(y)
                 except TypeError:
-                    # This is a hack
-                    # Originally both grad and Rop were written
-                    # with the assumption that a variable and the
-                    # gradient wrt that variable would have the same
-                    # dtype. This was a bad assumption because the
-                    # gradient wrt an integer can take on non-integer
-                    # values.
-                    # grad is now fixed, but Rop is not, so when grad
-                    # does the right thing and violates this assumption
-                    # we have to make it be wrong for Rop to keep working
-                    # Rop should eventually be upgraded to handle integers
-                    # correctly, the same as grad
+                    # The tangents of integer variables (e.g. those given by
+                    # the user) are cast to their dtypes, so that the `Op`s
+                    # can be applied to them
                     y = pytensor.tensor.cast(y, x.type.dtype)
                     y = x.type.filter_variable(y)
                 assert x.type.in_same_class(y.type)
-                same_type_eval_points.append(y)
-            else:
-                same_type_eval_points.append(y)
+            same_type_eval_points.append(y)
 
-        seen_nodes[node] = op.R_op(node.inputs, same_type_eval_points)
+        try:
+            node_tangents = node.op.R_op(node.inputs, same_type_eval_points)
+        except NotImplementedError:
+            node_tangents = _node_rop_through_pullback(node, same_type_eval_points)
 
-    # end _traverse
-
-    # Populate the dictionary
-    for out in f:
-        _traverse(out.owner)
+        for out, tangent in zip(node.outputs, node_tangents, strict=True):
+            if tangent is None or isinstance(tangent.type, DisconnectedType):
+                continue
+            # The tangents of `wrt` are given, even if they have an owner
+            tangents.setdefault(out, tangent)
 
     rval: list[Variable | None] = []
     for out in f:
-        if out in wrt:
-            rval.append(eval_points[wrt.index(out)])
-        elif (
-            seen_nodes.get(out.owner, None) is None
-            or seen_nodes[out.owner][out.owner.outputs.index(out)] is None
-        ):
-            message = (
-                "Rop method was asked to compute the gradient "
-                "with respect to a variable that is not part of "
-                "the computational graph of variables in wrt, or is "
-                f"used only by a non-differentiable operator: {out}"
+        tangent = tangents.get(out)
+        if tangent is not None:
+            rval.append(tangent)
+            continue
+
+        message = (
+            "Rop method was asked to compute the gradient "
+            "with respect to a variable that is not part of "
+            "the computational graph of variables in wrt, or is "
+            f"used only by a non-differentiable operator: {out}"
+        )
+        if disconnected_outputs == "ignore":
+            pass
+        elif disconnected_outputs == "warn":
+            warnings.warn(message, stacklevel=2)
+        elif disconnected_outputs == "raise":
+            message = utils.get_variable_trace_string(out)
+            raise DisconnectedInputError(message)
+        else:
+            raise ValueError(
+                "Invalid value for keyword "
+                "'disconnected_inputs', valid values are "
+                "'ignore', 'warn' and 'raise'."
             )
-            if disconnected_outputs == "ignore":
-                pass
-            elif disconnected_outputs == "warn":
-                warnings.warn(message, stacklevel=2)
-            elif disconnected_outputs == "raise":
-                message = utils.get_variable_trace_string(out)
-                raise DisconnectedInputError(message)
-            else:
-                raise ValueError(
-                    "Invalid value for keyword "
-                    "'disconnected_inputs', valid values are "
-                    "'ignore', 'warn' and 'raise'."
-                )
-            if return_disconnected.lower() == "zero":
-                rval.append(pytensor.tensor.zeros_like(out))
-            elif return_disconnected.lower() == "none":
-                rval.append(None)
-            elif return_disconnected.lower() == "disconnected":
-                rval.append(disconnected_type())
-            else:
-                raise ValueError(
-                    "Invalid value for keyword "
-                    "'return_disconnected', valid values are "
-                    "'zero', 'None' and 'Disconnected'."
-                )
+        if return_disconnected.lower() == "zero":
+            rval.append(pytensor.tensor.zeros_like(out))
+        elif return_disconnected.lower() == "none":
+            rval.append(None)
+        elif return_disconnected.lower() == "disconnected":
+            rval.append(disconnected_type())
         else:
-            rval.append(seen_nodes[out.owner][out.owner.outputs.index(out)])
+            raise ValueError(
+                "Invalid value for keyword "
+                "'return_disconnected', valid values are "
+                "'zero', 'None' and 'Disconnected'."
+            )
 
     return rval
 
@@ -351,20 +355,23 @@ def Rop(
     eval_points: Variable | Sequence[Variable],
     disconnected_outputs: Literal["ignore", "warn", "raise"] = "raise",
     return_disconnected: Literal["none", "zero", "disconnected"] = "zero",
-    use_op_rop_implementation: bool = False,
+    use_op_rop_implementation: bool = True,
 ) -> Variable | None | Sequence[Variable | None]:
     """Computes the R-operator applied to `f` with respect to `wrt` at `eval_points`.
 
     Mathematically this stands for the Jacobian of `f` right multiplied by the
     `eval_points`.
 
-    By default, the R-operator is implemented as a double application of the L_operator [1]_.
-    In most cases this should be as performant as a specialized implementation of the R-operator.
-    However, PyTensor may sometimes fail to prune dead branches or fuse common expressions within composite operators,
-    such as Scan and OpFromGraph, that would be more easily avoidable in a direct implentation of the R-operator.
+    By default, the R-operator is computed in forward mode: the `eval_points` are
+    pushed through the graph with the `Op.R_op` method of each node, so that the
+    result costs about as much as one evaluation of `f`.  The nodes whose `Op`
+    doesn't implement `Op.R_op` are handled by a double application of their own
+    L_operator [1]_.
 
-    When this is a concern, it is possible to force `Rop` to use the specialized `Op.R_op` methods by passing
-    `use_op_rop_implementation=True`. Note that this will fail if the graph contains `Op`s that don't implement this method.
+    Alternatively, the R-operator of the whole graph can be obtained by a double
+    application of the L_operator, by passing `use_op_rop_implementation=False`.
+    This creates larger graphs, that PyTensor may fail to simplify, especially
+    within composite operators such as Scan and OpFromGraph.
 
     Parameters
     ----------
@@ -390,10 +397,11 @@ def Rop(
         - ``'none'`` : If ``wrt[i]`` is disconnected, return value ``i`` will be
           ``None``
         - ``'disconnected'`` : returns variables of type `DisconnectedType`
-    use_op_lop_implementation: bool, default=True
-        If `True`, we obtain Rop via double application of Lop.
-        If `False`, the legacy Rop implementation is used. The number of graphs that support this form
-        is much more restricted, and the generated graphs may be less optimized.
+    use_op_rop_implementation: bool, default=True
+        If `True`, the R-operator is computed in forward mode, using `Op.R_op`
+        where it is implemented.
+        If `False`, it is obtained by a double application of the L-operator
+        on the whole graph.
 
     Returns
     -------
@@ -444,7 +452,7 @@ def Rop(
             pass
 
     if use_op_rop_implementation:
-        rval = _rop_legacy(
+        rval = _rop_forward(
             _f, _wrt, _eval_points, disconnected_outputs, return_disconnected
         )
     else:
@@ -642,7 +650,10 @@ def grad(
     if known_grads is not None:
         outputs.extend(list(known_grads))
 
-    var_to_app_to_idx = _populate_var_to_app_to_idx(outputs, _wrt, consider_constant)
+    connection_patterns: dict[Apply, list[list[bool]]] = {}
+    var_to_app_to_idx = _populate_var_to_app_to_idx(
+        outputs, _wrt, consider_constant, connection_patterns
+    )
 
     # build a dict mapping var to the gradient of cost with respect to var
     grad_dict = {}
@@ -723,6 +734,21 @@ def grad(
                 "'ignore', 'warn' and 'raise'."
             )
 
+    grad_cache = _GRAD_CACHE
+    cache_key: tuple = ()
+    if grad_cache is not None:
+        cache_key = (
+            cost,
+            frozenset(consider_constant or ()),
+            tuple(known_grads.items()),
+            add_names,
+        )
+        cached_adjoints = grad_cache.adjoints.get(cache_key)
+        if cached_adjoints is not None:
+            grad_cache.hits += 1
+            for var, g_var in cached_adjoints.items():
+                grad_dict.setdefault(var, g_var)
+
     # variables that do not influence the cost have zero gradient.
     # if wrt is such a variable, populate the grad_dict with this info
     # so that wrt not being in var_to_app_to_idx won't cause an error below
@@ -745,9 +771,19 @@ def grad(
             assert g.type.dtype in pytensor.tensor.type.float_dtypes
 
     _rval: Sequence[Variable] = _populate_grad_dict(
-        var_to_app_to_idx, grad_dict, _wrt, cost_name
+        var_to_app_to_idx, grad_dict, _wrt, cost_name, connection_patterns
     )
 
+    if grad_cache is not None:
+        # The adjoints of the variables that are not in `var_to_app_to_idx`
+        # depend on `wrt`, e.g. they can be disconnected only because they
+        # aren't a function of `wrt`
+        cached_adjoints = grad_cache.adjoints.setdefault(cache_key, {})
+        for var in var_to_app_to_idx:
+            g_var = grad_dict.get(var)
+            if g_var is not None:
+                cached_adjoints.setdefault(var, g_var)
+
     rval: MutableSequence[Variable | None] = list(_rval)
 
     for i in range(len(_rval)):
@@ -966,7 +1002,9 @@ def _node_to_pattern(node):
     return connection_pattern
 
 
-def _populate_var_to_app_to_idx(outputs, wrt, consider_constant):
+def _populate_var_to_app_to_idx(
+    outputs, wrt, consider_constant, connection_patterns=None
+):
     """
     Helper function for grad function.
 
@@ -982,6 +1020,10 @@ def _populate_var_to_app_to_idx(outputs, wrt, consider_constant):
     consider_constant
         a list of variables not to backpropagate through.
 
+    connection_patterns
+        An optional ``dict`` in which the connection patterns of the nodes
+        are cached, so that they can be reused by `_populate_grad_dict`.
+
     Returns
     -------
     var_to_app_to_idx:
@@ -1029,6 +1071,17 @@ def _populate_var_to_app_to_idx(outputs, wrt, consider_constant):
                     "variables, but got " + str(type(elem))
                 )
 
+    consider_constant = set(consider_constant)
+
+    if connection_patterns is None:
+        connection_patterns = {}
+
+    def node_pattern(node):
+        pattern = connection_patterns.get(node)
+        if pattern is None:
+            pattern = connection_patterns[node] = _node_to_pattern(node)
+        return pattern
+
     # var_to_app_to_idx[var][node] = [i,j] means node has
     # var as input at positions i and j
     var_to_app_to_idx = dict()
@@ -1043,72 +1096,83 @@ def _populate_var_to_app_to_idx(outputs, wrt, consider_constant):
     accounted_for = set()
 
     def account_for(var):
+        """Return the stack frame for `var`, or ``None`` if there's nothing to visit."""
         # Don't visit the same variable twice
         if var in accounted_for:
-            return
+            return None
         accounted_for.add(var)
 
         # Constants are not a function of anything
-        if var in consider_constant:
-            return
-
-        # Recursively add the variables that this variable is
-        # a function of.
-        if var.owner is not None:
-            app = var.owner
-
-            connection_pattern = _node_to_pattern(app)
+        if var in consider_constant or var.owner is None:
+            return None
 
-            var_idx = app.outputs.index(var)
+        return [var.owner, var.index, node_pattern(var.owner), 0]
 
-            for i, ipt in enumerate(app.inputs):
-                # don't process ipt if it is not a true
-                # parent of var
-                if not connection_pattern[i][var_idx]:
-                    continue
-
-                if ipt not in var_to_app_to_idx:
-                    # This object *must* be ordered for the grad graph to be deterministic
-                    var_to_app_to_idx[ipt] = {}
-                app_to_idx = var_to_app_to_idx[ipt]
-                if app not in app_to_idx:
-                    app_to_idx[app] = []
-                idx = app_to_idx[app]
-                if i not in idx:
-                    idx.append(i)
-                account_for(ipt)
-
-    # add all variables that are true ancestors of the cost
+    # Add all variables that are true ancestors of the cost.  This is a
+    # depth-first traversal that uses an explicit stack (instead of recursion,
+    # which can't handle deep graphs), and visits the variables in the same
+    # order as the recursive version, so that the gradient graph is
+    # deterministic.
     for output in outputs:
-        account_for(output)
+        frame = account_for(output)
+        stack = [frame] if frame is not None else []
+        while stack:
+            frame = stack[-1]
+            app, var_idx, connection_pattern, i = frame
+            if i == len(app.inputs):
+                stack.pop()
+                continue
+            frame[3] = i + 1
+
+            # don't process ipt if it is not a true
+            # parent of var
+            if not connection_pattern[i][var_idx]:
+                continue
+
+            ipt = app.inputs[i]
+            app_to_idx = var_to_app_to_idx.get(ipt)
+            if app_to_idx is None:
+                # This object *must* be ordered for the grad graph to be deterministic
+                app_to_idx = var_to_app_to_idx[ipt] = {}
+            idx = app_to_idx.get(app)
+            if idx is None:
+                app_to_idx[app] = [i]
+            elif i not in idx:
+                idx.append(i)
+
+            frame = account_for(ipt)
+            if frame is not None:
+                stack.append(frame)
 
     # determine which variables have elements of wrt as a true
     # ancestor. Do this with an upward pass starting from wrt,
     # following only true connections
     visited = set()
-
-    def visit(var):
+    stack = [elem for elem in wrt if elem in var_to_app_to_idx]
+    while stack:
+        var = stack.pop()
         if var in visited:
-            return
-        if var not in var_to_app_to_idx:
-            return
+            continue
         visited.add(var)
         nodes = var_to_app_to_idx[var]
         for node in nodes:
-            connection_pattern = _node_to_pattern(node)
+            connection_pattern = connection_patterns[node]
             for idx in nodes[node]:
                 for ii, output in enumerate(node.outputs):
-                    if connection_pattern[idx][ii]:
-                        visit(output)
-
-    for elem in wrt:
-        visit(elem)
+                    if (
+                        connection_pattern[idx][ii]
+                        and output not in visited
+                        and output in var_to_app_to_idx
+                    ):
+                        stack.append(output)
 
     # Remove variables that don't have wrt as a true ancestor
-    orig_vars = list(var_to_app_to_idx)
-    for var in orig_vars:
-        if var not in visited:
-            del var_to_app_to_idx[var]
+    if len(visited) != len(var_to_app_to_idx):
+        var_to_app_to_idx = {
+            var: app_to_idx
+            for var, app_to_idx in var_to_app_to_idx.items()
+            if var in visited
+        }
 
     return var_to_app_to_idx
 
@@ -1127,7 +1191,9 @@ class DisconnectedInputError(ValueError):
     """
 
 
-def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
+def _populate_grad_dict(
+    var_to_app_to_idx, grad_dict, wrt, cost_name=None, connection_patterns=None
+):
     """Helper function for grad function.
 
     Parameters
@@ -1152,12 +1218,21 @@ def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
     cost_name: string
         The name of the cost being differentiated, optional.
         Used to name the grad with respect to x as (d<cost_name>/dx)
+    connection_patterns : dict, optional
+        A cache of the nodes' connection patterns, as filled by
+        `_populate_var_to_app_to_idx`.
 
     Returns
     -------
     list of Variables
         A list of gradients corresponding to `wrt`
     """
+    from pytensor.tensor.math import add
+    from pytensor.tensor.variable import TensorVariable
+
+    if connection_patterns is None:
+        connection_patterns = {}
+
     # build a dict mapping node to the terms node contributes to each of
     # its inputs' gradients
     term_dict = {}
@@ -1175,7 +1250,9 @@ def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
                 not isinstance(g.type, DisconnectedType) for g in output_grads
             ]
 
-            connection_pattern = _node_to_pattern(node)
+            connection_pattern = connection_patterns.get(node)
+            if connection_pattern is None:
+                connection_pattern = connection_patterns[node] = _node_to_pattern(node)
 
             # list of bools indicating if each input is connected to the cost
             inputs_connected = [
@@ -1522,6 +1599,12 @@ def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
                     # At least one term is a NullType : the total gradient
                     # will also be a NullType
                     grad_dict[var] = null_terms[0]
+                elif len(terms) > 1 and all(
+                    isinstance(term, TensorVariable) for term in terms
+                ):
+                    # Sum all the terms at once, instead of building a chain
+                    # of binary additions
+                    grad_dict[var] = add(*terms)
                 elif len(terms) > 0:
                     # the next line is like sum(terms) but doesn't add an
                     # extraneous TensorConstant(0)
@@ -1538,6 +1621,38 @@ def _populate_grad_dict(var_to_app_to_idx, grad_dict, wrt, cost_name=None):
         # end if cache miss
         return grad_dict[var]
 
+    # Compute the terms in one sweep over the nodes in reverse topological
+    # order, i.e. in the order in which the (recursive) cache accessors would
+    # first need them, so that the recursion never goes deeper than one node.
+    # The order is the post-order of a depth-first traversal that goes from
+    # the variables to the nodes using them, and from there to their outputs.
+    visited = set()
+    for elem in wrt:
+        if elem in grad_dict or elem not in var_to_app_to_idx:
+            continue
+        stack = [iter(var_to_app_to_idx[elem])]
+        nodes_stack = []
+        while stack:
+            for node in stack[-1]:
+                if node not in visited:
+                    visited.add(node)
+                    nodes_stack.append(node)
+                    stack.append(
+                        iter(
+                            [
+                                app
+                                for out in node.outputs
+                                if out not in grad_dict
+                                for app in var_to_app_to_idx.get(out, ())
+                            ]
+                        )
+                    )
+                    break
+            else:
+                stack.pop()
+                if nodes_stack:
+                    access_term_cache(nodes_stack.pop())
+
     rval = [access_grad_cache(elem) for elem in wrt]
 
     return rval
@@ -1606,7 +1721,7 @@ class numeric_grad:
         np.dtype("float16"): 1e-1,
     }
 
-    def __init__(self, f, pt, eps=None, out_type=None):
+    def __init__(self, f, pt, eps=None, out_type=None, batch_size=None):
         """Return the gradient of f at pt.
 
         This function computes the gradient by a one-sided finite
@@ -1625,6 +1740,11 @@ class numeric_grad:
         eps : float, optional
             The stepsize for the finite differencing.  None means
             input dtype-dependent. See `type_eps`.
+        batch_size : int, optional
+            If given, `f` is called on up to `batch_size` perturbed points at
+            once: its inputs have an extra leading dimension, with one entry
+            per point, and it must return a vector with the value at each
+            point.  None means one point per call.
         """
 
         def prod(inputs):
@@ -1677,6 +1797,27 @@ class numeric_grad:
             apt[i][...] = p
             cur_pos += p_size
 
+        if batch_size is not None:
+            f_x = f(*[p[None].copy() for p in apt])[0]
+            for start in range(0, total_size, batch_size):
+                stop = min(start + batch_size, total_size)
+                # One row of perturbed inputs per element of x
+                batch_x = np.tile(x, (stop - start, 1))
+                batch_x[np.arange(stop - start), np.arange(start, stop)] += eps
+                batch_pt = []
+                cur_pos = 0
+                for shape in shapes:
+                    p_size = prod(shape)
+                    batch_pt.append(
+                        batch_x[:, cur_pos : cur_pos + p_size].reshape((-1, *shape))
+                    )
+                    cur_pos += p_size
+                gx[start:stop] = (f(*batch_pt) - f_x) / eps
+
+            if packed_pt:
+                self.gf = self.gf[0]
+            return
+
         f_x = f(*[p.copy() for p in apt])
 
         # now iterate over the elements of x, and call f on apt.
@@ -1809,6 +1950,8 @@ def verify_grad(
     mode: Union["Mode", str] | None = None,
     cast_to_output_type: bool = False,
     no_debug_ref: bool = True,
+    batch_size: int | None = None,
+    n_directions: int | None = None,
 ):
     """Test a gradient by Finite Difference Method. Raise error on failure.
 
@@ -1858,6 +2001,17 @@ def verify_grad(
         float16 is not handled here.
     no_debug_ref
         Don't use `DebugMode` for the numerical gradient function.
+    batch_size
+        If given, the cost is vectorized over a leading dimension of
+        perturbed inputs with `vectorize_graph`, and evaluated on up to
+        `batch_size` of them per call, instead of once per perturbation.
+    n_directions
+        If given, only the derivatives of the cost along `n_directions` random
+        directions of the inputs are checked, instead of every entry of the
+        gradient, which requires one perturbation per direction rather than
+        one per input element.  This is meant for very large inputs.  The
+        perturbations are evaluated in batches of `batch_size`, or all at
+        once if it isn't given.
 
     Notes
     -----
@@ -1957,36 +2111,140 @@ def verify_grad(
 
     grad_fn = fn_maker(tensor_pt, symbolic_grad, name="gradient.py symbolic grad")
 
-    for test_num in range(n_tests):
-        num_grad = numeric_grad(cost_fn, [p.copy() for p in pt], eps, out_type)
+    if batch_size is not None or n_directions is not None:
+        batched_pt = [
+            pytensor.tensor.tensor(dtype=p_t.type.dtype, shape=(None, *p_t.type.shape))
+            for p_t in tensor_pt
+        ]
+        batched_cost = vectorize_graph(
+            cost, replace=dict(zip(tensor_pt, batched_pt, strict=True))
+        )
+        batched_cost_fn = fn_maker(
+            batched_pt,
+            batched_cost,
+            name="gradient.py batched cost",
+            mode=mode_for_cost,
+        )
 
+        def cost_fn_batched(*batch_pt):
+            # The cost may not depend on the inputs at all
+            return np.broadcast_to(batched_cost_fn(*batch_pt), (len(batch_pt[0]),))
+
+    for test_num in range(n_tests):
         analytic_grad = grad_fn(*[p.copy() for p in pt])
 
         # Since `tensor_pt` is a list, `analytic_grad` should be one too.
         assert isinstance(analytic_grad, list)
 
-        max_arg, max_err_pos, max_abs_err, max_rel_err = num_grad.max_err(
-            analytic_grad, abs_tol, rel_tol
-        )
-
-        if max_abs_err > abs_tol and max_rel_err > rel_tol:
-            raise GradientError(
-                max_arg,
-                max_err_pos,
-                analytic_grad[max_arg].shape,
-                analytic_grad[max_arg].flatten()[max_err_pos],
-                num_grad.gf[max_arg].flatten()[max_err_pos],
-                max_abs_err,
-                max_rel_err,
+        if n_directions is not None:
+            _verify_directional_grad(
+                cost_fn_batched,
+                pt,
+                analytic_grad,
+                n_directions,
+                batch_size,
+                rng,
+                eps,
                 abs_tol,
                 rel_tol,
             )
+        else:
+            if batch_size is not None:
+                num_grad = numeric_grad(
+                    cost_fn_batched, [p.copy() for p in pt], eps, out_type, batch_size
+                )
+            else:
+                num_grad = numeric_grad(cost_fn, [p.copy() for p in pt], eps, out_type)
+
+            max_arg, max_err_pos, max_abs_err, max_rel_err = num_grad.max_err(
+                analytic_grad, abs_tol, rel_tol
+            )
+
+            if max_abs_err > abs_tol and max_rel_err > rel_tol:
+                raise GradientError(
+                    max_arg,
+                    max_err_pos,
+                    analytic_grad[max_arg].shape,
+                    analytic_grad[max_arg].flatten()[max_err_pos],
+                    num_grad.gf[max_arg].flatten()[max_err_pos],
+                    max_abs_err,
+                    max_rel_err,
+                    abs_tol,
+                    rel_tol,
+                )
 
         # get new random projection for next test
         if test_num < n_tests - 1:
             t_r.set_value(random_projection(), borrow=True)
 
 
+def _verify_directional_grad(
+    batched_cost_fn,
+    pt,
+    analytic_grad,
+    n_directions,
+    batch_size,
+    rng,
+    eps,
+    abs_tol,
+    rel_tol,
+):
+    """Compare the derivatives of a cost along random directions with finite differences.
+
+    `batched_cost_fn` evaluates the cost on a batch of points, given with an
+    extra leading dimension.  Raises a `GradientError` if the derivative along
+    any of the directions is wrong.
+
+    """
+    if eps is None:
+        eps = max(numeric_grad.type_eps[p.dtype] for p in pt)
+    if batch_size is None:
+        batch_size = n_directions
+
+    # Random unit directions across all the inputs
+    directions = [rng.standard_normal((n_directions, *p.shape)) for p in pt]
+    norms = np.sqrt(
+        sum((d**2).reshape(n_directions, -1).sum(axis=1) for d in directions)
+    )
+    perturbed = []
+    for p, d in zip(pt, directions, strict=True):
+        norm = norms.reshape((-1,) + (1,) * p.ndim)
+        perturbed.append((p + eps * d / norm).astype(p.dtype))
+    # The directions actually followed, after rounding in the inputs' dtypes
+    directions = [
+        (x - p).astype("float64") / eps for x, p in zip(perturbed, pt, strict=True)
+    ]
+    analytic = sum(
+        (d * g).reshape(n_directions, -1).sum(axis=1)
+        for d, g in zip(directions, analytic_grad, strict=True)
+    )
+
+    f_x = batched_cost_fn(*[p[None] for p in pt])[0]
+    numeric = np.empty(n_directions)
+    for start in range(0, n_directions, batch_size):
+        stop = min(start + batch_size, n_directions)
+        numeric[start:stop] = (
+            batched_cost_fn(*[x[start:stop] for x in perturbed]) - f_x
+        ) / eps
+
+    abs_err, rel_err = numeric_grad.abs_rel_err(analytic, numeric)
+    if not np.all(np.isfinite(abs_err)):
+        raise ValueError("abs_err not finite", repr(abs_err))
+    max_pos = np.minimum(abs_err / abs_tol, rel_err / rel_tol).argmax()
+    if abs_err[max_pos] > abs_tol and rel_err[max_pos] > rel_tol:
+        raise GradientError(
+            "directions",
+            max_pos,
+            (n_directions,),
+            analytic[max_pos],
+            numeric[max_pos],
+            abs_err[max_pos],
+            rel_err[max_pos],
+            abs_tol,
+            rel_tol,
+        )
+
+
 class GradientError(Exception):
     """This error is raised when a gradient is incorrectly calculated."""
 
@@ -2127,6 +2385,347 @@ def jacobian(
     return as_list_or_tuple(using_list, using_tuple, jacobian_matrices)
 
 
+def jacobian_sparsity(expression, wrt, consider_constant=None):
+    r"""Find the structural sparsity pattern of the Jacobian of `expression` with respect to `wrt`.
+
+    The pattern is found by propagating, through the graph, which elements of
+    `wrt` each element of each intermediate variable depends on.  `Elemwise`\s,
+    `CAReduce`\s, `Dot`\s with a constant operand and the `Op`\s that only move
+    elements around (e.g. `DimShuffle`, `Reshape`, `Subtensor` and `Join`,
+    with constant indices and shapes) are handled exactly; any other `Op` is
+    assumed to make each of its output elements depend on all the elements its
+    inputs depend on.  The pattern can thus contain entries that are always
+    zero, but it never misses a non-zero entry.
+
+    Parameters
+    ----------
+    expression : Variable
+        The variable that is differentiated.  Its shape, as well as the shapes
+        of `wrt` and of the intermediate variables, must be known at graph
+        construction time (e.g. through `specify_shape`).
+    wrt : Variable
+        The variable with respect to which `expression` is differentiated.
+    consider_constant : list of variables
+        Expressions not to backpropagate through.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        A boolean matrix with one row per element of `expression` and one
+        column per element of `wrt`, both flattened in C order.
+    """
+    import scipy.sparse as sp
+
+    from pytensor.graph.basic import Constant, io_toposort
+    from pytensor.tensor.basic import Alloc, Join
+    from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise
+    from pytensor.tensor.math import Dot
+    from pytensor.tensor.shape import Reshape, SpecifyShape
+    from pytensor.tensor.subtensor import (
+        AdvancedSubtensor,
+        AdvancedSubtensor1,
+        Subtensor,
+    )
+
+    # `Op`s that only move the elements of their first input around
+    movement_ops = (
+        DimShuffle,
+        Subtensor,
+        AdvancedSubtensor1,
+        AdvancedSubtensor,
+        Reshape,
+        SpecifyShape,
+        Alloc,
+        ViewOp,
+    )
+
+    shapes: dict[Variable, tuple[int, ...]] = {}
+
+    def static_shape(var):
+        shape = shapes.get(var)
+        if shape is None:
+            shape = getattr(var.type, "shape", None)
+            if shape is None or None in shape:
+                raise ValueError(
+                    f"The shape of {var} must be known at graph construction time "
+                    "to find the sparsity pattern of a Jacobian"
+                )
+            shape = shapes[var] = tuple(shape)
+        return shape
+
+    def selection(rows, cols, shape):
+        return sp.csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)), shape=shape
+        )
+
+    def gather(source, n_sources):
+        # Each element of the output depends on the input element `source` points to
+        source = np.asarray(source).ravel()
+        return selection(np.arange(source.size), source, (source.size, n_sources))
+
+    n = int(np.prod(static_shape(wrt)))
+    patterns: dict[Variable, sp.csr_matrix | None] = {
+        wrt: sp.identity(n, dtype=bool, format="csr")
+    }
+    constants = set(consider_constant or ())
+
+    def movement_rules(node, data_positions):
+        # Run the `Op` itself on the (offset) positions of the input elements
+        values = []
+        sources = []
+        offset = 0
+        for i, inp in enumerate(node.inputs):
+            if i in data_positions:
+                size = int(np.prod(static_shape(inp)))
+                values.append(
+                    np.arange(offset, offset + size).reshape(static_shape(inp))
+                )
+                sources.append((inp, offset, size))
+                offset += size
+            elif isinstance(inp, Constant):
+                values.append(inp.data)
+            else:
+                return None
+        storage = [[None] for _ in node.outputs]
+        try:
+            node.op.perform(node, values, storage)
+        except (TypeError, ValueError):
+            return None
+        res = np.asarray(storage[0][0])
+        if res.dtype.kind == "f":
+            # Some `Op`s cast to their output's dtype, e.g. `Join`
+            res = res.astype(np.int64)
+        elif res.dtype.kind not in "iu":
+            return None
+
+        shapes[node.outputs[0]] = res.shape
+        flat = res.ravel()
+        rules = []
+        for inp, offset, size in sources:
+            rows = np.flatnonzero((flat >= offset) & (flat < offset + size))
+            rules.append((inp, selection(rows, flat[rows] - offset, (flat.size, size))))
+        return rules
+
+    def rules_for(node):
+        """Return ``(input, R)`` pairs, where ``R[i, j]`` says if output element ``i`` depends on input element ``j``."""
+        op = node.op
+        if len(node.outputs) != 1:
+            return None
+
+        if isinstance(op, Elemwise):
+            out_shape = np.broadcast_shapes(*(static_shape(i) for i in node.inputs))
+            shapes[node.outputs[0]] = out_shape
+            rules = []
+            for inp in node.inputs:
+                in_shape = static_shape(inp)
+                size = int(np.prod(in_shape))
+                idx = np.broadcast_to(np.arange(size).reshape(in_shape), out_shape)
+                rules.append((inp, gather(idx, size)))
+            return rules
+
+        if isinstance(op, CAReduce):
+            [x] = node.inputs
+            in_shape = static_shape(x)
+            axis = tuple(range(len(in_shape))) if op.axis is None else op.axis
+            idx = np.moveaxis(
+                np.arange(int(np.prod(in_shape))).reshape(in_shape),
+                axis,
+                range(-len(axis), 0),
+            )
+            out_size = int(np.prod(idx.shape[: idx.ndim - len(axis)]))
+            groups = idx.reshape(out_size, -1)
+            return [
+                (
+                    x,
+                    selection(
+                        np.repeat(np.arange(out_size), groups.shape[1]),
+                        groups.ravel(),
+                        (out_size, idx.size),
+                    ),
+                )
+            ]
+
+        if isinstance(op, Dot):
+            a, b = node.inputs
+            a_shape, b_shape = static_shape(a), static_shape(b)
+            m, k = (1, *a_shape) if len(a_shape) == 1 else a_shape
+            p = 1 if len(b_shape) == 1 else b_shape[1]
+            a_mask = (
+                (a.data != 0).reshape(m, k)
+                if isinstance(a, Constant)
+                else np.ones((m, k), dtype=bool)
+            )
+            b_mask = (
+                (b.data != 0).reshape(k, p)
+                if isinstance(b, Constant)
+                else np.ones((k, p), dtype=bool)
+            )
+            # out[i, j] depends on a[i, l] and b[l, j] when the other one isn't zero
+            return [
+                (a, sp.kron(sp.identity(m, dtype=bool), b_mask.T, format="csr")),
+                (b, sp.kron(a_mask, sp.identity(p, dtype=bool), format="csr")),
+            ]
+
+        if isinstance(op, Join):
+            return movement_rules(node, range(1, len(node.inputs)))
+
+        if isinstance(op, movement_ops):
+            return movement_rules(node, (0,))
+
+        return None
+
+    for node in io_toposort([wrt], [expression]):
+        if not any(patterns.get(inp) is not None for inp in node.inputs):
+            continue
+
+        rules = rules_for(node)
+        if rules is None:
+            # Assume that every output element depends on everything the
+            # inputs depend on
+            cols = np.unique(
+                np.concatenate(
+                    [
+                        patterns[inp].indices
+                        for inp in node.inputs
+                        if patterns.get(inp) is not None
+                    ]
+                )
+            )
+            for out in node.outputs:
+                size = int(np.prod(static_shape(out)))
+                patterns[out] = selection(
+                    np.repeat(np.arange(size), cols.size),
+                    np.tile(cols, size),
+                    (size, n),
+                )
+        else:
+            pattern = None
+            for inp, rule in rules:
+                inp_pattern = patterns.get(inp)
+                if inp_pattern is None:
+                    continue
+                term = rule @ inp_pattern
+                pattern = term if pattern is None else pattern + term
+            patterns[node.outputs[0]] = pattern
+
+        for out in node.outputs:
+            if out in constants:
+                patterns[out] = None
+
+    m = int(np.prod(static_shape(expression)))
+    pattern = patterns.get(expression)
+    if pattern is None:
+        return sp.csr_matrix((m, n), dtype=bool)
+    pattern = sp.csr_matrix(pattern, dtype=bool)
+    pattern.eliminate_zeros()
+    pattern.sort_indices()
+    return pattern
+
+
+def _color_rows(sparsity) -> tuple[np.ndarray, int]:
+    """Greedily color the rows of a sparsity pattern so that rows with the same color have no columns in common.
+
+    Rows are colored in decreasing order of their number of conflicts (i.e.
+    the "largest first" ordering), which usually gives few colors.
+    """
+    conflicts = (sparsity.astype(np.int32) @ sparsity.T.astype(np.int32)).tocsr()
+    indptr, indices = conflicts.indptr, conflicts.indices
+    colors = np.full(sparsity.shape[0], -1, dtype=np.intp)
+    for row in np.argsort(-np.diff(indptr), kind="stable"):
+        used = set(colors[indices[indptr[row] : indptr[row + 1]]].tolist())
+        color = 0
+        while color in used:
+            color += 1
+        colors[row] = color
+    return colors, int(colors.max()) + 1 if colors.size else 0
+
+
+def sparse_jacobian(
+    expression,
+    wrt,
+    consider_constant=None,
+    disconnected_inputs="raise",
+    sparsity=None,
+):
+    r"""Compute a structurally sparse Jacobian with one backward pass per color of its rows.
+
+    Rows of the Jacobian that have no non-zero columns in common are given the
+    same "color", and all the rows of a color are computed by a single
+    vector-Jacobian product (`Lop`), seeded with the sum of their unit
+    vectors.  This replaces the ``expression.size`` backward passes of
+    `jacobian` by as many as there are colors, e.g. three for a tridiagonal
+    Jacobian, whatever its size.
+
+    Parameters
+    ----------
+    expression : Variable
+        The variable that is differentiated.
+    wrt : Variable
+        The variable with respect to which `expression` is differentiated.
+    consider_constant : list of variables
+        Expressions not to backpropagate through.
+    disconnected_inputs : {'ignore', 'warn', 'raise'}
+        See `grad`.
+    sparsity : scipy.sparse matrix, optional
+        The sparsity pattern of the Jacobian, of shape
+        ``(expression.size, wrt.size)``.  By default, it's found with
+        `jacobian_sparsity`, which requires static shapes.  A pattern that
+        misses non-zero entries gives wrong results.
+
+    Returns
+    -------
+    SparseVariable
+        The Jacobian in CSR format, with one row per element of `expression`
+        and one column per element of `wrt`, both flattened in C order.  It
+        evaluates to a `scipy.sparse.csr_matrix`.
+    """
+    import scipy.sparse as sp
+
+    from pytensor.sparse.basic import CSR
+    from pytensor.tensor.basic import as_tensor_variable, constant
+    from pytensor.tensor.extra_ops import broadcast_to
+
+    if not isinstance(expression, Variable):
+        raise TypeError("sparse_jacobian expects a Variable as `expression`")
+
+    if sparsity is None:
+        sparsity = jacobian_sparsity(expression, wrt, consider_constant)
+    else:
+        sparsity = sp.csr_matrix(sparsity, dtype=bool)
+        sparsity.eliminate_zeros()
+        sparsity.sort_indices()
+    m, n = sparsity.shape
+    colors, n_colors = _color_rows(sparsity)
+
+    row_tangent = _float_ones_like(expression).type("row_tangent")
+    vjp = Lop(
+        expression,
+        wrt,
+        row_tangent,
+        consider_constant=consider_constant,
+        disconnected_inputs=disconnected_inputs,
+    )
+
+    if sparsity.nnz == 0:
+        data = as_tensor_variable(np.zeros(0, dtype=vjp.dtype))
+    else:
+        seeds = np.zeros((n_colors, m), dtype=row_tangent.dtype)
+        seeds[colors, np.arange(m)] = 1
+        compressed = vectorize_graph(
+            vjp,
+            replace={
+                row_tangent: constant(seeds).reshape((n_colors, *expression.shape))
+            },
+        )
+        if compressed.ndim == vjp.ndim:
+            # `wrt` is disconnected, and `vectorize_graph` had no effect
+            compressed = broadcast_to(compressed, (n_colors, *compressed.shape))
+        rows = np.repeat(np.arange(m), np.diff(sparsity.indptr))
+        data = compressed.reshape((n_colors, n))[colors[rows], sparsity.indices]
+
+    return CSR(data, sparsity.indices, sparsity.indptr, (m, n))
+
+
 def hessian(cost, wrt, consider_constant=None, disconnected_inputs="raise"):
     """
     Parameters
@@ -2211,10 +2810,10 @@ def hessian_vector_product(cost, wrt, p, **grad_kwargs):
 
     Notes
     -----
-    This function uses backward autodiff twice to obtain the desired expression.
-    You may want to manually build the equivalent expression by combining backward
-    followed by forward (if all Ops support it) autodiff.
-    See {ref}`docs/_tutcomputinggrads#Hessian-times-a-Vector` for how to do this.
+    This function combines backward autodiff, to obtain the gradient, with
+    forward autodiff (see `Rop`), so that the product costs about as much as
+    one more evaluation of the gradient.
+    See {ref}`docs/_tutcomputinggrads#Hessian-times-a-Vector` for more details.
 
     Parameters
     ----------
@@ -2272,13 +2871,12 @@ def hessian_vector_product(cost, wrt, p, **grad_kwargs):
     wrt_list = wrt if isinstance(wrt, Sequence) else [wrt]
     p_list = p if isinstance(p, Sequence) else [p]
     grad_wrt_list = grad(cost, wrt=wrt_list, **grad_kwargs)
-    hessian_cost = pytensor.tensor.add(
-        *[
-            (grad_wrt * p).sum()
-            for grad_wrt, p in zip(grad_wrt_list, p_list, strict=True)
-        ]
+    Hp_list = Rop(
+        grad_wrt_list,
+        wrt=wrt_list,
+        eval_points=p_list,
+        disconnected_outputs=grad_kwargs.get("disconnected_inputs", "raise"),
     )
-    Hp_list = grad(hessian_cost, wrt=wrt_list, **grad_kwargs)
 
     if isinstance(wrt, Variable):
         return Hp_list[0]
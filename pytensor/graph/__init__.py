@@ -10,7 +10,7 @@ from pytensor.graph.basic import (
     ancestors,
 )
 from pytensor.graph.replace import clone_replace, graph_replace, vectorize_graph
-from pytensor.graph.op import Op
+from pytensor.graph.op import Op, intern_nodes
 from pytensor.graph.type import Type
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.rewriting.basic import node_rewriter, graph_rewriter
@@ -1,6 +1,7 @@
 """Core graph classes."""
 
 import abc
+import pickle
 import warnings
 from collections import deque
 from collections.abc import (
@@ -10,11 +11,17 @@ from collections.abc import (
     Hashable,
     Iterable,
     Iterator,
+    Mapping,
     Reversible,
     Sequence,
 )
 from copy import copy
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import cache
+from hashlib import blake2b
 from itertools import count
+from types import BuiltinFunctionType, FunctionType
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -31,6 +38,7 @@ import numpy as np
 from pytensor.configdefaults import config
 from pytensor.graph.utils import (
     MetaObject,
+    MissingInputError,
     Scratchpad,
     TestValueError,
     ValidatingScratchpad,
@@ -64,6 +72,8 @@ class Node(MetaObject):
 
     """
 
+    __slots__ = ()
+
     name: str | None
 
     def get_parents(self):
@@ -87,6 +97,30 @@ class Node(MetaObject):
 
         return debugprint(self, **kwargs)
 
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", ()))
+        for slot in _instance_slots(type(self)):
+            try:
+                state[slot] = object.__getattribute__(self, slot)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+@cache
+def _instance_slots(cls: type) -> tuple[str, ...]:
+    """Return the names of the ``__slots__`` of `cls` and its bases."""
+    return tuple(
+        slot
+        for c in cls.__mro__
+        for slot in c.__dict__.get("__slots__", ())
+        if slot not in ("__dict__", "__weakref__")
+    )
+
 
 class Apply(Node, Generic[OpType]):
     """A `Node` representing the application of an operation to inputs.
@@ -120,24 +154,29 @@ class Apply(Node, Generic[OpType]):
         The arguments of the expression modeled by the `Apply` node.
     outputs
         The outputs of the expression modeled by the `Apply` node.
+    tag
+        A `Scratchpad` for arbitrary annotations, created on first access.
 
     """
 
+    __slots__ = ("op", "inputs", "outputs", "_tag")
+
     def __init__(
         self,
         op: OpType,
         inputs: Sequence["Variable"],
         outputs: Sequence["Variable"],
     ):
-        if not isinstance(inputs, Sequence):
+        # Check the common concrete types first; `Sequence` checks are slow
+        if type(inputs) not in (list, tuple) and not isinstance(inputs, Sequence):
             raise TypeError("The inputs of an Apply must be a sequence type")
 
-        if not isinstance(outputs, Sequence):
+        if type(outputs) not in (list, tuple) and not isinstance(outputs, Sequence):
             raise TypeError("The output of an Apply must be a sequence type")
 
         self.op = op
         self.inputs: list[Variable] = []
-        self.tag = Scratchpad()
+        self._tag: Scratchpad | None = None
 
         # filter inputs to make sure each element is a Variable
         for input in inputs:
@@ -164,14 +203,23 @@ class Apply(Node, Generic[OpType]):
                     f"The 'outputs' argument to Apply must contain Variable instances with no owner, not {output}"
                 )
 
+    @property
+    def tag(self) -> Scratchpad:
+        if self._tag is None:
+            self._tag = Scratchpad()
+        return self._tag
+
+    @tag.setter
+    def tag(self, value: Scratchpad) -> None:
+        self._tag = value
+
     def __getstate__(self):
-        d = self.__dict__
+        d = super().__getstate__()
         # ufunc don't pickle/unpickle well
-        if hasattr(self.tag, "ufunc"):
-            d = copy(self.__dict__)
-            t = d["tag"]
+        if hasattr(self._tag, "ufunc"):
+            t = copy(self._tag)
             del t.ufunc
-            d["tag"] = t
+            d["_tag"] = t
         return d
 
     def default_output(self):
@@ -232,7 +280,8 @@ class Apply(Node, Generic[OpType]):
         cp = self.__class__(
             new_op, self.inputs, [output.clone() for output in self.outputs]
         )
-        cp.tag = copy(self.tag)
+        if self._tag is not None:
+            cp.tag = copy(self._tag)
         return cp
 
     def clone_with_new_inputs(
@@ -274,7 +323,9 @@ class Apply(Node, Generic[OpType]):
 
         for i, (curr, new) in enumerate(zip(self.inputs, new_inputs, strict=True)):
             # Check if the input type changed or if the Op has output types that depend on input values
-            if (curr.type != new.type) or output_type_depends_on_input_value:
+            if (
+                curr.type is not new.type and curr.type != new.type
+            ) or output_type_depends_on_input_value:
                 # In strict mode, the cloned graph is assumed to be mathematically equivalent to the original one.
                 # We only need to rebuild a node when the new input has a different, but compatible, type.
                 # This can happen e.g., when we provide a new input with a more specialized static shape.
@@ -295,7 +346,8 @@ class Apply(Node, Generic[OpType]):
                 new_op = new_op.clone()  # type: ignore
 
             new_node = new_op.make_node(*new_inputs)
-            new_node.tag = copy(self.tag).__update__(new_node.tag)
+            if self._tag is not None:
+                new_node.tag = copy(self._tag).__update__(new_node.tag)
         else:
             new_node = self.clone(clone_inner_graph=clone_inner_graph)
             new_node.inputs = new_inputs
@@ -349,6 +401,10 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
 
     - :literal:`name` a string to use in pretty-printing and debugging.
 
+    Variables are slotted, and their :literal:`tag` `Scratchpad` is only
+    created when it's first accessed. Subclasses that don't define
+    ``__slots__`` get a ``__dict__`` as usual.
+
     There are a few kinds of `Variable`\s to be aware of: A `Variable` which is the
     output of a symbolic computation has a reference to the `Apply` instance to
     which it belongs (property: owner) and the position of itself in the owner's
@@ -425,7 +481,7 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
 
     """
 
-    # __slots__ = ['type', 'owner', 'index', 'name']
+    __slots__ = ("type", "_owner", "_index", "name", "auto_name", "_tag", "_fn_cache")
     __count__ = count(0)
 
     _owner: OptionalApplyType
@@ -455,7 +511,7 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
     ) -> None:
         super().__init__()
 
-        self.tag = ValidatingScratchpad("test_value", type.filter)
+        self._tag: ValidatingScratchpad | None = None
 
         self.type = type
 
@@ -474,6 +530,16 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
 
         self.auto_name = f"auto_{next(self.__count__)}"
 
+    @property
+    def tag(self) -> ValidatingScratchpad:
+        if self._tag is None:
+            self._tag = ValidatingScratchpad("test_value", self.type.filter)
+        return self._tag
+
+    @tag.setter
+    def tag(self, value: ValidatingScratchpad) -> None:
+        self._tag = value
+
     def get_test_value(self):
         """Get the test value.
 
@@ -482,7 +548,7 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
         TestValueError
 
         """
-        if not hasattr(self.tag, "test_value"):
+        if self._tag is None or not hasattr(self._tag, "test_value"):
             detailed_err_msg = get_variable_trace_string(self)
             raise TestValueError(f"{self} has no test value {detailed_err_msg}")
 
@@ -545,7 +611,8 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
         """
         name = kwargs.pop("name", self.name)
         cp = self.__class__(type=self.type, owner=None, index=None, name=name, **kwargs)
-        cp.tag = copy(self.tag)
+        if self._tag is not None:
+            cp.tag = copy(self._tag)
         return cp
 
     def __lt__(self, other):
@@ -662,23 +729,26 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
         return fn(*args)
 
     def __getstate__(self):
-        d = self.__dict__.copy()
+        d = super().__getstate__()
         d.pop("_fn_cache", None)
-        if (not config.pickle_test_value) and (hasattr(self.tag, "test_value")):
+        d.pop("_signature", None)
+        if (not config.pickle_test_value) and (hasattr(self._tag, "test_value")):
             if not type(config).pickle_test_value.is_default:
                 warnings.warn(
                     "pickle_test_value is not default value (True).\n"
                     f"Test value of variable {d['auto_name']}({d['name']}) will not be dumped."
                 )
-            t = copy(d["tag"])
+            t = copy(d["_tag"])
             del t.test_value
-            d["tag"] = t
+            d["_tag"] = t
         return d
 
 
 class AtomicVariable(Variable[_TypeType, None]):
     """A node type that has no ancestors and should never be considered an input to a graph."""
 
+    __slots__ = ()
+
     def __init__(self, type: _TypeType, name: str | None = None, **kwargs):
         super().__init__(type=type, owner=None, index=None, name=name, **kwargs)
 
@@ -716,7 +786,8 @@ class AtomicVariable(Variable[_TypeType, None]):
     def clone(self, **kwargs):
         name = kwargs.pop("name", self.name)
         cp = self.__class__(type=self.type, name=name, **kwargs)
-        cp.tag = copy(self.tag)
+        if self._tag is not None:
+            cp.tag = copy(self._tag)
         return cp
 
 
@@ -786,7 +857,7 @@ class Constant(AtomicVariable[_TypeType]):
 
     """
 
-    # __slots__ = ['data']
+    __slots__ = ("data",)
 
     def __init__(self, type: _TypeType, data: Any, name: str | None = None):
         super().__init__(type, name=name)
@@ -1283,13 +1354,20 @@ def clone_node_and_cache(
     return the clone of `node`.
 
     """
+    from pytensor.graph.op import HasInnerGraph
+
     if all(out in clone_d for out in node.outputs):
         # If all of `node`'s outputs already have replacements or clones in
         # `clone_d`, then there's likely no need to clone it
         return None
 
-    # Use a cached `Op` clone when available
-    new_op: Op | None = cast(Optional["Op"], clone_d.get(node.op))
+    # Use a cached `Op` clone when available.  Only inner-graph `Op`s are ever
+    # cloned, so we avoid hashing (possibly expensive) `Op` props otherwise.
+    new_op: Op | None = (
+        cast(Optional["Op"], clone_d.get(node.op))
+        if isinstance(node.op, HasInnerGraph)
+        else None
+    )
 
     cloned_inputs: list[Variable] = [cast(Variable, clone_d[i]) for i in node.inputs]
 
@@ -1550,20 +1628,31 @@ def io_toposort(
         # Do a new stack implementation with the vm algo.
         # This will change the order returned.
         computed = set(inputs)
+        # Nodes whose inputs were pushed on the stack
+        expanded = set()
         todo = [o.owner for o in reversed(outputs) if o.owner]
         order = []
         while todo:
             cur = todo.pop()
-            if all(out in computed for out in cur.outputs):
+            if cur in expanded:
+                # All the inputs have been computed since `cur` was expanded
+                if not all(out in computed for out in cur.outputs):
+                    computed.update(cur.outputs)
+                    order.append(cur)
                 continue
-            if all(i in computed or i.owner is None for i in cur.inputs):
-                computed.update(cur.outputs)
-                order.append(cur)
-            else:
+            cur_outputs = cur.outputs
+            if all(out in computed for out in cur_outputs):
+                continue
+            missing = [
+                i.owner for i in cur.inputs if i not in computed and i.owner is not None
+            ]
+            if missing:
+                expanded.add(cur)
                 todo.append(cur)
-                todo.extend(
-                    i.owner for i in cur.inputs if (i.owner and i not in computed)
-                )
+                todo.extend(missing)
+            else:
+                computed.update(cur_outputs)
+                order.append(cur)
         return order
 
     iset = set(inputs)
@@ -2031,6 +2120,236 @@ def equal_computations(
     return True
 
 
+def _digest(tag: bytes, *parts: bytes) -> bytes:
+    """Hash length-prefixed `parts` into a 16 bytes BLAKE2 digest."""
+    h = blake2b(tag, digest_size=16)
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.digest()
+
+
+def _qualified_name(obj) -> bytes:
+    return f"{obj.__module__}.{obj.__qualname__}".encode()
+
+
+def _contains_variables(obj) -> bool:
+    if isinstance(obj, list | tuple):
+        return any(_contains_variables(o) for o in obj)
+    return isinstance(obj, Variable) or type(obj).__name__ == "FunctionGraph"
+
+
+def _object_digest(obj: Any, memo: dict[Hashable, tuple[Any, bytes]]) -> bytes:
+    r"""Compute a digest of `obj` that is stable across processes.
+
+    Objects with ``__props__`` (most `Op`\s and `Type`\s) are hashed by their
+    class and props, `HasInnerGraph` objects also by the structure of their
+    inner graph, arrays by their content and other objects by their class and
+    public state. Pickling is used as a last resort.
+
+    `memo` maps the ``id`` (or props) of already hashed objects to
+    ``(obj, digest)``.
+    """
+    if obj is None or isinstance(obj, bool | int | float | complex | str):
+        return _digest(b"L", type(obj).__name__.encode(), repr(obj).encode())
+    if isinstance(obj, bytes):
+        return _digest(b"B", obj)
+
+    key = id(obj)
+    if key in memo:
+        return memo[key][1]
+
+    from pytensor.graph.op import HasInnerGraph
+
+    # Distinct but equal `Op`s and `Type`s are common, so they are also
+    # memoized by their props
+    props = getattr(obj, "__props__", None)
+    props_key = None
+    if props is not None and not isinstance(obj, HasInnerGraph):
+        props_key = (
+            type(obj),
+            *((type(v), v) for v in map(obj.__getattribute__, props)),
+        )
+        try:
+            if props_key in memo:
+                memo[key] = (obj, memo[props_key][1])
+                return memo[key][1]
+        except TypeError:
+            props_key = None
+
+    # Guard against reference cycles
+    memo[key] = (obj, _digest(b"cycle"))
+
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            content = _digest(b"", *(_object_digest(o, memo) for o in obj.flat))
+        else:
+            content = np.ascontiguousarray(obj).reshape(-1).view(np.uint8)
+        digest = _digest(
+            b"A", obj.dtype.str.encode(), repr(obj.shape).encode(), content
+        )
+    elif isinstance(obj, np.generic):
+        digest = _digest(b"S", _object_digest(np.asarray(obj), memo))
+    elif isinstance(obj, np.dtype):
+        digest = _digest(b"D", repr(obj).encode())
+    elif isinstance(obj, list | tuple):
+        digest = _digest(
+            b"T", type(obj).__name__.encode(), *(_object_digest(o, memo) for o in obj)
+        )
+    elif isinstance(obj, set | frozenset):
+        digest = _digest(b"U", *sorted(_object_digest(o, memo) for o in obj))
+    elif isinstance(obj, Mapping):
+        digest = _digest(
+            b"M",
+            *sorted(
+                _object_digest(k, memo) + _object_digest(v, memo)
+                for k, v in obj.items()
+            ),
+        )
+    elif isinstance(obj, slice):
+        digest = _digest(
+            b"R", *(_object_digest(s, memo) for s in (obj.start, obj.stop, obj.step))
+        )
+    elif isinstance(obj, type | FunctionType | BuiltinFunctionType):
+        digest = _digest(b"F", _qualified_name(obj))
+    elif isinstance(obj, Variable):
+        digest = _digest(b"V", _graph_digest([obj], None, {}, memo))
+    elif isinstance(obj, Enum):
+        digest = _digest(b"E", _qualified_name(type(obj)), obj.name.encode())
+    else:
+        cls = type(obj)
+        parts = []
+        if isinstance(obj, HasInnerGraph):
+            parts.append(_graph_digest(obj.inner_outputs, obj.inner_inputs, {}, memo))
+        if props is not None:
+            state = {p: getattr(obj, p) for p in props}
+        elif is_dataclass(obj):
+            state = {f.name: getattr(obj, f.name) for f in fields(obj)}
+        else:
+            state = obj.__getstate__()
+            if isinstance(state, dict):
+                state = {
+                    k: v
+                    for k, v in state.items()
+                    if not k.startswith("_")
+                    and not (isinstance(obj, HasInnerGraph) and _contains_variables(v))
+                }
+            else:
+                try:
+                    state = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    raise TypeError(f"Cannot compute a stable hash of {obj}") from e
+        parts.append(_object_digest(state, memo))
+        digest = _digest(b"O", _qualified_name(cls), *parts)
+
+    memo[key] = (obj, digest)
+    if props_key is not None:
+        memo[props_key] = (obj, digest)
+    return digest
+
+
+def _graph_digest(
+    outputs: Sequence[Variable],
+    inputs: Sequence[Variable] | None,
+    digests: dict[Variable, bytes],
+    memo: dict[Hashable, tuple[Any, bytes]],
+) -> bytes:
+    if inputs is None:
+        inputs = [r for r in graph_inputs(outputs) if not isinstance(r, AtomicVariable)]
+    input_positions = {inp: i for i, inp in enumerate(inputs)}
+
+    stack = list(outputs)
+    while stack:
+        var = stack[-1]
+        if var in digests:
+            stack.pop()
+            continue
+
+        type_digest = _object_digest(var.type, memo)
+        if var in input_positions:
+            digests[var] = _digest(
+                b"I", str(input_positions[var]).encode(), type_digest
+            )
+        elif isinstance(var, Constant):
+            sig = var.signature()
+            if hasattr(sig, "pytensor_hash"):
+                # Signatures of large constants cache a hash of their content
+                content = sig.pytensor_hash().encode()
+            else:
+                content = _object_digest(var.data, memo)
+            digests[var] = _digest(b"C", type_digest, content)
+        elif isinstance(var, NominalVariable):
+            digests[var] = _digest(b"N", type_digest, _object_digest(var.id, memo))
+        elif var.owner is None:
+            raise MissingInputError("Undeclared input", variable=var)
+        else:
+            node = var.owner
+            missing_inputs = [i for i in node.inputs if i not in digests]
+            if missing_inputs:
+                stack.extend(missing_inputs)
+                continue
+            node_digest = _digest(
+                b"A",
+                _object_digest(node.op, memo),
+                *(digests[i] for i in node.inputs),
+            )
+            for idx, out in enumerate(node.outputs):
+                digests[out] = _digest(
+                    b"O",
+                    node_digest,
+                    str(idx).encode(),
+                    _object_digest(out.type, memo),
+                )
+        stack.pop()
+
+    return _digest(
+        b"G",
+        *(_object_digest(i.type, memo) for i in inputs),
+        b"->",
+        *(digests[o] for o in outputs),
+    )
+
+
+def graph_hash(
+    outputs: Variable | Sequence[Variable],
+    inputs: Sequence[Variable] | None = None,
+    digests: dict[Variable, bytes] | None = None,
+) -> str:
+    r"""Compute a structural hash of the graph between `inputs` and `outputs`.
+
+    The hash is a Merkle hash of the graph: the digest of a `Variable` combines
+    the `Op` (class and ``__props__``) and `Type` of its owner with the digests
+    of the owner's inputs. Inputs are hashed by their position in `inputs` and
+    their type, `Constant`\s by their type and content. It does not depend on
+    variable names or identities, and is stable across processes.
+
+    Parameters
+    ----------
+    outputs
+        The output `Variable`\s of the graph.
+    inputs
+        The input `Variable`\s of the graph. Defaults to the root variables of
+        `outputs` that are not `AtomicVariable`\s, in the order found by
+        `graph_inputs`.
+    digests
+        An optional cache of per-`Variable` digests. It is filled by this
+        function and can be passed to subsequent calls with the same `inputs`
+        to avoid rehashing shared subgraphs. Entries must be removed by the
+        caller when a `Variable`'s ancestors change.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest.
+
+    """
+    if isinstance(outputs, Variable):
+        outputs = [outputs]
+    if digests is None:
+        digests = {}
+    return _graph_digest(outputs, inputs, digests, {}).hex()
+
+
 def get_var_by_name(
     graphs: Iterable[Variable], target_var_id: str, ids: str = "CHAR"
 ) -> tuple[Variable, ...]:
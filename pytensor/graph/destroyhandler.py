@@ -175,6 +175,192 @@ def _contains_cycle(fgraph, orderings):
     return visited != len(parent_counts)
 
 
+class _DynamicToposort:
+    """
+    Maintain a topological order of the Apply nodes of a FunctionGraph.
+
+    The dependency graph is made of the Apply nodes of the FunctionGraph,
+    with an edge from ``var.owner`` to every client of ``var``, plus the
+    extra edges given by the orderings of the DestroyHandler. It contains
+    a cycle if and only if ``_contains_cycle`` returns True.
+
+    Every node has a rank such that ``rank[a] < rank[b]`` for every edge
+    ``a -> b``. Removing edges or nodes never invalidates the ranks. When an
+    edge ``u -> v`` with ``rank[u] >= rank[v]`` is added, we only visit the
+    ancestors of ``u`` whose rank is not lower than ``rank[v]`` (the affected
+    region). The edge closes a cycle iff ``v`` is one of them; otherwise the
+    region is moved, in its current relative order, just before ``v``.
+    The cost of adding an edge is thus proportional to the size of the
+    affected region instead of the size of the whole graph.
+
+    """
+
+    def __init__(self, fgraph):
+        self.fgraph = fgraph
+        # Apply -> rank
+        self.rank = {}
+        # Apply -> set of Apply that must run before it, and its inverse.
+        # These only hold the orderings edges, the data edges are read
+        # from the FunctionGraph directly.
+        self.ordering_preds = {}
+        self.ordering_succs = {}
+        self.next_rank = 0.0
+
+    def rebuild(self, orderings):
+        """
+        Compute the ranks from scratch.
+
+        Returns False if the graph contains a cycle, in which case the ranks
+        must not be used.
+
+        """
+        parent_counts = {}
+        node_to_children = {}
+        visitable = deque()
+        for node in self.fgraph.apply_nodes:
+            parents = [inp.owner for inp in node.inputs if inp.owner is not None]
+            parents.extend(orderings.get(node, ()))
+            for parent in parents:
+                node_to_children.setdefault(parent, []).append(node)
+            parent_counts[node] = len(parents)
+            if not parents:
+                visitable.append(node)
+
+        rank = {}
+        while visitable:
+            node = visitable.popleft()
+            rank[node] = float(len(rank))
+            for client in node_to_children.get(node, ()):
+                parent_counts[client] -= 1
+                if not parent_counts[client]:
+                    visitable.append(client)
+
+        if len(rank) != len(parent_counts):
+            return False
+
+        self.rank = rank
+        self.next_rank = float(len(rank))
+        self.ordering_preds = {}
+        self.ordering_succs = {}
+        for node, deps in orderings.items():
+            self.ordering_preds[node] = set(deps)
+            for dep in deps:
+                self.ordering_succs.setdefault(dep, set()).add(node)
+        return True
+
+    def is_stale(self):
+        return len(self.rank) != len(self.fgraph.apply_nodes)
+
+    def _renumber(self):
+        nodes = sorted(self.rank, key=self.rank.__getitem__)
+        self.rank = {node: float(i) for i, node in enumerate(nodes)}
+        self.next_rank = float(len(nodes))
+
+    def add_edge(self, u, v):
+        """
+        Record that `u` must run before `v`.
+
+        Returns False, leaving the ranks untouched, if this closes a cycle.
+
+        """
+        rank = self.rank
+        lower = rank[v]
+        if rank[u] < lower:
+            return True
+        if u is v:
+            return False
+
+        ordering_preds = self.ordering_preds
+        floor = None
+        region = {u}
+        stack = [u]
+        while stack:
+            node = stack.pop()
+            parents = [inp.owner for inp in node.inputs if inp.owner is not None]
+            parents.extend(ordering_preds.get(node, ()))
+            for parent in parents:
+                parent_rank = rank.get(parent)
+                if parent_rank is None:
+                    continue
+                if parent_rank >= lower:
+                    if parent is v:
+                        return False
+                    if parent not in region:
+                        region.add(parent)
+                        stack.append(parent)
+                elif floor is None or parent_rank > floor:
+                    floor = parent_rank
+
+        # Everything between `floor` and `rank[v]` is unrelated to `region`,
+        # so the region can be squeezed in that interval.
+        region = sorted(region, key=rank.__getitem__)
+        n = len(region)
+        if floor is None:
+            floor = lower - n - 1
+        step = (lower - floor) / (n + 1)
+        new_ranks = [floor + step * (i + 1) for i in range(n)]
+        if (
+            not (floor < new_ranks[0] and new_ranks[-1] < lower)
+            or len(set(new_ranks)) != n
+        ):
+            # We ran out of floating point precision in that interval
+            self._renumber()
+            return self.add_edge(u, v)
+        for node, new_rank in zip(region, new_ranks):
+            rank[node] = new_rank
+        return True
+
+    def on_import(self, node):
+        self.rank[node] = self.next_rank
+        self.next_rank += 1
+        clients = self.fgraph.clients
+        for output in node.outputs:
+            for client, _ in clients.get(output, ()):
+                if client in self.rank and not self.add_edge(node, client):
+                    return False
+        return True
+
+    def on_prune(self, node):
+        self.rank.pop(node, None)
+        for succ in self.ordering_succs.pop(node, ()):
+            self.ordering_preds[succ].discard(node)
+        for pred in self.ordering_preds.pop(node, ()):
+            self.ordering_succs[pred].discard(node)
+
+    def sync_orderings(self, orderings):
+        """
+        Replace the recorded orderings edges by `orderings`.
+
+        Returns False if one of the new edges closes a cycle. That edge is
+        not recorded, so the ranks remain valid for the remaining ones.
+
+        """
+        ordering_preds = self.ordering_preds
+        ordering_succs = self.ordering_succs
+        for node in list(ordering_preds):
+            old_deps = ordering_preds[node]
+            new_deps = orderings.get(node)
+            removed = old_deps - new_deps if new_deps else list(old_deps)
+            for dep in removed:
+                old_deps.discard(dep)
+                ordering_succs[dep].discard(node)
+            if not old_deps:
+                del ordering_preds[node]
+
+        for node, deps in orderings.items():
+            old_deps = ordering_preds.get(node)
+            for dep in deps:
+                if old_deps is not None and dep in old_deps:
+                    continue
+                if not self.add_edge(dep, node):
+                    return False
+                if old_deps is None:
+                    old_deps = ordering_preds[node] = set()
+                old_deps.add(dep)
+                ordering_succs.setdefault(dep, set()).add(node)
+        return True
+
+
 def _build_droot_impact(destroy_handler):
     droot = {}  # destroyed view + nonview variables -> foundation
     impact = {}  # destroyed nonview variable -> it + all views of it
@@ -314,7 +500,7 @@ class DestroyHandler(Bookkeeper):
 
     It is a work in progress. The following data structures have been
     converted to use the incremental strategy:
-        <none>
+        the topological order used for cycle detection (_DynamicToposort)
 
     The following data structures remain to be converted:
         <unknown>
@@ -399,6 +585,9 @@ class DestroyHandler(Bookkeeper):
         # clients: how many times does an apply use a given variable
         self.clients = {}  # variable -> apply -> ninputs
         self.stale_droot = True
+        # Incrementally maintained topological order, built lazily by
+        # validate() once the graph has destroyers.
+        self.dynamic_toposort = None
 
         self.debug_all_apps = set()
         if self.do_imports_on_attach:
@@ -466,6 +655,7 @@ class DestroyHandler(Bookkeeper):
         del self.view_o
         del self.clients
         del self.stale_droot
+        del self.dynamic_toposort
         assert self.fgraph.destroyer_handler is self
         delattr(self.fgraph, "destroyers")
         delattr(self.fgraph, "has_destroyers")
@@ -558,6 +748,11 @@ class DestroyHandler(Bookkeeper):
         for i, output in enumerate(app.outputs):
             self.clients.setdefault(output, {})
 
+        if self.dynamic_toposort is not None and not self.dynamic_toposort.on_import(
+            app
+        ):
+            self.dynamic_toposort = None
+
         self.stale_droot = True
 
     def on_prune(self, fgraph, app, reason):
@@ -594,6 +789,9 @@ class DestroyHandler(Bookkeeper):
             if not self.view_o[i]:
                 del self.view_o[i]
 
+        if self.dynamic_toposort is not None:
+            self.dynamic_toposort.on_prune(app)
+
         self.stale_droot = True
         if app in self.fail_validate:
             del self.fail_validate[app]
@@ -642,6 +840,14 @@ class DestroyHandler(Bookkeeper):
                 if app in self.fail_validate:
                     del self.fail_validate[app]
                 self.fast_destroy(fgraph, app, reason)
+            elif (
+                self.dynamic_toposort is not None
+                and new_r.owner is not None
+                and not self.dynamic_toposort.add_edge(new_r.owner, app)
+            ):
+                # The data dependencies themselves contain a cycle now.
+                # Start over at the next validation.
+                self.dynamic_toposort = None
         self.stale_droot = True
 
     def validate(self, fgraph):
@@ -673,7 +879,7 @@ class DestroyHandler(Bookkeeper):
                         raise app_err_pairs[app]
             else:
                 ords = self.orderings(fgraph, ordered=False)
-                if _contains_cycle(fgraph, ords):
+                if self._contains_cycle(fgraph, ords):
                     raise InconsistencyError("Dependency graph contains cycles")
         else:
             # James's Conjecture:
@@ -686,9 +892,28 @@ class DestroyHandler(Bookkeeper):
             # doing this conjecture should speed up compilation most of
             # the time. The user should create such dependency except
             # if he mess too much with the internal.
-            pass
+            # Stop maintaining the topological order until destroyers
+            # show up again.
+            self.dynamic_toposort = None
         return True
 
+    def _contains_cycle(self, fgraph, orderings):
+        """
+        Same as `_contains_cycle`, but reuse the topological order
+        maintained since the last validation, so that only the region
+        affected by the new orderings is visited.
+
+        """
+        toposort = self.dynamic_toposort
+        if toposort is None or toposort.is_stale():
+            toposort = _DynamicToposort(fgraph)
+            if not toposort.rebuild(orderings):
+                self.dynamic_toposort = None
+                return True
+            self.dynamic_toposort = toposort
+            return False
+        return not toposort.sync_orderings(orderings)
+
     def orderings(self, fgraph, ordered=True):
         """
         Return orderings induced by destructive operations.
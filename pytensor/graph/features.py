@@ -9,7 +9,8 @@ import numpy as np
 
 import pytensor
 from pytensor.configdefaults import config
-from pytensor.graph.basic import Variable, io_toposort
+from pytensor.graph.basic import Variable, graph_hash, io_toposort
+from pytensor.graph.snapshot import GraphSnapshot
 from pytensor.graph.utils import InconsistencyError
 
 
@@ -892,6 +893,109 @@ class NodeFinder(Bookkeeper):
         return all
 
 
+class StructuralHashFeature(Feature):
+    """Incrementally maintain the structural hash of a `FunctionGraph`.
+
+    The per-`Variable` digests computed by `graph_hash` are kept between
+    calls, and only those of the variables downstream of a replacement are
+    invalidated, so that rehashing after a rewrite only visits the changed
+    part of the graph.
+
+    """
+
+    def on_attach(self, fgraph):
+        if hasattr(fgraph, "_structural_hash_feature"):
+            raise AlreadyThere("StructuralHashFeature is already attached")
+
+        fgraph._structural_hash_feature = self
+        self.digests = {}
+        self.inputs = None
+
+    def on_detach(self, fgraph):
+        del fgraph._structural_hash_feature
+        del self.digests
+        del self.inputs
+
+    def clone(self):
+        return type(self)()
+
+    def on_change_input(self, fgraph, node, i, r, new_r, reason=None):
+        if node == "output":
+            return
+
+        digests = self.digests
+        stack = [out for out in node.outputs if out in digests]
+        while stack:
+            var = stack.pop()
+            if digests.pop(var, None) is None:
+                continue
+            for client, _ in fgraph.clients.get(var, ()):
+                if client != "output":
+                    stack.extend(out for out in client.outputs if out in digests)
+
+    def on_prune(self, fgraph, node, reason):
+        for out in node.outputs:
+            self.digests.pop(out, None)
+
+    def structural_hash(self, fgraph) -> str:
+        if self.inputs != fgraph.inputs:
+            # Inputs are hashed by position
+            self.digests.clear()
+            self.inputs = list(fgraph.inputs)
+        return graph_hash(fgraph.outputs, fgraph.inputs, self.digests)
+
+
+class SnapshotFeature(Feature):
+    """Cache the `GraphSnapshot` of a `FunctionGraph` until the graph changes."""
+
+    def on_attach(self, fgraph):
+        if hasattr(fgraph, "_snapshot_feature"):
+            raise AlreadyThere("SnapshotFeature is already attached")
+
+        fgraph._snapshot_feature = self
+        self.snapshot = None
+
+    def on_detach(self, fgraph):
+        del fgraph._snapshot_feature
+        del self.snapshot
+
+    def clone(self):
+        return type(self)()
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        d["snapshot"] = None
+        return d
+
+    def on_import(self, fgraph, node, reason):
+        self.snapshot = None
+
+    def on_prune(self, fgraph, node, reason):
+        self.snapshot = None
+
+    def on_change_input(self, fgraph, node, i, r, new_r, reason=None):
+        self.snapshot = None
+
+    def get_snapshot(self, fgraph) -> GraphSnapshot:
+        snapshot = self.snapshot
+        if (
+            snapshot is None
+            # Inputs and outputs can be added or removed without callbacks
+            or len(snapshot.inputs) != len(fgraph.inputs)
+            or len(snapshot.outputs) != len(fgraph.outputs)
+            or any(
+                snapshot.variables[i] is not var
+                for i, var in zip(snapshot.inputs, fgraph.inputs)
+            )
+            or any(
+                snapshot.variables[i] is not var
+                for i, var in zip(snapshot.outputs, fgraph.outputs)
+            )
+        ):
+            snapshot = self.snapshot = GraphSnapshot(fgraph)
+        return snapshot
+
+
 class PrintListener(Feature):
     def __init__(self, active=True):
         self.active = active
@@ -18,8 +18,15 @@ from pytensor.graph.basic import (
     vars_between,
 )
 from pytensor.graph.basic import as_string as graph_as_string
-from pytensor.graph.features import AlreadyThere, Feature, ReplaceValidate
+from pytensor.graph.features import (
+    AlreadyThere,
+    Feature,
+    ReplaceValidate,
+    SnapshotFeature,
+    StructuralHashFeature,
+)
 from pytensor.graph.op import Op
+from pytensor.graph.snapshot import GraphSnapshot
 from pytensor.graph.utils import MetaObject, MissingInputError, TestValueError
 from pytensor.misc.ordered_set import OrderedSet
 
@@ -857,6 +864,27 @@ class FunctionGraph(MetaObject):
                         f"Inconsistent clients list: {variable}, {cl_node.inputs[i]}"
                     )
 
+    def structural_hash(self) -> str:
+        """Return a structural hash of the graph that is stable across processes.
+
+        See `graph_hash`. A `StructuralHashFeature` is attached on the first
+        call, so that subsequent calls only rehash the parts of the graph that
+        changed in between.
+        """
+        if not hasattr(self, "_structural_hash_feature"):
+            self.attach_feature(StructuralHashFeature())
+        return self._structural_hash_feature.structural_hash(self)
+
+    def freeze(self) -> GraphSnapshot:
+        """Return an immutable, array-backed `GraphSnapshot` of the graph.
+
+        A `SnapshotFeature` is attached on the first call, so that the
+        snapshot is only rebuilt after the graph has changed.
+        """
+        if not hasattr(self, "_snapshot_feature"):
+            self.attach_feature(SnapshotFeature())
+        return self._snapshot_feature.get_snapshot(self)
+
     def __repr__(self):
         return f"FunctionGraph({', '.join(graph_as_string(self.inputs, self.outputs))})"
 
@@ -2,7 +2,8 @@ import copy
 import sys
 import warnings
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -13,7 +14,7 @@ from typing import (
 
 import pytensor
 from pytensor.configdefaults import config
-from pytensor.graph.basic import Apply, Variable
+from pytensor.graph.basic import Apply, AtomicVariable, Variable
 from pytensor.graph.utils import (
     MetaObject,
     TestValueError,
@@ -133,6 +134,91 @@ def compute_test_value(node: Apply):
         output.tag.test_value = storage_map[output][0]
 
 
+class NodeInterner:
+    r"""Hash-consing table for the `Apply` nodes built by :meth:`Op.__call__`.
+
+    Two calls to the same `Op` (as per ``__eq__``) with the same inputs
+    return the same `Apply` node, so that duplicated sub-graphs are never
+    materialized. This is the construction-time equivalent of what
+    `MergeOptimizer` does on a `FunctionGraph`.
+
+    `AtomicVariable` inputs are compared by their
+    :meth:`AtomicVariable.merge_signature`, so ``log(x + 1)`` and
+    ``log(x + 1)`` share their nodes even though ``1`` is converted to a new
+    `Constant` each time.
+
+    `Op`\s with a ``destroy_map`` are never interned.
+
+    """
+
+    def __init__(self):
+        # (op, inputs) -> Apply
+        self.nodes: dict[tuple, Apply] = {}
+        # merge_signature -> first AtomicVariable seen with that signature
+        self.atomics: dict[Any, AtomicVariable] = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def intern(self, node: Apply) -> Apply:
+        """Return an existing node equivalent to `node`, or register `node`."""
+        if node.op.destroy_map:
+            return node
+
+        key_inputs = []
+        for inp in node.inputs:
+            if isinstance(inp, AtomicVariable):
+                try:
+                    inp = self.atomics.setdefault(inp.merge_signature(), inp)
+                except TypeError:
+                    # Unhashable signature
+                    pass
+            key_inputs.append(inp)
+
+        key = (node.op, tuple(key_inputs))
+        try:
+            existing = self.nodes.setdefault(key, node)
+        except TypeError:
+            # Unhashable `Op`
+            return node
+
+        if existing is not node:
+            self.hits += 1
+        return existing
+
+
+_NODE_INTERNER: NodeInterner | None = None
+
+
+@contextmanager
+def intern_nodes() -> Iterator[NodeInterner]:
+    r"""Reuse identical `Apply` nodes built within this context manager.
+
+    .. code-block:: python
+
+        with intern_nodes() as interner:
+            a = pt.log(sigma) + x
+            b = pt.log(sigma) + x
+
+        assert a is b
+        assert interner.hits == 2
+
+    Only the nodes built through :meth:`Op.__call__` are interned. The table
+    holds references to all the nodes built within the context, and is
+    discarded when leaving it.
+
+    """
+    global _NODE_INTERNER
+    old_interner = _NODE_INTERNER
+    interner = NodeInterner()
+    try:
+        _NODE_INTERNER = interner
+        yield interner
+    finally:
+        _NODE_INTERNER = old_interner
+
+
 class Op(MetaObject):
     """A class that models and constructs operations in a graph.
 
@@ -291,6 +377,8 @@ class Op(MetaObject):
 
         """
         node = self.make_node(*inputs, **kwargs)
+        if _NODE_INTERNER is not None:
+            node = _NODE_INTERNER.intern(node)
         if name is not None:
             if len(node.outputs) == 1:
                 node.outputs[0].name = name
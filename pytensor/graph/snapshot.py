@@ -0,0 +1,206 @@
+"""An immutable, array-backed snapshot of a `FunctionGraph`."""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from pytensor.graph.basic import Variable
+from pytensor.graph.op import Op
+from pytensor.graph.type import Type
+
+
+if TYPE_CHECKING:
+    from pytensor.graph.fg import FunctionGraph
+
+
+def _frozen_array(values, dtype=np.intp) -> np.ndarray:
+    arr = np.asarray(values, dtype=dtype)
+    arr.flags.writeable = False
+    return arr
+
+
+class GraphSnapshot:
+    r"""A read-only, array-backed view of a `FunctionGraph`.
+
+    The `Apply` nodes and `Variable`\s of the graph are identified by integer
+    IDs, i.e. their positions in `GraphSnapshot.nodes` and
+    `GraphSnapshot.variables`, and the graph's edges are stored in
+    CSR-style arrays of such IDs.  This lets read-only analyses traverse a graph
+    without going through Python attribute access and ``dict`` lookups, and
+    lets them use NumPy to work on all the nodes at once.
+
+    Nodes are numbered in the order of `FunctionGraph.toposort`.  Variables are
+    numbered so that the graph's inputs come first, followed by the other
+    inputs (e.g. `Constant`\s) and outputs of each node in turn.
+
+    Snapshots are obtained with `FunctionGraph.freeze`, which caches them until
+    the graph is changed.  Neither the snapshot, nor the graph it was taken
+    from, should be modified while it is in use.
+
+    Attributes
+    ----------
+    nodes
+        The `Apply` nodes of the graph in topological order.
+    variables
+        The `Variable`\s of the graph.
+    node_ids
+        A map from the `Apply` nodes to their IDs.
+    variable_ids
+        A map from the `Variable`\s to their IDs.
+    inputs
+        The IDs of the graph's inputs.
+    outputs
+        The IDs of the graph's outputs.
+    ops
+        The distinct `Op`\s of the graph.
+    node_op
+        The position of each node's `Op` in `GraphSnapshot.ops`.
+    types
+        The distinct `Type`\s of the graph.
+    variable_type
+        The position of each variable's `Type` in `GraphSnapshot.types`.
+    variable_owner
+        The ID of each variable's owner, or ``-1`` for variables without one.
+    input_ptr, input_ids
+        The IDs of the inputs of node ``i`` are
+        ``input_ids[input_ptr[i]:input_ptr[i + 1]]``.
+    output_ptr, output_ids
+        The IDs of the outputs of node ``i`` are
+        ``output_ids[output_ptr[i]:output_ptr[i + 1]]``.
+    client_ptr, client_ids, client_positions
+        The IDs of the nodes that use variable ``v``, in increasing order, are
+        ``client_ids[client_ptr[v]:client_ptr[v + 1]]``, and
+        ``client_positions`` holds the corresponding input positions.  The
+        graph's outputs are not included; see `GraphSnapshot.is_output`.
+    is_output
+        Whether or not each variable is an output of the graph.
+
+    """
+
+    __slots__ = (
+        "client_ids",
+        "client_positions",
+        "client_ptr",
+        "input_ids",
+        "input_ptr",
+        "inputs",
+        "is_output",
+        "node_ids",
+        "node_op",
+        "nodes",
+        "ops",
+        "output_ids",
+        "output_ptr",
+        "outputs",
+        "types",
+        "variable_ids",
+        "variable_owner",
+        "variable_type",
+        "variables",
+    )
+
+    def __init__(self, fgraph: "FunctionGraph"):
+        nodes = tuple(fgraph.toposort())
+        node_ids = {node: i for i, node in enumerate(nodes)}
+
+        variables: list[Variable] = list(fgraph.inputs)
+        variable_ids = {var: i for i, var in enumerate(variables)}
+        variable_owner = [-1] * len(variables)
+
+        op_ids: dict[Op, int] = {}
+        node_op = []
+        input_ptr = [0]
+        input_ids = []
+        output_ptr = [0]
+        output_ids = []
+
+        for node_id, node in enumerate(nodes):
+            node_op.append(op_ids.setdefault(node.op, len(op_ids)))
+
+            for inp in node.inputs:
+                inp_id = variable_ids.get(inp)
+                if inp_id is None:
+                    # An input that isn't owned by a node of the graph,
+                    # e.g. a `Constant`
+                    inp_id = variable_ids[inp] = len(variables)
+                    variables.append(inp)
+                    variable_owner.append(-1)
+                input_ids.append(inp_id)
+            input_ptr.append(len(input_ids))
+
+            for out in node.outputs:
+                out_id = variable_ids[out] = len(variables)
+                variables.append(out)
+                variable_owner.append(node_id)
+                output_ids.append(out_id)
+            output_ptr.append(len(output_ids))
+
+        outputs = []
+        for out in fgraph.outputs:
+            out_id = variable_ids.get(out)
+            if out_id is None:
+                # Outputs that are also roots, e.g. `Constant`s
+                out_id = variable_ids[out] = len(variables)
+                variables.append(out)
+                variable_owner.append(-1)
+            outputs.append(out_id)
+
+        type_ids: dict[Type, int] = {}
+        variable_type = [
+            type_ids.setdefault(var.type, len(type_ids)) for var in variables
+        ]
+
+        self.nodes = nodes
+        self.variables = tuple(variables)
+        self.node_ids = node_ids
+        self.variable_ids = variable_ids
+        self.inputs = _frozen_array(range(len(fgraph.inputs)))
+        self.outputs = _frozen_array(outputs)
+        self.ops = tuple(op_ids)
+        self.node_op = _frozen_array(node_op)
+        self.types = tuple(type_ids)
+        self.variable_type = _frozen_array(variable_type)
+        self.variable_owner = _frozen_array(variable_owner)
+        self.input_ptr = _frozen_array(input_ptr)
+        self.input_ids = _frozen_array(input_ids)
+        self.output_ptr = _frozen_array(output_ptr)
+        self.output_ids = _frozen_array(output_ids)
+
+        # The clients are the inputs' edges sorted by variable; a stable sort
+        # keeps the clients of each variable in topological order
+        n_vars = len(variables)
+        edge_nodes = np.repeat(
+            np.arange(len(nodes), dtype=np.intp), np.diff(self.input_ptr)
+        )
+        edge_positions = np.arange(len(input_ids), dtype=np.intp) - np.repeat(
+            self.input_ptr[:-1], np.diff(self.input_ptr)
+        )
+        order = np.argsort(self.input_ids, kind="stable")
+        client_ptr = np.zeros(n_vars + 1, dtype=np.intp)
+        np.cumsum(np.bincount(self.input_ids, minlength=n_vars), out=client_ptr[1:])
+        self.client_ptr = _frozen_array(client_ptr)
+        self.client_ids = _frozen_array(edge_nodes[order])
+        self.client_positions = _frozen_array(edge_positions[order])
+
+        is_output = np.zeros(n_vars, dtype=bool)
+        is_output[self.outputs] = True
+        self.is_output = _frozen_array(is_output, dtype=bool)
+
+    def __repr__(self):
+        return (
+            f"GraphSnapshot(nodes={len(self.nodes)}, "
+            f"variables={len(self.variables)}, ops={len(self.ops)})"
+        )
+
+    def node_inputs(self, node_id: int) -> np.ndarray:
+        """Return the IDs of the inputs of a node."""
+        return self.input_ids[self.input_ptr[node_id] : self.input_ptr[node_id + 1]]
+
+    def node_outputs(self, node_id: int) -> np.ndarray:
+        """Return the IDs of the outputs of a node."""
+        return self.output_ids[self.output_ptr[node_id] : self.output_ptr[node_id + 1]]
+
+    def clients(self, variable_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the IDs of the nodes that use a variable and the input positions at which they do."""
+        start, stop = self.client_ptr[variable_id], self.client_ptr[variable_id + 1]
+        return self.client_ids[start:stop], self.client_positions[start:stop]
@@ -263,6 +263,11 @@ class Scratchpad:
     def clear(self):
         self.__dict__.clear()
 
+    def __copy__(self):
+        cp = object.__new__(type(self))
+        cp.__dict__.update(self.__dict__)
+        return cp
+
     def __update__(self, other):
         self.__dict__.update(other.__dict__)
         return self
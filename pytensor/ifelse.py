@@ -236,7 +236,14 @@ class IfElse(_NoPythonOp):
         )
 
     def R_op(self, inputs, eval_points):
-        return self(inputs[0], *eval_points[1:], return_list=True)
+        if all(ev is None for ev in eval_points[1:]):
+            return [None for _ in range(self.n_outs)]
+        # The branches that don't depend on the `wrt` of `Rop` have zero tangents
+        tangents = [
+            pt.basic.zeros_like(inp) if ev is None else ev
+            for inp, ev in zip(inputs[1:], eval_points[1:], strict=True)
+        ]
+        return self(inputs[0], *tangents, return_list=True)
 
     def grad(self, ins, grads):
         condition = ins[0]
@@ -52,6 +52,19 @@ class Container:
 
     """
 
+    __slots__ = (
+        "type",
+        "name",
+        "storage",
+        "readonly",
+        "strict",
+        "allow_downcast",
+        # Set by `pytensor.compile.function.types.Function`
+        "required",
+        "implicit",
+        "provided",
+    )
+
     def __init__(
         self,
         r: Variable | Type,
@@ -80,6 +93,15 @@ class Container:
         self.strict = strict
         self.allow_downcast = allow_downcast
 
+    def __getstate__(self):
+        return {
+            slot: getattr(self, slot) for slot in self.__slots__ if hasattr(self, slot)
+        }
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __get__(self) -> Any:
         return self.storage[0]
 
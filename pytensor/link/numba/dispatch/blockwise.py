@@ -1,9 +1,13 @@
 import sys
+from textwrap import indent
 from typing import cast
 
+import numba
+import numpy as np
 from numba.core.extending import overload
 from numba.np.unsafe.ndarray import to_fixed_tuple
 
+from pytensor.configdefaults import config
 from pytensor.link.numba.dispatch.basic import numba_funcify, numba_njit
 from pytensor.link.numba.dispatch.vectorize_codegen import (
     _jit_options,
@@ -35,10 +39,18 @@ def numba_funcify_Blockwise(op: BlockwiseWithCoreShape, node, **kwargs):
         parent_node=node,
         **kwargs,
     )
-    core_op_fn = store_core_outputs(core_op_fn, nin=nin, nout=nout)
-
     batch_ndim = blockwise_op.batch_ndim(node)
 
+    if config.numba__parallel_blockwise and batch_ndim > 0:
+        return _parallel_blockwise(
+            core_op_fn,
+            [inp.type.broadcastable[:batch_ndim] for inp in node.inputs[:nin]],
+            [out.type.dtype for out in node.outputs],
+            core_shapes_len,
+        )
+
+    core_op_fn = store_core_outputs(core_op_fn, nin=nin, nout=nout)
+
     # numba doesn't support nested literals right now...
     input_bc_patterns = encode_literals(
         tuple(inp.type.broadcastable[:batch_ndim] for inp in node.inputs[:nin])
@@ -90,3 +102,102 @@ def numba_funcify_Blockwise(op: BlockwiseWithCoreShape, node, **kwargs):
         return blockwise_wrapper
 
     return blockwise
+
+
+def _parallel_blockwise(core_op_fn, input_bc_patterns, output_dtypes, core_shapes_len):
+    """Create a Numba function that splits the batches of a `Blockwise` across threads.
+
+    The batch dimensions are flattened and looped over with `numba.prange`, so
+    the core function must not have side effects::
+
+        @njit(parallel=True)
+        def parallel_blockwise(i0, i1, ..., cs0, cs1, ...):
+            b0 = ...
+            o0 = np.empty((b0, ...) + to_fixed_tuple(cs0, ...))
+            for batch in prange(b0 * ...):
+                idx0 = batch // ... % b0
+                ...
+                r0 = core_op_fn(i0[idx0, ...], i1[0, ...], ...)
+                o0[idx0, ...] = r0
+            return o0
+
+    """
+    nin = len(input_bc_patterns)
+    nout = len(output_dtypes)
+    batch_ndim = len(input_bc_patterns[0])
+    inputs = [f"i{i}" for i in range(nin)]
+    core_shapes = [f"cs{i}" for i in range(nout)]
+    outputs = [f"o{i}" for i in range(nout)]
+    results = [f"r{i}" for i in range(nout)]
+
+    # Broadcast the batch dimensions, without runtime broadcasting
+    batch_shape = []
+    check_shape = []
+    for d in range(batch_ndim):
+        dims = [
+            f"{inp}.shape[{d}]"
+            for inp, bcast in zip(inputs, input_bc_patterns, strict=True)
+            if not bcast[d]
+        ]
+        if not dims:
+            batch_shape.append("1")
+            continue
+        batch_shape.append(f"b{d}")
+        check_shape.append(f"b{d} = {dims[0]}")
+        check_shape.extend(
+            f"if {dim} != b{d}:\n"
+            f"    raise ValueError('Incompatible Blockwise batch input shapes')"
+            for dim in dims[1:]
+        )
+    n_batches = " * ".join(batch_shape)
+
+    alloc_outputs = [
+        f"{out} = np.empty(({', '.join(batch_shape)},) + to_fixed_tuple({cs}, {cs_len}), dtype=np.{dtype})"
+        for out, cs, cs_len, dtype in zip(
+            outputs, core_shapes, core_shapes_len, output_dtypes, strict=True
+        )
+    ]
+
+    # Unravel the flat batch index, from the last batch dimension
+    unravel = []
+    stride = ""
+    for d in reversed(range(batch_ndim)):
+        unravel.append(f"idx{d} = (batch{stride}) % {batch_shape[d]}")
+        stride += f" // {batch_shape[d]}"
+    batch_idx = ", ".join(f"idx{d}" for d in range(batch_ndim))
+    core_inputs = [
+        f"{inp}[{', '.join('0' if bcast[d] else f'idx{d}' for d in range(batch_ndim))}]"
+        for inp, bcast in zip(inputs, input_bc_patterns, strict=True)
+    ]
+    store_outputs = [
+        f"{out}[{batch_idx}] = {res}"
+        if cs_len == 0
+        else f"{out}[{batch_idx}][...] = {res}"
+        for out, res, cs_len in zip(outputs, results, core_shapes_len, strict=True)
+    ]
+
+    loop_body = [
+        *unravel,
+        f"{', '.join(results)}{',' if nout > 1 else ''} = core_op_fn({', '.join(core_inputs)})",
+        *store_outputs,
+    ]
+    func_src = "\n".join(
+        [
+            f"def parallel_blockwise({', '.join(inputs + core_shapes)}):",
+            *indent("\n".join(check_shape + alloc_outputs), " " * 4).splitlines(),
+            f"    for batch in prange({n_batches}):",
+            *indent("\n".join(loop_body), " " * 8).splitlines(),
+            f"    return {', '.join(outputs)}{',' if nout > 1 else ''}",
+        ]
+    )
+    func = compile_function_src(
+        func_src,
+        "parallel_blockwise",
+        {
+            "np": np,
+            "prange": numba.prange,
+            "to_fixed_tuple": to_fixed_tuple,
+            "core_op_fn": core_op_fn,
+        },
+    )
+    return numba_njit(func, parallel=True)
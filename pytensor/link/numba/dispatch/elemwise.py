@@ -35,7 +35,7 @@ from pytensor.scalar.basic import (
     scalar_maximum,
 )
 from pytensor.scalar.basic import add as add_as
-from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise
+from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise, MapReduce
 from pytensor.tensor.math import Argmax, MulWithoutZeros, Sum
 from pytensor.tensor.special import LogSoftmax, Softmax, SoftmaxGrad
 
@@ -410,6 +410,126 @@ def numba_funcify_CAReduce(op, node, **kwargs):
     return careduce_fn
 
 
+@numba_funcify.register(MapReduce)
+def numba_funcify_MapReduce(op, node, **kwargs):
+    map_node, _, epilogue_node = op._scalar_nodes(node)
+    map_fn = numba_funcify(op.prologue, node=map_node, parent_node=node, **kwargs)
+    n_map = op.prologue.nin
+    map_inputs = node.inputs[:n_map]
+    epilogue_inputs = node.inputs[n_map:]
+    ndim = map_inputs[0].type.ndim
+    kept_axis = [d for d in range(ndim) if d not in op.axis]
+
+    np_acc_dtype = np.dtype(op.acc_dtype)
+    identity = op.scalar_op.identity
+    if np_acc_dtype.kind in "iu" and not np.isfinite(identity):
+        identity = (
+            np.iinfo(np_acc_dtype).max
+            if np.isposinf(identity)
+            else np.iinfo(np_acc_dtype).min
+        )
+    elif np_acc_dtype.kind == "b" and not np.isfinite(identity):
+        identity = bool(np.isposinf(identity))
+    identity = np.array(identity, dtype=np_acc_dtype).item()
+
+    global_env = {
+        "np": np,
+        "map_fn": map_fn,
+        "identity": identity,
+        "acc_dtype": np_acc_dtype,
+        "dtype": np.dtype(op.dtype),
+        "out_dtype": np.dtype(node.outputs[0].type.dtype),
+    }
+
+    x_names = [f"x{k}" for k in range(n_map)]
+    e_names = [f"e{k}" for k in range(len(epilogue_inputs))]
+
+    # The loop lengths, with the runtime checks of the non-broadcastable dimensions
+    src = []
+    for d in range(ndim):
+        sources = [
+            name
+            for inp, name in zip(map_inputs, x_names, strict=True)
+            if not inp.type.broadcastable[d]
+        ]
+        if not sources:
+            src.append(f"n{d} = 1")
+            continue
+        src.append(f"n{d} = {sources[0]}.shape[{d}]")
+        src.extend(
+            f"if {name}.shape[{d}] != n{d}:\n"
+            f"    raise ValueError('MapReduce: input dimension mismatch')"
+            for name in sources[1:]
+        )
+    res_shape = "".join(f"n{d}, " for d in kept_axis) or "1, "
+    src.append(f"res = np.full(({res_shape}), identity, dtype=acc_dtype)")
+
+    # The reduction loop
+    def indices(inp, names):
+        idx = ", ".join(
+            "0" if bcast else name
+            for bcast, name in zip(inp.type.broadcastable, names, strict=True)
+        )
+        return f"[{idx}]" if idx else "[()]"
+
+    res_idx = ", ".join(f"i{d}" for d in kept_axis) or "0"
+    values = ", ".join(
+        f"{name}{indices(inp, [f'i{d}' for d in range(ndim)])}"
+        for inp, name in zip(map_inputs, x_names, strict=True)
+    )
+    loop = [f"v = map_fn({values})"]
+    loop.extend(
+        scalar_in_place_fn(op.scalar_op, res_idx, "res", "v").strip().splitlines()
+    )
+    for d in reversed(range(ndim)):
+        loop = [f"for i{d} in range(n{d}):", *(f"    {line}" for line in loop)]
+    src.extend(loop)
+    src.append("red = res.astype(dtype)")
+
+    # The epilogue loop
+    out_ndim = len(kept_axis)
+    if epilogue_node is None:
+        out = "red" if kept_axis else "np.asarray(red[0])"
+    else:
+        global_env["epilogue_fn"] = numba_funcify(
+            op.epilogue, node=epilogue_node, parent_node=node, **kwargs
+        )
+        for j, d in enumerate(kept_axis):
+            src.extend(
+                f"if {name}.shape[{j}] != n{d}:\n"
+                f"    raise ValueError('MapReduce: epilogue input dimension mismatch')"
+                for inp, name in zip(epilogue_inputs, e_names, strict=True)
+                if not inp.type.broadcastable[j]
+            )
+        src.append("out = np.empty_like(red, dtype=out_dtype)")
+        out_idx = ", ".join(f"j{j}" for j in range(out_ndim)) or "0"
+        values = ", ".join(
+            [
+                f"red[{out_idx}]",
+                *(
+                    f"{name}{indices(inp, [f'j{j}' for j in range(out_ndim)])}"
+                    for inp, name in zip(epilogue_inputs, e_names, strict=True)
+                ),
+            ]
+        )
+        loop = [f"out[{out_idx}] = epilogue_fn({values})"]
+        for j in reversed(range(out_ndim)):
+            loop = [
+                f"for j{j} in range(n{kept_axis[j]}):",
+                *(f"    {line}" for line in loop),
+            ]
+        src.extend(loop)
+        out = "out" if kept_axis else "np.asarray(out[0])"
+    src.append(f"return {out}")
+
+    fn_name = "map_reduce"
+    src = f"def {fn_name}({', '.join(x_names + e_names)}):\n" + indent(
+        "\n".join(src), " " * 4
+    )
+    map_reduce_fn = compile_function_src(src, fn_name, {**globals(), **global_env})
+    return numba_njit(map_reduce_fn, boundscheck=False)
+
+
 @numba_funcify.register(DimShuffle)
 def numba_funcify_DimShuffle(op, node, **kwargs):
     # We use `as_strided` to achieve the DimShuffle behavior of transposing and expanding/squezing dimensions in one call
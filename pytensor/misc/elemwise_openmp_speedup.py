@@ -22,6 +22,13 @@ parser.add_option(
     type="int",
     help="Number of vector elements",
 )
+parser.add_option(
+    "--tune",
+    action="store_true",
+    dest="tune",
+    default=False,
+    help="Measure and store the minimum sizes for representative operations",
+)
 
 
 def runScript(N):
@@ -45,6 +52,14 @@ if __name__ == "__main__":
     if hasattr(options, "help"):
         print(options.help)
         sys.exit(0)
+    if options.tune:
+        from pytensor.tensor.openmp_tuning import NEVER, thresholds_path, tune
+
+        print(f"Tuning with OMP_NUM_THREADS={os.getenv('OMP_NUM_THREADS')}")
+        for key, threshold in tune().items():
+            print(f"{key}: {'never' if threshold == NEVER else threshold}")
+        print(f"Stored in {thresholds_path()}")
+        sys.exit(0)
     orig_flags = os.environ.get("PYTENSOR_FLAGS", "")
     os.environ["PYTENSOR_FLAGS"] = orig_flags + ",openmp=false"
     (cheapTime, costlyTime) = runScript(N=options.N)
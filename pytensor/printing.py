@@ -190,7 +190,7 @@ def debugprint(
     inputs_to_print = []
     outputs_to_print = []
     profile_list: list[Any | None] = []
-    topo_orders: list[list[Apply] | None] = []
+    topo_orders: list[Sequence[Apply] | None] = []
     storage_maps: list[StorageMapType | None] = []
 
     if isinstance(graph_like, list | tuple | set):
@@ -220,7 +220,7 @@ def debugprint(
                 )
             else:
                 storage_maps.extend(None for item in obj.maker.fgraph.outputs)
-            topo = obj.maker.fgraph.toposort()
+            topo = obj.maker.fgraph.freeze().nodes
             topo_orders.extend(topo for item in obj.maker.fgraph.outputs)
         elif isinstance(obj, FunctionGraph):
             if print_fgraph_inputs:
@@ -174,6 +174,8 @@ def scan(
     allow_gc=None,
     strict=False,
     return_list=False,
+    checkpoints=None,
+    checkpoints_memory=None,
 ):
     r"""This function constructs and applies a `Scan` `Op` to the provided arguments.
 
@@ -429,6 +431,21 @@ def scan(
     return_list
         If ``True``, will always return a ``list``, even if there is only one output.
 
+    checkpoints
+        The number of recurrent states that the gradient of `scan` is allowed to
+        store at once.  By default, the gradient uses the states computed at
+        every step of the loop, so they must all be kept in memory.  When
+        `checkpoints` is given, the gradient instead recomputes the states from
+        a few stored ones, and the forward loop only needs to keep the states
+        that are used by the rest of the graph.
+        See `pytensor.scan.checkpoints.checkpoint_schedule` for the schedule
+        that is used, and how much recomputation it implies.
+
+    checkpoints_memory
+        A memory budget, in bytes, for the recurrent states stored by the
+        gradient of `scan`, from which `checkpoints` is derived.  This requires
+        the shapes of the recurrent states to be known statically.
+
     Returns
     -------
     tuple
@@ -1115,6 +1132,30 @@ def scan(
     if allow_gc is None:
         allow_gc = config.scan__allow_gc
 
+    if checkpoints_memory is not None:
+        if checkpoints is not None:
+            raise ValueError(
+                "Only one of checkpoints and checkpoints_memory can be given"
+            )
+        # The states needed to restart the loop at a given step
+        state_nbytes = 0
+        for buffer, taps in zip(
+            mit_sot_scan_inputs + sit_sot_scan_inputs,
+            [*mit_sot_tap_array, *([-1],) * len(sit_sot_scan_inputs)],
+            strict=True,
+        ):
+            if None in buffer.type.shape[1:]:
+                raise ValueError(
+                    "checkpoints_memory requires the recurrent states of scan to "
+                    f"have static shapes, but {buffer} has shape {buffer.type.shape[1:]}"
+                )
+            state_nbytes += (
+                -min(taps)
+                * int(np.prod(buffer.type.shape[1:]))
+                * np.dtype(buffer.type.dtype).itemsize
+            )
+        checkpoints = int(checkpoints_memory // max(state_nbytes, 1))
+
     info = ScanInfo(
         n_seqs=n_seqs,
         mit_mot_in_slices=(),
@@ -1137,6 +1178,7 @@ def scan(
         profile=profile,
         allow_gc=allow_gc,
         strict=strict,
+        checkpoints=checkpoints,
     )
 
     ##
@@ -1,7 +1,18 @@
+import warnings
+from copy import copy
+from functools import cache
+from math import prod
+from typing import NamedTuple
+
+import pytensor.tensor as pt
 import pytensor.tensor.basic as ptb
+from pytensor.configdefaults import config
+from pytensor.gradient import DisconnectedType, grad, grad_undefined
 from pytensor.scan.basic import scan
-from pytensor.tensor.math import ceil, eq, neq
+from pytensor.tensor.exceptions import NotScalarConstantError
+from pytensor.tensor.math import ceil, eq, neq, sqrt
 from pytensor.tensor.subtensor import set_subtensor
+from pytensor.tensor.type import TensorType, float_dtypes
 
 
 def scan_checkpoints(
@@ -185,3 +196,384 @@ def scan_checkpoints(
     )
 
     return results, updates
+
+
+class CheckpointSchedule(NamedTuple):
+    """The schedule used to compute the gradient of a `Scan` with checkpoints.
+
+    The steps of the loop are split into segments of ``segment_lengths[0]``
+    steps, which are themselves split into segments of ``segment_lengths[1]``
+    steps, and so on.  The states at the start of the segments of a level are
+    stored while the gradient goes through their parent segment, and the states
+    of the segments of the last level are all stored while the gradient goes
+    through them.
+
+    Attributes
+    ----------
+    segment_lengths
+        The number of steps of the segments of each level.  It is empty when
+        all the states can be stored.
+    n_snapshots
+        The largest number of states stored at once.
+    recompute_factor
+        The number of steps recomputed by the gradient, relative to the number
+        of steps of the loop.
+
+    """
+
+    segment_lengths: tuple[int, ...]
+    n_snapshots: int
+    recompute_factor: float
+
+
+def checkpoint_schedule(n_steps: int, checkpoints: int) -> CheckpointSchedule:
+    """Return the schedule used to differentiate `n_steps` steps of a `Scan` with `checkpoints` stored states.
+
+    The steps are split in nested segments of equal lengths (see
+    `CheckpointSchedule`), with the fewest levels of segments that keep the
+    number of states stored at once within `checkpoints`.  With ``l`` levels,
+    each step is recomputed at most ``l + 1`` times, and about
+    ``(l + 1) * n_steps ** (1 / (l + 1))`` states are stored.
+
+    This is a multi-level version of the binomial checkpointing of Revolve
+    [1]_: Revolve reuses the memory of the snapshots it doesn't need anymore,
+    which can't be done with the immutable buffers of `Scan`, so each level of
+    segments keeps its own snapshots.
+
+    References
+    ----------
+    .. [1] Griewank, A. and Walther, A. "Algorithm 799: Revolve: An
+       Implementation of Checkpointing for the Reverse or Adjoint Mode of
+       Computational Differentiation", ACM Transactions on Mathematical
+       Software, 2000.
+
+    """
+    if checkpoints < 2:
+        raise ValueError(f"At least 2 checkpoints are required, got {checkpoints}")
+    if n_steps <= checkpoints:
+        return CheckpointSchedule((), n_steps, 0.0)
+
+    for n_factors in range(2, max(n_steps.bit_length(), 2) + 1):
+        # The smallest factor whose `n_factors`-th power covers `n_steps`
+        factor = max(round(n_steps ** (1 / n_factors)), 2)
+        while factor**n_factors < n_steps:
+            factor += 1
+        while factor > 2 and (factor - 1) ** n_factors >= n_steps:
+            factor -= 1
+        factors = [factor] * n_factors
+        for i in range(n_factors):
+            if prod(factors) // factor * (factor - 1) >= n_steps:
+                factors[i] = factor - 1
+
+        segment_lengths = tuple(prod(factors[i:]) for i in range(1, n_factors))
+        n_snapshots = -(-n_steps // segment_lengths[0]) + sum(factors[1:])
+        if n_snapshots <= checkpoints:
+            break
+    else:
+        raise ValueError(
+            f"{checkpoints} checkpoints are not enough to differentiate {n_steps} steps"
+        )
+
+    @cache
+    def recomputed_steps(length, level):
+        if level == len(segment_lengths):
+            return length
+        segment_length = segment_lengths[level]
+        n_segments = max(-(-length // segment_length), 1)
+        last_length = length - (n_segments - 1) * segment_length
+        return (
+            length
+            - last_length
+            + (n_segments - 1) * recomputed_steps(segment_length, level + 1)
+            + recomputed_steps(last_length, level + 1)
+        )
+
+    return CheckpointSchedule(
+        segment_lengths, n_snapshots, recomputed_steps(n_steps, 0) / n_steps
+    )
+
+
+def checkpointed_scan_grad(op, inputs, outs, dC_douts):
+    """Compute the gradient of a `Scan` node, recomputing its states from checkpoints.
+
+    This is used by `Scan.L_op` when `Scan.checkpoints` is set.  The states
+    computed by the forward loop aren't used: the gradient recomputes them,
+    segment by segment, from the states stored following a
+    `checkpoint_schedule`, and goes through each segment of the last level
+    with the regular gradient of `Scan`.
+
+    Returns ``None`` when the gradient of `op` should be computed without
+    checkpoints.
+
+    """
+    info = op.info
+    states = op.outer_mitsot(inputs) + op.outer_sitsot(inputs)
+    if (
+        info.n_mit_mot
+        or info.n_shared_outs
+        or info.as_while
+        or op.truncate_gradient != -1
+        or any(state.type.dtype not in float_dtypes for state in states)
+    ):
+        warnings.warn(
+            f"The gradient of {op} can't use checkpoints, because they are only "
+            "supported for loops without while conditions, shared variable "
+            "updates, truncated gradients or integer states.",
+            stacklevel=2,
+        )
+        return None
+
+    n_steps = inputs[0]
+    try:
+        static_n_steps = int(ptb.get_scalar_constant_value(n_steps))
+    except NotScalarConstantError:
+        static_n_steps = None
+    if static_n_steps is None:
+        # Without a static number of steps, the depth of the schedule can't
+        # be adapted to it, and a single level of segments is used
+        segment_lengths = (ptb.cast(ceil(sqrt(n_steps)), "int64"),)
+    else:
+        segment_lengths = checkpoint_schedule(
+            static_n_steps, op.checkpoints
+        ).segment_lengths
+        if not segment_lengths:
+            return None
+
+    seqs = op.outer_seqs(inputs)
+    non_seqs = op.outer_non_seqs(inputs)
+    windows = [
+        -min(taps) for taps in (*info.mit_sot_in_slices, *info.sit_sot_in_slices)
+    ]
+    n_states = len(states)
+    n_seqs = len(seqs)
+    n_non_seqs = len(non_seqs)
+    n_nit_sot = info.n_nit_sot
+
+    def connected(g):
+        return None if isinstance(g.type, DisconnectedType) else g
+
+    state_grads = [connected(g) for g in dC_douts[:n_states]]
+    nit_sot_grads = [connected(g) for g in dC_douts[n_states : n_states + n_nit_sot]]
+
+    def is_float(var):
+        return isinstance(var.type, TensorType) and var.type.dtype in float_dtypes
+
+    diff_seqs = [i for i, seq in enumerate(seqs) if is_float(seq)]
+    diff_non_seqs = [i for i, non_seq in enumerate(non_seqs) if is_float(non_seq)]
+
+    # The variables used by every segment, which are passed down to the inner
+    # functions of the `Scan`s of the gradient
+    consts = [
+        *seqs,
+        *non_seqs,
+        *(g for g in state_grads if g is not None),
+        *(g for g in nit_sot_grads if g is not None),
+    ]
+
+    def unpack(consts):
+        grads = iter(consts[n_seqs + n_non_seqs :])
+        return (
+            consts[:n_seqs],
+            consts[n_seqs : n_seqs + n_non_seqs],
+            [None if g is None else next(grads) for g in state_grads],
+            [None if g is None else next(grads) for g in nit_sot_grads],
+        )
+
+    base_op = copy(op)
+    base_op.checkpoints = None
+
+    def segment(consts, windows_0, start, n):
+        """Run the loop for `n` steps from `start`, starting with the states `windows_0`."""
+        seq_values, non_seq_values, _, _ = unpack(consts)
+        seq_slices = [seq[start : start + n] for seq in seq_values]
+        buffers = [
+            pt.concatenate([w, pt.zeros((n, *w.shape[1:]), dtype=w.dtype)])
+            for w in windows_0
+        ]
+        outputs = base_op(
+            n,
+            *seq_slices,
+            *buffers,
+            *(n,) * n_nit_sot,
+            *non_seq_values,
+            return_list=True,
+        )
+        return seq_slices, outputs
+
+    def leaf_grad(consts, windows_0, start, n, adjoints):
+        seq_values, non_seq_values, seg_state_grads, seg_nit_sot_grads = unpack(consts)
+        seq_slices, outputs = segment(consts, windows_0, start, n)
+
+        known_grads = {}
+        for out, window, g, adjoint in zip(
+            outputs[:n_states], windows, seg_state_grads, adjoints, strict=True
+        ):
+            # The gradients of the initial states of the segment are
+            # accounted for by the previous one
+            out_grad = pt.zeros_like(out)
+            if g is not None:
+                out_grad = set_subtensor(
+                    out_grad[window:], g[start + window : start + window + n]
+                )
+            known_grads[out] = pt.inc_subtensor(out_grad[n:], adjoint)
+        for out, g in zip(outputs[n_states:], seg_nit_sot_grads, strict=True):
+            if g is not None:
+                known_grads[out] = g[start : start + n]
+
+        wrt = [
+            *windows_0,
+            *(seq_slices[i] for i in diff_seqs),
+            *(non_seq_values[i] for i in diff_non_seqs),
+        ]
+        grads = grad(
+            cost=None,
+            known_grads=known_grads,
+            wrt=wrt,
+            disconnected_inputs="ignore",
+            return_disconnected="zero",
+        )
+        return (
+            grads[:n_states],
+            grads[n_states : n_states + len(diff_seqs)],
+            grads[n_states + len(diff_seqs) :],
+        )
+
+    def level_grad(level, consts, windows_0, start, n, adjoints):
+        """Compute the gradient of the `n` steps from `start`, given the adjoints of the final states."""
+        if level == len(segment_lengths):
+            return leaf_grad(consts, windows_0, start, n, adjoints)
+
+        segment_length = segment_lengths[level]
+        n_segments = pt.maximum((n + segment_length - 1) // segment_length, 1)
+        starts = start + pt.arange(n_segments, dtype="int64") * segment_length
+        lengths = pt.minimum(segment_length, start + n - starts)
+
+        def advance(seg_start, seg_length, *args):
+            _, outputs = segment(
+                args[n_states:], args[:n_states], seg_start, seg_length
+            )
+            return [
+                pt.specify_shape(out[-window:], w.type.shape)
+                for out, w, window in zip(
+                    outputs[:n_states], args[:n_states], windows, strict=True
+                )
+            ]
+
+        # Store the states at the start of every segment
+        traces, _ = scan(
+            advance,
+            sequences=[starts[:-1], lengths[:-1]],
+            outputs_info=list(windows_0),
+            non_sequences=list(consts),
+            n_steps=n_segments - 1,
+            return_list=True,
+        )
+        snapshots = [
+            pt.concatenate([w[None], trace])
+            for w, trace in zip(windows_0, traces, strict=True)
+        ]
+
+        n_diff_non_seqs = len(diff_non_seqs)
+
+        def reverse(seg_start, seg_length, *args):
+            seg_windows = args[:n_states]
+            seg_adjoints = args[n_states : 2 * n_states]
+            acc_non_seq_grads = args[2 * n_states : 2 * n_states + n_diff_non_seqs]
+            seg_consts = args[2 * n_states + n_diff_non_seqs :]
+            new_adjoints, seq_grads, non_seq_grads = level_grad(
+                level + 1, seg_consts, seg_windows, seg_start, seg_length, seg_adjoints
+            )
+            # Pad the gradients of the sequences, since the last segment can
+            # be shorter than the others
+            seq_grads = [
+                set_subtensor(
+                    pt.zeros((segment_length, *g.shape[1:]), dtype=g.dtype)[
+                        :seg_length
+                    ],
+                    g,
+                )
+                for g in seq_grads
+            ]
+            return [
+                *(
+                    pt.specify_shape(new.astype(old.dtype), old.type.shape)
+                    for new, old in zip(new_adjoints, seg_adjoints, strict=True)
+                ),
+                *(
+                    (acc + g).astype(acc.dtype)
+                    for acc, g in zip(acc_non_seq_grads, non_seq_grads, strict=True)
+                ),
+                *seq_grads,
+            ]
+
+        _, non_seq_values, _, _ = unpack(consts)
+        results, _ = scan(
+            reverse,
+            sequences=[starts[::-1], lengths[::-1], *(s[::-1] for s in snapshots)],
+            outputs_info=[
+                *adjoints,
+                *(pt.zeros_like(non_seq_values[i]) for i in diff_non_seqs),
+                *(None,) * len(diff_seqs),
+            ],
+            non_sequences=list(consts),
+            return_list=True,
+        )
+        new_adjoints = [r[-1] for r in results[:n_states]]
+        non_seq_grads = [r[-1] for r in results[n_states : n_states + n_diff_non_seqs]]
+        seq_grads = [
+            r[::-1].reshape(
+                (n_segments * segment_length, *(r.shape[i] for i in range(2, r.ndim))),
+                ndim=r.ndim - 1,
+            )[:n]
+            for r in results[n_states + n_diff_non_seqs :]
+        ]
+        return new_adjoints, seq_grads, non_seq_grads
+
+    initial_windows = [
+        state[:window] for state, window in zip(states, windows, strict=True)
+    ]
+    initial_adjoints, seq_grads, non_seq_grads = level_grad(
+        0,
+        consts,
+        initial_windows,
+        0,
+        n_steps,
+        [pt.zeros_like(w) for w in initial_windows],
+    )
+
+    gradients = [DisconnectedType()()]
+    seq_grads = iter(seq_grads)
+    for seq in seqs:
+        if is_float(seq):
+            gradients.append(
+                set_subtensor(pt.zeros_like(seq)[:n_steps], next(seq_grads))
+            )
+        else:
+            gradients.append(pt.zeros_like(seq, dtype=config.floatX))
+    for state, window, g, adjoint in zip(
+        states, windows, state_grads, initial_adjoints, strict=True
+    ):
+        if g is not None:
+            adjoint = adjoint + g[:window]
+        gradients.append(set_subtensor(pt.zeros_like(state)[:window], adjoint))
+    gradients += [DisconnectedType()() for _ in range(n_nit_sot)]
+    non_seq_grads = iter(non_seq_grads)
+    for i, non_seq in enumerate(non_seqs):
+        if is_float(non_seq):
+            gradients.append(next(non_seq_grads))
+        elif isinstance(non_seq.type, TensorType):
+            gradients.append(pt.zeros_like(non_seq, dtype=config.floatX))
+        else:
+            gradients.append(
+                grad_undefined(op, len(gradients), non_seq, "Not a tensor")
+            )
+
+    # Mask the gradients of the inputs that aren't connected to the cost
+    connection_pattern = op.connection_pattern(outs[0].owner)
+    for idx in range(len(gradients)):
+        if not any(
+            connection_pattern[idx][k] and not isinstance(g.type, DisconnectedType)
+            for k, g in enumerate(dC_douts)
+        ):
+            gradients[idx] = DisconnectedType()()
+    return gradients
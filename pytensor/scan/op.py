@@ -689,6 +689,7 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
         profile: str | bool | None = None,
         allow_gc: bool = True,
         strict: bool = True,
+        checkpoints: int | None = None,
     ):
         r"""
 
@@ -756,6 +757,12 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
             flag `pytensor.config.allow_gc` means.
         strict
             If ``True``, all the shared variables used in the inner-graph must be provided.
+        checkpoints
+            If not ``None``, the number of recurrent states that the gradient of
+            `Scan` is allowed to store at once.  Instead of using every state
+            computed by the forward loop, the gradient then recomputes them from
+            a few stored ones, following the schedule given by
+            `pytensor.scan.checkpoints.checkpoint_schedule`.
 
         """
         self.fgraph, shared_inputs, _, _ = construct_nominal_fgraph(inputs, outputs)
@@ -767,6 +774,7 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
 
         self.info = info
         self.truncate_gradient = truncate_gradient
+        self.checkpoints = checkpoints
         self.name = name
         self.profile = profile
         self.allow_gc = allow_gc
@@ -888,6 +896,7 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
         return preallocated_mitmot_outs, mitmots_preallocated
 
     def __setstate__(self, d):
+        d.setdefault("checkpoints", None)
         self.__dict__.update(d)
         # Ensure that the graph associated with the inner function is valid.
         self.validate_inner_graph()
@@ -1261,6 +1270,9 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
         if self.truncate_gradient != other.truncate_gradient:
             return False
 
+        if self.checkpoints != other.checkpoints:
+            return False
+
         if self.name != other.name:
             return False
 
@@ -1311,6 +1323,7 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
                 self.info,
                 self.profile,
                 self.truncate_gradient,
+                self.checkpoints,
                 self.name,
                 self.allow_gc,
             )
@@ -2370,6 +2383,13 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
     def L_op(self, inputs, outs, dC_douts):
         if not isinstance(outs, list | tuple):
             outs = [outs]
+
+        if self.checkpoints is not None:
+            from pytensor.scan.checkpoints import checkpointed_scan_grad
+
+            gradients = checkpointed_scan_grad(self, inputs, outs, dC_douts)
+            if gradients is not None:
+                return gradients
         # `grad_step` equals the number of steps the original scan node has
         # done (if the original scan is a while loop than this number is the
         # length of the output sequence)
@@ -3159,6 +3179,8 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
             rop_self_outputs,
             rop_of_inputs,
             inner_eval_points,
+            # Outputs that don't depend on the inner inputs have zero tangents
+            disconnected_outputs="ignore",
             use_op_rop_implementation=True,
         )
         if not isinstance(rop_outs, list | tuple):
@@ -3220,7 +3242,7 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
             else:
                 clean_eval_points.append(inp.zeros_like())
 
-        scan_mit_sot = inputs[b:e] + eval_points[b:e]
+        scan_mit_sot = inputs[b:e] + clean_eval_points
         inner_mit_sot = self_inputs[ib:ie] + inner_eval_points[ib:ie]
 
         # SIT_SOT sequences ...
@@ -199,6 +199,7 @@ def remove_constants_and_unused_inputs_scan(fgraph, node):
             mode=op.mode,
             profile=op.profile,
             truncate_gradient=op.truncate_gradient,
+            checkpoints=op.checkpoints,
             # TODO: This seems questionable
             name=op.name,
             allow_gc=op.allow_gc,
@@ -373,6 +374,7 @@ def scan_push_out_non_seq(fgraph, node):
             mode=op.mode,
             profile=op.profile,
             truncate_gradient=op.truncate_gradient,
+            checkpoints=op.checkpoints,
             # TODO: This seems questionable
             name=op.name,
             allow_gc=op.allow_gc,
@@ -607,6 +609,7 @@ def scan_push_out_seq(fgraph, node):
             mode=op.mode,
             profile=op.profile,
             truncate_gradient=op.truncate_gradient,
+            checkpoints=op.checkpoints,
             # TODO: This seems questionable
             name=op.name,
             allow_gc=op.allow_gc,
@@ -790,6 +793,7 @@ def add_nitsot_outputs(
         mode=old_scan_node.op.mode,
         profile=old_scan_node.op.profile,
         truncate_gradient=old_scan_node.op.truncate_gradient,
+        checkpoints=old_scan_node.op.checkpoints,
         # TODO: This seems questionable
         name=old_scan_node.op.name,
         allow_gc=old_scan_node.op.allow_gc,
@@ -1672,6 +1676,7 @@ def scan_save_mem_rewrite(fgraph, node, backend_supports_output_pre_allocation:
             mode=op.mode,
             profile=op.profile,
             truncate_gradient=op.truncate_gradient,
+            checkpoints=op.checkpoints,
             # TODO: This seems questionable
             name=op.name,
             allow_gc=op.allow_gc,
@@ -1977,6 +1982,7 @@ class ScanMerge(GraphRewriter):
             mode=old_op.mode,
             profile=old_op.profile,
             truncate_gradient=old_op.truncate_gradient,
+            checkpoints=old_op.checkpoints,
             allow_gc=old_op.allow_gc,
             name="&".join(nd.op.name for nd in nodes),
         )
@@ -1993,7 +1999,8 @@ class ScanMerge(GraphRewriter):
         sense that it can be merged together with every other node in
         `set_nodes`. In order for two nodes to be mergeable, they have to go
         over the same number of steps, have the same condition (if any),
-        have the same value for truncate_gradient, and have the same mode.
+        have the same values for truncate_gradient and checkpoints, and have
+        the same mode.
         Questionable, we should also consider profile ?
 
         """
@@ -2003,6 +2010,7 @@ class ScanMerge(GraphRewriter):
         if (
             op.info.as_while != rep_op.info.as_while
             or op.truncate_gradient != rep_op.truncate_gradient
+            or op.checkpoints != rep_op.checkpoints
             or op.mode != rep_op.mode
         ):
             return False
@@ -2190,6 +2198,7 @@ def scan_merge_inouts(fgraph, node):
             mode=node.op.mode,
             profile=node.op.profile,
             truncate_gradient=node.op.truncate_gradient,
+            checkpoints=node.op.checkpoints,
             # TODO: This seems questionable
             name=node.op.name,
             allow_gc=node.op.allow_gc,
@@ -2447,6 +2456,7 @@ def scan_push_out_dot1(fgraph, node):
                         mode=op.mode,
                         profile=op.profile,
                         truncate_gradient=op.truncate_gradient,
+                        checkpoints=op.checkpoints,
                         # TODO: This seems questionable
                         name=op.name,
                         allow_gc=op.allow_gc,
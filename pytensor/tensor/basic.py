@@ -1651,11 +1651,16 @@ class Alloc(COp):
         sh = tuple(int(i) for i in inputs[1:])
         self._check_runtime_broadcast(node, v, sh)
 
-        if out[0] is None or out[0].shape != sh:
+        order = "F" if self._fortran_output(node) else "C"
+        if (
+            out[0] is None
+            or out[0].shape != sh
+            or (order == "F" and not out[0].flags.f_contiguous)
+        ):
             if v.size == 1 and v.item() == 0:
-                out[0] = np.zeros(sh, dtype=v.dtype)
+                out[0] = np.zeros(sh, dtype=v.dtype, order=order)
             else:
-                out[0] = np.empty(sh, dtype=v.dtype)
+                out[0] = np.empty(sh, dtype=v.dtype, order=order)
                 out[0][...] = v  # broadcast v to fill us up
         else:
             # reuse the allocated memory.
@@ -1696,15 +1701,19 @@ class Alloc(COp):
                 }}
                 """
 
+        # The clients of the output prefer fortran order (see `PropagateMemoryOrder`)
+        fortran = int(self._fortran_output(node))
+
         code += f"""
             need_new_out = (NULL == {zz});
             for (int i = 0; i < {o_ndim}; i++)
                 need_new_out = (need_new_out || (PyArray_DIMS({zz})[i] != shape[i]));
+            need_new_out = (need_new_out || ({fortran} && !PyArray_IS_F_CONTIGUOUS({zz})));
 
             if (need_new_out)
             {{
                 Py_XDECREF({zz});
-                {zz} = (PyArrayObject*) PyArray_SimpleNew({o_ndim}, shape, PyArray_TYPE({vv}));
+                {zz} = (PyArrayObject*) PyArray_EMPTY({o_ndim}, shape, PyArray_TYPE({vv}), {fortran});
                 if (!{zz})
                 {{
                     PyErr_SetString(PyExc_MemoryError, "alloc failed");
@@ -1722,7 +1731,17 @@ class Alloc(COp):
         return code
 
     def c_code_cache_version(self):
-        return (5,)
+        return (6,)
+
+    def c_code_cache_version_apply(self, node):
+        version = self.c_code_cache_version()
+        if self._fortran_output(node):
+            version = (*version, ("memory_order", "F"))
+        return version
+
+    @staticmethod
+    def _fortran_output(node):
+        return getattr(node.outputs[0].tag, "memory_order", None) == "F"
 
     def infer_shape(self, fgraph, node, input_shapes):
         return [node.inputs[1:]]
@@ -1960,9 +1979,13 @@ class MakeVector(COp):
         return grads
 
     def R_op(self, inputs, eval_points):
-        if None in eval_points:
+        if all(ev is None for ev in eval_points):
             return [None]
-        return self.make_node(*eval_points).outputs
+        tangents = [
+            inp.zeros_like() if ev is None else ev
+            for inp, ev in zip(inputs, eval_points, strict=True)
+        ]
+        return self.make_node(*tangents).outputs
 
 
 make_vector = MakeVector()
@@ -2679,9 +2702,14 @@ class Join(COp):
         return code
 
     def R_op(self, inputs, eval_points):
-        if None in eval_points[1:]:
+        if all(ev is None for ev in eval_points[1:]):
             return [None]
-        return self.make_node(inputs[0], *eval_points[1:]).outputs
+        # The tensors that don't depend on the `wrt` of `Rop` have zero tangents
+        tangents = [
+            inp.zeros_like() if ev is None else ev
+            for inp, ev in zip(inputs[1:], eval_points[1:], strict=True)
+        ]
+        return self.make_node(inputs[0], *tangents).outputs
 
     def L_op(self, inputs, outputs, grads):
         """The gradient wrt a join op is a `Split`, used to partition
@@ -100,7 +100,7 @@ from pytensor.configdefaults import config
 from pytensor.graph.basic import Apply, view_roots
 from pytensor.graph.op import Op
 from pytensor.graph.utils import InconsistencyError, MethodNotDefined, TestValueError
-from pytensor.link.c.op import COp
+from pytensor.link.c.op import COp, OpenMPOp
 from pytensor.link.c.params_type import ParamsType
 from pytensor.printing import FunctionPrinter, pprint
 from pytensor.scalar import bool as bool_t
@@ -1286,13 +1286,20 @@ class Dot22Scalar(GemmRelated):
 _dot22scalar = Dot22Scalar()
 
 
-class BatchedDot(COp):
+class BatchedDot(OpenMPOp):
     """
     Computes a batch matrix-matrix dot with tensor3 variables
 
         batched_dot(a, b)[i] = dot(a[i], b[i])
+
+    The batches can have any strides, including 0 for an input broadcasted
+    along the batch axis.  When OpenMP is enabled, batches of small matrices
+    are split across threads, as the BLAS doesn't parallelize their products.
     """
 
+    openmp_max_core_size = 64**3
+    """The number of multiply-adds of a product above which only the BLAS is multithreaded."""
+
     __props__ = ()
     gufunc_signature = "(b,m,k),(b,k,n)->(b,m,n)"
 
@@ -1361,8 +1368,8 @@ class BatchedDot(COp):
             if (Nx[0] != Ny[0]) {
                 PyErr_Format(PyExc_ValueError,
                              "Shape mismatch: batch sizes unequal."
-                             " x.shape is (%d, %d, %d),"
-                             " y.shape is (%d, %d, %d).",
+                             " x.shape is (%%d, %%d, %%d),"
+                             " y.shape is (%%d, %%d, %%d).",
                              Nx[0], Nx[1], Nx[2],
                              Ny[0], Ny[1], Ny[2]);
                 return 1;
@@ -1371,8 +1378,8 @@ class BatchedDot(COp):
             if (Nx[2] != Ny[1]) {
                 PyErr_Format(PyExc_ValueError,
                              "Shape mismatch: summation axis sizes unequal."
-                             " x.shape is (%d, %d, %d),"
-                             " y.shape is (%d, %d, %d).",
+                             " x.shape is (%%d, %%d, %%d),"
+                             " y.shape is (%%d, %%d, %%d).",
                              Nx[0], Nx[1], Nx[2],
                              Ny[0], Ny[1], Ny[2]);
                 return 1;
@@ -1408,35 +1415,54 @@ class BatchedDot(COp):
             char T = 'T';
             int Nz1 = Nz[1], Nz2 = Nz[2], Nx2 = Nx[2];
 
-            // loop over batch axis
-            for (int i = 0; i < Nz[0]; i++) {
+            if ((unit & 0x222) != 0) {
+                PyErr_SetString(PyExc_ValueError, "some matrix has no unit stride");
+                return 1;
+            }
+
+            // loop over batch axis, possibly in parallel
+            %(omp_pragma)s
+            for (npy_intp i = 0; i < Nz[0]; i++) {
+                dtype* xi = x + i * (Sx[0] / type_size);
+                dtype* yi = y + i * (Sy[0] / type_size);
+                dtype* zi = z + i * (Sz[0] / type_size);
                 switch(unit)
                 {
-                    case 0x000: gemm(&N, &N, &Nz2, &Nz1, &Nx2, &a, y, &sy_1, x, &sx_1, &b, z, &sz_1); break;
-                    case 0x100: gemm(&N, &T, &Nz2, &Nz1, &Nx2, &a, y, &sy_1, x, &sx_2, &b, z, &sz_1); break;
-                    case 0x010: gemm(&T, &N, &Nz2, &Nz1, &Nx2, &a, y, &sy_2, x, &sx_1, &b, z, &sz_1); break;
-                    case 0x110: gemm(&T, &T, &Nz2, &Nz1, &Nx2, &a, y, &sy_2, x, &sx_2, &b, z, &sz_1); break;
-                    case 0x001: gemm(&T, &T, &Nz1, &Nz2, &Nx2, &a, x, &sx_1, y, &sy_1, &b, z, &sz_2); break;
-                    case 0x101: gemm(&N, &T, &Nz1, &Nz2, &Nx2, &a, x, &sx_2, y, &sy_1, &b, z, &sz_2); break;
-                    case 0x011: gemm(&T, &N, &Nz1, &Nz2, &Nx2, &a, x, &sx_1, y, &sy_2, &b, z, &sz_2); break;
-                    case 0x111: gemm(&N, &N, &Nz1, &Nz2, &Nx2, &a, x, &sx_2, y, &sy_2, &b, z, &sz_2); break;
-                    default: PyErr_SetString(PyExc_ValueError, "some matrix has no unit stride"); return 1;
+                    case 0x000: gemm(&N, &N, &Nz2, &Nz1, &Nx2, &a, yi, &sy_1, xi, &sx_1, &b, zi, &sz_1); break;
+                    case 0x100: gemm(&N, &T, &Nz2, &Nz1, &Nx2, &a, yi, &sy_1, xi, &sx_2, &b, zi, &sz_1); break;
+                    case 0x010: gemm(&T, &N, &Nz2, &Nz1, &Nx2, &a, yi, &sy_2, xi, &sx_1, &b, zi, &sz_1); break;
+                    case 0x110: gemm(&T, &T, &Nz2, &Nz1, &Nx2, &a, yi, &sy_2, xi, &sx_2, &b, zi, &sz_1); break;
+                    case 0x001: gemm(&T, &T, &Nz1, &Nz2, &Nx2, &a, xi, &sx_1, yi, &sy_1, &b, zi, &sz_2); break;
+                    case 0x101: gemm(&N, &T, &Nz1, &Nz2, &Nx2, &a, xi, &sx_2, yi, &sy_1, &b, zi, &sz_2); break;
+                    case 0x011: gemm(&T, &N, &Nz1, &Nz2, &Nx2, &a, xi, &sx_1, yi, &sy_2, &b, zi, &sz_2); break;
+                    case 0x111: gemm(&N, &N, &Nz1, &Nz2, &Nx2, &a, xi, &sx_2, yi, &sy_2, &b, zi, &sz_2); break;
                 };
-                x += Sx[0] / type_size;
-                y += Sy[0] / type_size;
-                z += Sz[0] / type_size;
             }
 
             return 0;
         }
         """
-        return blas_header_text() + batch_gemm_defn
+        self.update_self_openmp()
+        if self.openmp:
+            # Only split batches of small products, which the BLAS runs on a
+            # single thread, and only if there's enough work for the threads
+            omp_pragma = (
+                "#pragma omp parallel for if("
+                f"Nz[0] > 1 && (npy_intp)Nz1 * Nz2 * Nx2 <= {self.openmp_max_core_size}"
+                f" && Nz[0] * Nz1 * Nz2 * Nx2 >= {int(config.openmp_elemwise_minsize)})"
+            )
+        else:
+            omp_pragma = ""
+        return blas_header_text() + batch_gemm_defn % {"omp_pragma": omp_pragma}
 
     def c_libraries(self, **kwargs):
         return ldflags()
 
     def c_compile_args(self, **kwargs):
-        return ldflags(libs=False, flags=True)
+        compile_args = ldflags(libs=False, flags=True)
+        return compile_args + [
+            arg for arg in super().c_compile_args(**kwargs) if arg not in compile_args
+        ]
 
     def c_lib_dirs(self, **kwargs):
         return ldflags(libs=False, libs_dir=True)
@@ -1577,7 +1603,11 @@ class BatchedDot(COp):
     def c_code_cache_version(self):
         from pytensor.tensor.blas_headers import blas_header_version
 
-        return (6, blas_header_version())
+        self.update_self_openmp()
+        version = [7, blas_header_version(), ("openmp", self.openmp)]
+        if self.openmp:
+            version.append(("openmp_minsize", int(config.openmp_elemwise_minsize)))
+        return tuple(version)
 
     def grad(self, inp, grads):
         x, y = inp
@@ -1,4 +1,5 @@
 from collections.abc import Callable, Sequence
+from textwrap import dedent
 from typing import Any, Literal, cast, overload
 
 import numpy as np
@@ -154,7 +155,6 @@ def _check_runtime_broadcast_core(numerical_inputs, batch_bcast_patterns, batch_
 class Blockwise(COp):
     """Generalizes a core `Op` to work with batched dimensions.
 
-    TODO: C implementation?
     TODO: Fuse Blockwise?
     """
 
@@ -408,6 +408,56 @@ class Blockwise(COp):
 
         return [[True for _ in node.outputs] for _ in node.inputs]
 
+    def R_op(self, inputs, eval_points):
+        from pytensor.tensor.extra_ops import broadcast_to
+
+        if all(eval_point is None for eval_point in eval_points):
+            return [None for _ in self.outputs_sig]
+
+        # Obtain core_op R_op
+        with config.change_flags(compute_test_value="off"):
+            core_inputs = [
+                tensor(
+                    dtype=inp.type.dtype,
+                    shape=inp.type.shape[inp.type.ndim - len(sig) :],
+                )
+                for inp, sig in zip(inputs, self.inputs_sig, strict=True)
+            ]
+            core_eval_points = [
+                None if eval_point is None else core_input.type()
+                for eval_point, core_input in zip(eval_points, core_inputs, strict=True)
+            ]
+            core_tangents = self.core_op.R_op(core_inputs, core_eval_points)
+
+        # Vectorize core tangents to original inputs
+        replace = dict(zip(core_inputs, inputs, strict=True))
+        replace.update(
+            (core_eval_point, eval_point)
+            for core_eval_point, eval_point in zip(
+                core_eval_points, eval_points, strict=True
+            )
+            if core_eval_point is not None
+        )
+        connected_core_tangents = [
+            core_tangent for core_tangent in core_tangents if core_tangent is not None
+        ]
+        connected_tangents = iter(
+            vectorize_graph(connected_core_tangents, replace=replace)
+        )
+
+        outputs = self(*inputs, return_list=True)
+        tangents = []
+        for core_tangent, output in zip(core_tangents, outputs, strict=True):
+            if core_tangent is None:
+                tangents.append(None)
+                continue
+            tangent = next(connected_tangents)
+            if tangent.type.ndim < output.type.ndim:
+                # The core tangent doesn't depend on the batched inputs
+                tangent = broadcast_to(tangent, output.shape)
+            tangents.append(tangent)
+        return tangents
+
     def L_op(self, inputs, outputs, output_gradients):
         batch_ndim = self.batch_ndim(outputs[0].owner)
 
@@ -531,6 +581,10 @@ class Blockwise(COp):
         _check_runtime_broadcast_core(inputs, batch_bcast, batch_ndim)
 
     def prepare_node(self, node, storage_map, compute_map, impl=None):
+        if impl == "c":
+            # The C implementation calls the C code of the core Op directly.
+            # If it is not available, `prepare_node` is called again with "py"
+            return
         node.tag.gufunc = self._create_node_gufunc(node, impl=impl)
 
     def perform(self, node, inputs, output_storage):
@@ -547,13 +601,379 @@ class Blockwise(COp):
         else:
             return self.name
 
-    def c_code(self, *args, **kwargs):
-        # Blockwise is a C_Op just so we can propagate compilation mode to the inner Op.
-        # It doesn't itself have a C implementation yet.
-        raise NotImplementedError()
+    def _c_core_node(self, node: Apply) -> Apply:
+        """Return the core node whose C code is run for each batch of `node`.
+
+        Raises `NotImplementedError` if the core `Op` can't be called from the
+        C implementation of `Blockwise`.
+        """
+        core_op = self.core_op
+        if not isinstance(core_op, COp):
+            raise NotImplementedError(f"{core_op} has no C implementation")
+        if core_op.params_type is not None:
+            raise NotImplementedError("Core Ops with params are not supported in C")
+        if self.destroy_map:
+            raise NotImplementedError("Inplace Blockwise is not supported in C")
+
+        core_node = self._create_dummy_core_node(node.inputs)
+        if not all(
+            isinstance(var.type, TensorType | ScalarType) for var in core_node.inputs
+        ) or not all(isinstance(var.type, TensorType) for var in core_node.outputs):
+            raise NotImplementedError(
+                "Only tensor and scalar core variables are supported in C"
+            )
+        return core_node
+
+    def c_headers(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_headers(**kwargs)
+        return []
+
+    def c_header_dirs(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_header_dirs(**kwargs)
+        return []
+
+    def c_libraries(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_libraries(**kwargs)
+        return []
+
+    def c_lib_dirs(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_lib_dirs(**kwargs)
+        return []
+
+    def c_compile_args(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_compile_args(**kwargs)
+        return []
+
+    def c_no_compile_args(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_no_compile_args(**kwargs)
+        return []
+
+    def c_support_code(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_support_code(**kwargs)
+        return ""
+
+    def c_init_code(self, **kwargs):
+        if isinstance(self.core_op, COp):
+            return self.core_op.c_init_code(**kwargs)
+        return []
+
+    def c_support_code_apply(self, node, name):
+        return self.core_op.c_support_code_apply(self._c_core_node(node), name)
+
+    def c_init_code_apply(self, node, name):
+        return self.core_op.c_init_code_apply(self._c_core_node(node), name)
+
+    def c_support_code_struct(self, node, name):
+        return self.core_op.c_support_code_struct(self._c_core_node(node), name)
+
+    def c_init_code_struct(self, node, name, sub):
+        return self.core_op.c_init_code_struct(self._c_core_node(node), name, sub)
+
+    def c_cleanup_code_struct(self, node, name):
+        return self.core_op.c_cleanup_code_struct(self._c_core_node(node), name)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+        """Run the C code of the core `Op` on each batch of the inputs.
+
+        The core inputs are views of the batches of the inputs, or their values
+        for scalar core inputs.  The core outputs of the first batch are
+        allocated by the core `Op`, and used to allocate the outputs.  The core
+        outputs of the following batches are views of the batches of the
+        outputs, which the core `Op` can reuse, and are otherwise copied into
+        them.  The views are moved from batch to batch, unless the core `Op`
+        kept a reference to them.
+
+        Batches are run sequentially, as the C code of the core `Op` may call
+        the Python C-API.
+        """
+        core_node = self._c_core_node(node)
+        batch_ndim = self.batch_ndim(node)
+        batch_bcast_patterns = [
+            inp.type.broadcastable[:batch_ndim] for inp in node.inputs
+        ]
+        out_bcast = (False,) * batch_ndim
+        fail = sub["fail"]
+
+        core_inputs = [f"{inp}_core" for inp in inputs]
+        core_outputs = [f"{out}_core" for out in outputs]
+        out_views = [f"{out}_batch" for out in outputs]
+        tensor_core_inputs = [
+            core_name
+            for core_inp, core_name in zip(core_node.inputs, core_inputs, strict=True)
+            if isinstance(core_inp.type, TensorType)
+        ]
+        scalar_core_inputs = [
+            core_name
+            for core_name in core_inputs
+            if core_name not in tensor_core_inputs
+        ]
+
+        # The core outputs and the Python objects of the scalar core inputs are
+        # released after each batch, and the views after the last one.  The
+        # core `Op` fails with the references released.
+        release_batch = "".join(
+            f"Py_XDECREF({core_name}); {core_name} = NULL;\n"
+            for core_name in core_outputs
+        ) + "".join(
+            f"Py_XDECREF(py_{core_name}); py_{core_name} = NULL;\n"
+            for core_name in scalar_core_inputs
+        )
+        release = release_batch + "".join(
+            f"Py_XDECREF({view}); {view} = NULL;\n"
+            for view in tensor_core_inputs + out_views
+        )
+        core_sub = dict(sub, fail=f"{{\n{release}{fail}\n}}")
+
+        core_code = self.core_op.c_code(
+            core_node, name, core_inputs, core_outputs, core_sub
+        )
+        core_cleanup = self.core_op.c_code_cleanup(
+            core_node, name, core_inputs, core_outputs, core_sub
+        )
+        # Some `Op`s access the Python objects of their inputs
+        py_core_inputs = [
+            core_name for core_name in core_inputs if f"py_{core_name}" in core_code
+        ]
+
+        declare = ""
+        for core_var, core_name in zip(
+            core_node.inputs + core_node.outputs,
+            core_inputs + core_outputs,
+            strict=True,
+        ):
+            declare += core_var.type.c_declare(core_name, sub)
+            declare += core_var.type.c_init(core_name, sub)
+        for core_name in core_inputs:
+            if core_name in scalar_core_inputs or core_name in py_core_inputs:
+                declare += f"PyObject* py_{core_name} = NULL;\n"
+        for out_view in out_views:
+            declare += f"PyArrayObject* {out_view} = NULL;\n"
+
+        # Broadcast the batch dimensions, without runtime broadcasting
+        batch_shape = f"npy_intp batch_shape[{max(batch_ndim, 1)}] = {{1}};\n"
+        for d in range(batch_ndim):
+            ref = None
+            for inp, bcast in zip(inputs, batch_bcast_patterns, strict=True):
+                if bcast[d]:
+                    continue
+                if ref is None:
+                    ref = inp
+                    batch_shape += f"batch_shape[{d}] = PyArray_DIMS({inp})[{d}];\n"
+                else:
+                    batch_shape += dedent(
+                        f"""
+                        if (PyArray_DIMS({inp})[{d}] != batch_shape[{d}]) {{
+                            if (PyArray_DIMS({inp})[{d}] == 1 || batch_shape[{d}] == 1) {{
+                                PyErr_SetString(PyExc_ValueError,
+                                    "Runtime broadcasting not allowed. "
+                                    "At least one input has a distinct batch dimension length of 1, but was not marked as broadcastable.");
+                            }} else {{
+                                PyErr_Format(PyExc_ValueError,
+                                    "Incompatible Blockwise batch input shapes along dimension %d", {d});
+                            }}
+                            {fail}
+                        }}
+                        """
+                    )
+        batch_shape += dedent(
+            f"""
+            npy_intp n_batches = 1;
+            for (int d = 0; d < {batch_ndim}; d++) {{
+                n_batches *= batch_shape[d];
+            }}
+            if (n_batches == 0) {{
+                PyErr_SetString(PyExc_NotImplementedError, "vectorize with zero size not implemented");
+                {fail}
+            }}
+            npy_intp batch_index[{max(batch_ndim, 1)}] = {{0}};
+            """
+        )
+
+        def batch_ptr(var, bcast):
+            offset = " + ".join(
+                f"batch_index[{d}] * PyArray_STRIDES({var})[{d}]"
+                for d in range(batch_ndim)
+                if not bcast[d]
+            )
+            return (
+                f"(PyArray_BYTES({var}) + {offset})"
+                if offset
+                else f"PyArray_BYTES({var})"
+            )
+
+        def batch_view(view, var, bcast, flags):
+            return dedent(
+                f"""
+                if ({view} && Py_REFCNT({view}) == 1) {{
+                    ((PyArrayObject_fields*){view})->data = {batch_ptr(var, bcast)};
+                    PyArray_UpdateFlags({view}, NPY_ARRAY_ALIGNED);
+                }} else {{
+                    Py_XDECREF({view});
+                    Py_INCREF(PyArray_DESCR({var}));
+                    {view} = (PyArrayObject*)PyArray_NewFromDescr(
+                        &PyArray_Type,
+                        PyArray_DESCR({var}),
+                        PyArray_NDIM({var}) - {batch_ndim},
+                        PyArray_DIMS({var}) + {batch_ndim},
+                        PyArray_STRIDES({var}) + {batch_ndim},
+                        {batch_ptr(var, bcast)},
+                        {flags},
+                        NULL
+                    );
+                    if (!{view}) {{
+                        {core_sub["fail"]}
+                    }}
+                    Py_INCREF({var});
+                    if (PyArray_SetBaseObject({view}, (PyObject*){var}) < 0) {{
+                        {core_sub["fail"]}
+                    }}
+                }}
+                """
+            )
+
+        # Views or values of the core inputs of the current batch
+        set_inputs = ""
+        for inp, core_inp, core_name, bcast in zip(
+            inputs, core_node.inputs, core_inputs, batch_bcast_patterns, strict=True
+        ):
+            if core_name in tensor_core_inputs:
+                set_inputs += batch_view(core_name, inp, bcast, "0")
+                if core_name in py_core_inputs:
+                    set_inputs += f"py_{core_name} = (PyObject*){core_name};\n"
+            else:
+                dtype = core_inp.type.dtype_specs()[1]
+                set_inputs += f"{core_name} = *({dtype}*){batch_ptr(inp, bcast)};\n"
+                if core_name in py_core_inputs:
+                    set_inputs += dedent(
+                        f"""
+                        py_{core_name} = PyArray_Scalar(
+                            {batch_ptr(inp, bcast)}, PyArray_DESCR({inp}), (PyObject*){inp}
+                        );
+                        if (!py_{core_name}) {{
+                            {core_sub["fail"]}
+                        }}
+                        """
+                    )
+
+        # The core outputs of the first batch are allocated by the core Op, and
+        # then used to allocate the outputs
+        set_outputs = ""
+        alloc_outputs = ""
+        store_outputs = ""
+        for out, core_out, core_name, out_view, out_var in zip(
+            outputs,
+            core_node.outputs,
+            core_outputs,
+            out_views,
+            node.outputs,
+            strict=True,
+        ):
+            core_ndim = core_out.type.ndim
+            ndim = batch_ndim + core_ndim
+            type_num = out_var.type.dtype_specs()[2]
+            set_outputs += dedent(
+                f"""
+                if (batch > 0) {{
+                    {batch_view(out_view, out, out_bcast, "NPY_ARRAY_WRITEABLE")}
+                    Py_INCREF({out_view});
+                    {core_name} = {out_view};
+                }}
+                """
+            )
+            alloc_outputs += dedent(
+                f"""
+                {{
+                    if (!{core_name} || PyArray_NDIM({core_name}) != {core_ndim}) {{
+                        PyErr_SetString(PyExc_ValueError,
+                            "The core Op returned an output with an unexpected number of dimensions");
+                        {core_sub["fail"]}
+                    }}
+                    npy_intp dims[{max(ndim, 1)}];
+                    for (int d = 0; d < {batch_ndim}; d++) {{
+                        dims[d] = batch_shape[d];
+                    }}
+                    for (int d = 0; d < {core_ndim}; d++) {{
+                        dims[{batch_ndim} + d] = PyArray_DIMS({core_name})[d];
+                    }}
+                    if (!{out} || PyArray_NDIM({out}) != {ndim}
+                        || !PyArray_IS_C_CONTIGUOUS({out})
+                        || !PyArray_CompareLists(PyArray_DIMS({out}), dims, {ndim})) {{
+                        Py_XDECREF({out});
+                        {out} = (PyArrayObject*)PyArray_EMPTY({ndim}, dims, {type_num}, 0);
+                        if (!{out}) {{
+                            {core_sub["fail"]}
+                        }}
+                    }}
+                    {batch_view(out_view, out, out_bcast, "NPY_ARRAY_WRITEABLE")}
+                }}
+                """
+            )
+            store_outputs += dedent(
+                f"""
+                if ({core_name} != {out_view}) {{
+                    if (batch > 0
+                        && (PyArray_NDIM({core_name}) != {core_ndim}
+                            || !PyArray_CompareLists(PyArray_DIMS({core_name}), PyArray_DIMS({out_view}), {core_ndim}))) {{
+                        PyErr_SetString(PyExc_ValueError,
+                            "The core Op returned outputs of different shapes for different batches");
+                        {core_sub["fail"]}
+                    }}
+                    if (PyArray_CopyInto({out_view}, {core_name}) < 0) {{
+                        {core_sub["fail"]}
+                    }}
+                }}
+                """
+            )
+
+        next_batch = "".join(
+            dedent(
+                f"""
+                if (++batch_index[{d}] < batch_shape[{d}]) {{
+                    continue;
+                }}
+                batch_index[{d}] = 0;
+                """
+            )
+            for d in reversed(range(batch_ndim))
+        )
+
+        return dedent(
+            f"""
+            {{
+            {declare}
+            {batch_shape}
+            for (npy_intp batch = 0; batch < n_batches; batch++) {{
+                {set_inputs}
+                {set_outputs}
+                {{
+                {core_code}
+                }}
+                {core_cleanup}
+                if (batch == 0) {{
+                    {alloc_outputs}
+                }}
+                {store_outputs}
+                {release_batch}
+                {next_batch}
+            }}
+            {release}
+            }}
+            """
+        )
 
-    def c_code_cache_version(self):
-        return (-1,)
+    def c_code_cache_version_apply(self, node):
+        core_node = self._c_core_node(node)
+        core_version = self.core_op.c_code_cache_version_apply(core_node)
+        if not core_version:
+            return ()
+        return (1, core_version)
 
 
 @_vectorize_node.register(Op)
@@ -1,5 +1,7 @@
 from collections.abc import Sequence
 from copy import copy
+from functools import reduce
+from itertools import chain
 from textwrap import dedent
 from typing import Literal
 
@@ -8,24 +10,26 @@ import numpy as np
 import pytensor.tensor.basic
 from pytensor.configdefaults import config
 from pytensor.gradient import DisconnectedType
-from pytensor.graph.basic import Apply
+from pytensor.graph.basic import Apply, ancestors
 from pytensor.graph.null_type import NullType
 from pytensor.graph.replace import _vectorize_node, _vectorize_not_needed
 from pytensor.graph.utils import MethodNotDefined
 from pytensor.link.c.basic import failure_code
-from pytensor.link.c.op import COp, ExternalCOp, OpenMPOp
+from pytensor.link.c.op import ExternalCOp, OpenMPOp
 from pytensor.link.c.params_type import ParamsType
 from pytensor.misc.frozendict import frozendict
 from pytensor.npy_2_compat import normalize_axis_tuple
 from pytensor.printing import Printer, pprint
 from pytensor.scalar import get_scalar_type
+from pytensor.scalar.basic import Cast, Composite, int64, transfer_type, upcast
 from pytensor.scalar.basic import identity as scalar_identity
-from pytensor.scalar.basic import int64, transfer_type, upcast
 from pytensor.tensor import elemwise_cgen as cgen
 from pytensor.tensor import get_vector_length
 from pytensor.tensor.basic import _get_vector_length, as_tensor_variable
+from pytensor.tensor.openmp_tuning import openmp_minsize
 from pytensor.tensor.type import (
     TensorType,
+    complex_dtypes,
     continuous_dtypes,
     discrete_dtypes,
     float_dtypes,
@@ -298,6 +302,57 @@ class DimShufflePrinter(Printer):
 pprint.assign(DimShuffle, DimShufflePrinter())
 
 
+def _array_impl(scalar_op):
+    r"""Return a function that applies `scalar_op` elementwise to NumPy arrays.
+
+    The inner graphs of `Composite`\s are evaluated one node at a time, and
+    the associative `ScalarOp`\s with binary NumPy ufuncs are applied pairwise,
+    so that any number of operands is supported.  The function returns a list
+    with one array per output.
+
+    """
+    from pytensor.scalar.basic import Composite
+
+    if isinstance(scalar_op, Composite):
+        fgraph = scalar_op.fgraph
+        order = [
+            (node, _array_impl(node.op), [out.type.dtype for out in node.outputs])
+            for node in fgraph.toposort()
+        ]
+
+        def composite_impl(*inputs):
+            values = dict(zip(fgraph.inputs, inputs, strict=True))
+            for node, impl, dtypes in order:
+                node_inputs = [
+                    values[inp] if inp.owner or inp in values else inp.data
+                    for inp in node.inputs
+                ]
+                for out, value, dtype in zip(
+                    node.outputs, impl(*node_inputs), dtypes, strict=True
+                ):
+                    values[out] = np.asarray(value, dtype=dtype)
+            return [
+                values[out] if out.owner or out in values else out.data
+                for out in fgraph.outputs
+            ]
+
+        return composite_impl
+
+    nfunc_spec = getattr(scalar_op, "nfunc_spec", None)
+    if nfunc_spec is not None and nfunc_spec[2] == 1:
+        nfunc = import_func_from_string(nfunc_spec[0])
+        if nfunc is not None:
+            if nfunc_spec[1] == scalar_op.nin:
+                return lambda *inputs: [nfunc(*inputs)]
+            if nfunc_spec[1] == 2 and scalar_op.associative:
+                return lambda *inputs: [reduce(nfunc, inputs)]
+
+    ufunc = np.frompyfunc(scalar_op.impl, scalar_op.nin, scalar_op.nout)
+    if scalar_op.nout == 1:
+        return lambda *inputs: [ufunc(*inputs)]
+    return lambda *inputs: list(ufunc(*inputs))
+
+
 class Elemwise(OpenMPOp):
     """Generalizes a scalar `Op` to tensors.
 
@@ -660,16 +715,19 @@ class Elemwise(OpenMPOp):
         self.scalar_op.prepare_node(node.tag.fake_node, None, None, impl)
 
     def perform(self, node, inputs, output_storage):
-        if (len(node.inputs) + len(node.outputs)) > 32:
-            # Some versions of NumPy will segfault, other will raise a
-            # ValueError, if the number of operands in an ufunc is more than 32.
-            # In that case, the C version should be used, or Elemwise fusion
-            # should be disabled.
-            # FIXME: This no longer calls the C implementation!
-            super().perform(node, inputs, output_storage)
-
         self._check_runtime_broadcast(node, inputs)
 
+        if (len(node.inputs) + len(node.outputs)) > 32:
+            # NumPy ufuncs support at most 32 operands (64 since NumPy 2.0),
+            # so these nodes are evaluated one inner scalar `Op` at a time
+            variables = _array_impl(self.scalar_op)(*inputs)
+            out_shape = np.broadcast_shapes(*(inp.shape for inp in inputs))
+            for i, (variable, storage) in enumerate(zip(variables, output_storage)):
+                out = self._output_buffer(node, i, inputs, storage, out_shape)
+                np.copyto(out, variable, casting="unsafe")
+                storage[0] = out
+            return
+
         ufunc_args = inputs
         ufunc_kwargs = {}
         # We supported in the past calling manually op.perform.
@@ -681,11 +739,6 @@ class Elemwise(OpenMPOp):
             nout = self.nfunc_spec[2]
             if hasattr(node.tag, "sig"):
                 ufunc_kwargs["sig"] = node.tag.sig
-            # Unfortunately, the else case does not allow us to
-            # directly feed the destination arguments to the nfunc
-            # since it sometimes requires resizing. Doing this
-            # optimization is probably not worth the effort, since we
-            # should normally run the C version of the Op.
         else:
             # the second calling form is used because in certain versions of
             # numpy the first (faster) version leads to segfaults
@@ -707,6 +760,22 @@ class Elemwise(OpenMPOp):
 
             nout = ufunc.nout
 
+        if isinstance(ufunc, np.ufunc) and ufunc.nout == len(output_storage):
+            # Write the results directly in the output buffers, which are
+            # the destroyed inputs for inplace outputs, and are reused from
+            # the previous call when possible.  The unsafe casting matches the
+            # conversion to the output dtypes of the other branch.
+            out_shape = np.broadcast_shapes(*(inp.shape for inp in inputs))
+            outs = tuple(
+                self._output_buffer(node, i, inputs, storage, out_shape)
+                for i, storage in enumerate(output_storage)
+            )
+            ufunc(*ufunc_args, out=outs, casting="unsafe", **ufunc_kwargs)
+            # zip strict not specified because we are in a hot loop
+            for storage, out in zip(output_storage, outs):
+                storage[0] = out
+            return
+
         variables = ufunc(*ufunc_args, **ufunc_kwargs)
 
         if nout == 1:
@@ -727,6 +796,24 @@ class Elemwise(OpenMPOp):
             if not variable.flags.owndata:
                 storage[0] = variable.copy()
 
+    def _output_buffer(self, node, i, inputs, storage, out_shape):
+        """Return the array in which the `i`-th output of `node` is written by `perform`."""
+        if i in self.inplace_pattern:
+            return inputs[self.inplace_pattern[i]]
+        dtype = node.outputs[i].type.dtype
+        out = storage[0]
+        if (
+            isinstance(out, np.ndarray)
+            and out.shape == out_shape
+            and out.dtype == dtype
+            and out.flags.writeable
+            # The buffer must not be used as an input, which can only
+            # happen if `perform` is called manually
+            and not any(out is inp for inp in inputs)
+        ):
+            return out
+        return np.empty(out_shape, dtype=dtype)
+
     @staticmethod
     def _check_runtime_broadcast(node, inputs):
         # zip strict not specified because we are in a hot loop
@@ -839,16 +926,20 @@ class Elemwise(OpenMPOp):
 
         # Check if all inputs (except broadcasted scalar) are fortran.
         # In that case, create a fortran output ndarray.
+        # When the clients of the outputs prefer fortran order (see
+        # `PropagateMemoryOrder`), broadcasted inputs are ignored as well.
+        fortran_output = self._fortran_output(node)
         z = list(zip(inames, inputs, strict=True))
         alloc_fortran = " && ".join(
             f"PyArray_ISFORTRAN({arr})"
             for arr, var in z
             if not all(s == 1 for s in var.type.shape)
+            and not (fortran_output and any(var.type.broadcastable))
         )
         # If it is a scalar, make it c contig to prevent problem with
         # NumPy C and F contig not always set as both of them.
         if len(alloc_fortran) == 0:
-            alloc_fortran = "0"
+            alloc_fortran = "1" if fortran_output else "0"
 
         alloc = ""
         # We loop over the "real" outputs, i.e., those that are not
@@ -974,6 +1065,7 @@ class Elemwise(OpenMPOp):
                     loop_tasks=all_code,
                     sub=sub,
                     openmp=self.openmp,
+                    openmp_minsize=self._openmp_minsize(node),
                 )
         else:
             loop = cgen.make_reordered_loop(
@@ -983,6 +1075,7 @@ class Elemwise(OpenMPOp):
                 inner_task=code,
                 sub=sub,
                 openmp=self.openmp,
+                openmp_minsize=self._openmp_minsize(node),
             )
 
         # If all inputs and outputs are contiguous
@@ -1000,67 +1093,40 @@ class Elemwise(OpenMPOp):
                     node, nodename + "_scalar_contig_", _inames, onames, sub
                 )
             except MethodNotDefined:
-                # Try to make one generic version, this will help the
-                # compiler to vectorize the code as their won't be as
-                # many ptr and the stride will be hard coded.
-                if all(
-                    # io.type.shape == node.outputs[1].type.shape
-                    # Elemwise does not specify non-broadcastable static/type-levelshape
-                    # information for its outputs yet
-                    node.outputs[0].type.is_super(io.type)
-                    for io in node.inputs + node.outputs
-                ) and (
-                    len(node.inputs) <= 1
-                    # If either one of the inputs has a `None` shape, we cannot
-                    # assume they will have the same size
-                    or all(
-                        len(set(inp_shape)) == 1 and None not in inp_shape
-                        for inp_shape in zip(
-                            *(inp.type.shape for inp in node.inputs), strict=True
-                        )
-                    )
-                ):
-                    z = onames[0]
-                    contig = f"""
-                    // All output have the same size
-                    npy_intp n = PyArray_SIZE({z});
-                    """
-                    index = ""
-                    for x, var in zip(
-                        inames + onames, inputs + node.outputs, strict=True
-                    ):
-                        if not all(s == 1 for s in var.type.shape):
-                            contig += f"""
-            dtype_{x} * {x}_ptr = (dtype_{x}*) PyArray_DATA({x});
-                            """
-                            index += f"""
-            dtype_{x}& {x}_i = {x}_ptr[i];
-                            """
-                        else:
-                            contig += f"""
-            dtype_{x}& {x}_i = ((dtype_{x}*) PyArray_DATA({x}))[0];
-                            """
-                    if self.openmp:
-                        contig += f"""#pragma omp parallel for if(n>={int(config.openmp_elemwise_minsize)})
-                        """
-                    contig += f"""
-                    for(int i=0; i<n; i++){{
-                        {index}
-                        {task_code};
-                    }}
-                    """
+                # Use a generic loop over contiguous arrays, which the
+                # compiler can vectorize as it doesn't have to handle
+                # arbitrary strides, when the arrays are contiguous at runtime
+                contiguous_loop = cgen.make_contiguous_loop(
+                    names=inames + list(real_onames),
+                    dtypes=dtypes,
+                    broadcastable=[
+                        var.type.broadcastable for var in inputs + list(real_outputs)
+                    ],
+                    out_broadcastable=node.outputs[0].type.broadcastable,
+                    task=code,
+                    openmp=self.openmp,
+                    openmp_minsize=self._openmp_minsize(node),
+                )
+                if contiguous_loop is not None:
+                    condition, contiguous_code = contiguous_loop
+                    loop = f"""
+            if ({condition}) {{
+                {contiguous_code}
+            }} else {{
+                {loop}
+            }}
+            """
             if contig is not None:
                 z = list(zip(inames + onames, inputs + node.outputs, strict=True))
-                all_broadcastable = all(s == 1 for s in var.type.shape)
                 cond1 = " && ".join(
                     f"PyArray_ISCONTIGUOUS({arr})"
                     for arr, var in z
-                    if not all_broadcastable
+                    if not all(s == 1 for s in var.type.shape)
                 )
                 cond2 = " && ".join(
                     f"PyArray_ISFORTRAN({arr})"
                     for arr, var in z
-                    if not all_broadcastable
+                    if not all(s == 1 for s in var.type.shape)
                 )
                 loop = f"""
             if(({cond1}) || ({cond2})){{
@@ -1098,7 +1164,7 @@ class Elemwise(OpenMPOp):
         return support_code
 
     def c_code_cache_version_apply(self, node):
-        version = [15]  # the version corresponding to the c code in this Op
+        version = [18]  # the version corresponding to the c code in this Op
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(
@@ -1118,12 +1184,23 @@ class Elemwise(OpenMPOp):
             for i in node.inputs + node.outputs
         )
         version.append(("openmp", self.openmp))
-        version.append(("openmp_elemwise_minsize", config.openmp_elemwise_minsize))
+        version.append(("openmp_minsize", self._openmp_minsize(node)))
+        if self._fortran_output(node):
+            version.append(("memory_order", "F"))
         if all(version):
             return tuple(version)
         else:
             return ()
 
+    def _openmp_minsize(self, node):
+        return openmp_minsize([self.scalar_op], node.outputs[0].type.dtype)
+
+    @staticmethod
+    def _fortran_output(node):
+        return any(
+            getattr(out.tag, "memory_order", None) == "F" for out in node.outputs
+        )
+
     def outer(self, x, y):
         from pytensor.tensor.basic import expand_dims
 
@@ -1135,7 +1212,33 @@ class Elemwise(OpenMPOp):
         return self(x_, y_)
 
 
-class CAReduce(COp):
+def _careduce_combine_op(scalar_op):
+    r"""Return the binary scalar `Op` that combines two partial reductions by `scalar_op`.
+
+    This is `scalar_op` itself, except for the `Composite`\s of the form
+    ``op(acc, f(x))`` created by ``local_careduce_fusion``, for which it is
+    ``op``.  ``None`` is returned when it can't be determined.
+
+    """
+    if not isinstance(scalar_op, Composite):
+        return scalar_op
+
+    [out] = scalar_op.fgraph.outputs
+    if out.owner is not None and isinstance(out.owner.op, Cast):
+        [out] = out.owner.inputs
+    acc = scalar_op.fgraph.inputs[0]
+    if (
+        out.owner is not None
+        and len(out.owner.inputs) == 2
+        and out.owner.inputs[0] is acc
+        and acc not in ancestors([out.owner.inputs[1]])
+        and getattr(out.owner.op, "identity", None) == scalar_op.identity
+    ):
+        return out.owner.op
+    return None
+
+
+class CAReduce(OpenMPOp):
     """Reduces a scalar operation along specified axes.
 
     The scalar op should be both commutative and associative.
@@ -1179,6 +1282,7 @@ class CAReduce(COp):
         dtype=None,
         acc_dtype=None,
         upcast_discrete_output=False,
+        openmp=None,
     ):
         """
 
@@ -1216,12 +1320,17 @@ class CAReduce(COp):
             - for complex dtypes, we use at least complex128.
         upcast_discrete_output
             See
+        openmp
+            Whether the C reduction loops are parallelized with OpenMP, for
+            inputs with at least `openmp_minsize` elements.  Defaults to
+            ``config.openmp``.
 
         """
         if scalar_op.nin not in (-1, 2) or scalar_op.nout != 1:
             raise NotImplementedError(
                 "CAReduce only supports binary functions with a single output."
             )
+        super().__init__(openmp=openmp)
 
         self.axis = None
         self.scalar_op = scalar_op
@@ -1338,6 +1447,9 @@ class CAReduce(COp):
 
         if axis != self.axis or dtype != self.dtype or acc_dtype != self.acc_dtype:
             op = self.clone(axis=axis, dtype=dtype, acc_dtype=acc_dtype)
+            # `openmp` isn't a prop, and the `clone`s of the subclasses don't
+            # know about it
+            op.openmp = self.openmp
         else:
             op = self
 
@@ -1526,6 +1638,13 @@ class CAReduce(COp):
 
         initial_value = f"{acc_name}_i = {identity};"
 
+        if self.openmp:
+            # The inner task runs in OpenMP parallel regions, which can't be
+            # left with a "goto"
+            task_sub = dict(sub, fail=failure_code(sub, use_goto=False))
+        else:
+            task_sub = sub
+
         inner_task = self.scalar_op.c_code(
             Apply(
                 self.scalar_op,
@@ -1541,9 +1660,25 @@ class CAReduce(COp):
             None,
             [f"{acc_name}_i", f"{inp_name}_i"],
             [f"{acc_name}_i"],
-            sub,
+            task_sub,
         )
 
+        combine_task = None
+        combine_op = _careduce_combine_op(self.scalar_op) if self.openmp else None
+        if combine_op is not None:
+            acc_scalar_type = get_scalar_type(dtype=self.acc_dtype or out.type.dtype)
+            combine_task = combine_op.c_code(
+                Apply(
+                    combine_op,
+                    [acc_scalar_type(), acc_scalar_type()],
+                    [acc_scalar_type()],
+                ),
+                None,
+                [f"{acc_name}_i", f"{acc_name}_part_i"],
+                [f"{acc_name}_i"],
+                task_sub,
+            )
+
         if out.type.ndim == 0:
             # Simple case where everything is reduced, no need for loop ordering
             loop = cgen.make_complete_loop_careduce(
@@ -1554,6 +1689,9 @@ class CAReduce(COp):
                 initial_value=initial_value,
                 inner_task=inner_task,
                 fail_code=sub["fail"],
+                openmp=self.openmp,
+                combine_task=combine_task,
+                openmp_minsize=self._openmp_minsize(node),
             )
         else:
             loop = cgen.make_reordered_loop_careduce(
@@ -1565,6 +1703,9 @@ class CAReduce(COp):
                 reduction_axes=axis,
                 initial_value=initial_value,
                 inner_task=inner_task,
+                openmp=self.openmp,
+                combine_task=combine_task,
+                openmp_minsize=self._openmp_minsize(node),
             )
 
         if acc_dtype != out_dtype:
@@ -1585,11 +1726,11 @@ class CAReduce(COp):
 
     def c_headers(self, **kwargs):
         # Sometimes, Elemwise's c_code is returned, so we need its headers
-        return ["<vector>", "<algorithm>"]
+        return ["<vector>", "<algorithm>", *super().c_headers(**kwargs)]
 
     def c_code_cache_version_apply(self, node):
         # the version corresponding to the c code in this Op
-        version = [10]
+        version = [12]
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(
@@ -1608,11 +1749,654 @@ class CAReduce(COp):
             get_scalar_type(dtype=i.type.dtype).c_code_cache_version()
             for i in node.inputs + node.outputs
         )
+        version.append(("openmp", self.openmp))
+        version.append(("openmp_minsize", self._openmp_minsize(node)))
         if all(version):
             return tuple(version)
         else:
             return ()
 
+    def _openmp_minsize(self, node):
+        # A reduction fused with an `Elemwise` is at least as expensive as the
+        # `Elemwise`
+        scalar_ops = [self.scalar_op] if isinstance(self.scalar_op, Composite) else []
+        return openmp_minsize(
+            scalar_ops,
+            node.inputs[0].type.dtype,
+            reduce_op=_careduce_combine_op(self.scalar_op) or self.scalar_op,
+        )
+
+
+class MapReduce(OpenMPOp):
+    """Reduce the result of an elementwise scalar `Op`, and apply another one to the reduction.
+
+    ``MapReduce(scalar_op, prologue, epilogue, axis)(*inputs)`` computes
+
+    .. code-block:: python
+
+        reduced = CAReduce(scalar_op, axis)(Elemwise(prologue)(*inputs[:n]))
+        epilogue(reduced, *inputs[n:])
+
+    where ``n`` is the number of inputs of `prologue`, without materializing
+    the output of the prologue: in C and Numba, the inputs are read in a
+    single pass that evaluates the prologue and accumulates its result, and
+    the epilogue is then applied to the (smaller) reduced array.  The
+    remaining inputs of the epilogue must have the shape of the reduction.
+
+    These nodes are introduced by the ``local_map_reduce_fusion`` rewrite.
+
+    Parameters
+    ----------
+    scalar_op
+        The binary scalar `Op` of the reduction.  It must be commutative and
+        associative, and define an identity.
+    prologue
+        The scalar `Op`, usually a `Composite`, whose results are reduced.
+    epilogue
+        An optional scalar `Op`, usually a `Composite`, applied to the result
+        of the reduction and the remaining inputs.
+    axis
+        The axes that are reduced.  ``None`` means all of them.
+    dtype
+        The dtype of the reduction, before the epilogue.  Defaults to the
+        dtype of the prologue.
+    acc_dtype
+        The dtype in which the reduction is accumulated.  Defaults to `dtype`.
+    openmp
+        Whether the C implementation uses OpenMP threads for inputs with at
+        least `openmp_minsize` elements.  Defaults to ``config.openmp``.
+
+    """
+
+    __props__ = ("scalar_op", "prologue", "epilogue", "axis", "dtype", "acc_dtype")
+
+    def __init__(
+        self,
+        scalar_op,
+        prologue,
+        epilogue=None,
+        axis=None,
+        dtype=None,
+        acc_dtype=None,
+        openmp=None,
+    ):
+        super().__init__(openmp=openmp)
+        if scalar_op.nin not in (-1, 2) or scalar_op.nout != 1:
+            raise NotImplementedError(
+                "MapReduce only supports binary reductions with a single output."
+            )
+        if getattr(scalar_op, "identity", None) is None:
+            raise ValueError(f"The {scalar_op} does not define an identity.")
+        if prologue.nin == -1 or (epilogue is not None and epilogue.nin == -1):
+            raise ValueError(
+                "The prologue and epilogue of MapReduce must have a fixed number of inputs."
+            )
+        if prologue.nout != 1 or (epilogue is not None and epilogue.nout != 1):
+            raise NotImplementedError(
+                "MapReduce only supports prologues and epilogues with a single output."
+            )
+        self.scalar_op = scalar_op
+        self.prologue = prologue
+        self.epilogue = epilogue
+        if axis is None:
+            self.axis = None
+        elif isinstance(axis, int | np.integer):
+            self.axis = (int(axis),)
+        else:
+            self.axis = tuple(sorted(axis))
+        self.dtype = dtype if dtype is None else np.dtype(dtype).name
+        self.acc_dtype = acc_dtype if acc_dtype is None else np.dtype(acc_dtype).name
+
+    def __str__(self):
+        axis = "axes=None" if self.axis is None else f"axes={list(self.axis)}"
+        return (
+            f"{type(self).__name__}{{{self.scalar_op}, {self.prologue}, "
+            f"{self.epilogue}, {axis}}}"
+        )
+
+    @staticmethod
+    def _scalar_dtype(scalar_op, dtypes):
+        return (
+            scalar_op.make_node(*(get_scalar_type(dtype)() for dtype in dtypes))
+            .outputs[0]
+            .type.dtype
+        )
+
+    def make_node(self, *inputs):
+        inputs = [as_tensor_variable(i) for i in inputs]
+        n_map = self.prologue.nin
+        map_inputs, epilogue_inputs = inputs[:n_map], inputs[n_map:]
+        if len(epilogue_inputs) != (
+            0 if self.epilogue is None else self.epilogue.nin - 1
+        ):
+            raise TypeError(f"Wrong number of inputs for {self}")
+
+        # Left-complete the shapes of the inputs with broadcastable dimensions
+        ndim = max(inp.type.ndim for inp in map_inputs)
+        map_inputs = [
+            inp
+            if inp.type.ndim == ndim
+            else inp.dimshuffle(
+                ["x"] * (ndim - inp.type.ndim) + list(range(inp.type.ndim))
+            )
+            for inp in map_inputs
+        ]
+        axis = normalize_reduce_axis(self.axis, ndim=ndim)
+        if axis is None:
+            axis = tuple(range(ndim))
+
+        try:
+            shape = [
+                broadcast_static_dim_lengths([inp.type.shape[d] for inp in map_inputs])
+                for d in range(ndim)
+            ]
+        except ValueError:
+            raise ValueError(
+                f"Incompatible MapReduce input shapes {[inp.type.shape for inp in map_inputs]}"
+            )
+        out_shape = [s for d, s in enumerate(shape) if d not in axis]
+
+        map_dtype = self._scalar_dtype(
+            self.prologue, [i.type.dtype for i in map_inputs]
+        )
+        dtype = self.dtype or map_dtype
+        acc_dtype = self.acc_dtype or dtype
+
+        out_ndim = len(out_shape)
+        for i, inp in enumerate(epilogue_inputs):
+            if inp.type.ndim < out_ndim:
+                inp = inp.dimshuffle(
+                    ["x"] * (out_ndim - inp.type.ndim) + list(range(inp.type.ndim))
+                )
+            elif inp.type.ndim > out_ndim:
+                raise ValueError(
+                    f"The inputs of the epilogue of {self} can't have more "
+                    "dimensions than the reduction"
+                )
+            for d, s in enumerate(inp.type.shape):
+                if s is not None and s != 1 and out_shape[d] == 1:
+                    raise ValueError(
+                        f"The inputs of the epilogue of {self} can't broadcast "
+                        "the reduction"
+                    )
+                if out_shape[d] is None and s != 1:
+                    out_shape[d] = s
+            epilogue_inputs[i] = inp
+
+        if self.epilogue is None:
+            out_dtype = dtype
+        else:
+            out_dtype = self._scalar_dtype(
+                self.epilogue, [dtype, *(i.type.dtype for i in epilogue_inputs)]
+            )
+
+        if axis != self.axis or dtype != self.dtype or acc_dtype != self.acc_dtype:
+            op = type(self)(
+                self.scalar_op,
+                self.prologue,
+                self.epilogue,
+                axis=axis,
+                dtype=dtype,
+                acc_dtype=acc_dtype,
+                openmp=self.openmp,
+            )
+        else:
+            op = self
+
+        output = TensorType(dtype=out_dtype, shape=tuple(out_shape))()
+        return Apply(op, [*map_inputs, *epilogue_inputs], [output])
+
+    def perform(self, node, inputs, output_storage):
+        n_map = self.prologue.nin
+        map_inputs, epilogue_inputs = inputs[:n_map], inputs[n_map:]
+        Elemwise._check_runtime_broadcast(node, map_inputs)
+
+        [mapped] = _array_impl(self.prologue)(*map_inputs)
+        mapped = np.asarray(mapped, dtype=self.acc_dtype)
+        shape = np.broadcast_shapes(*(inp.shape for inp in map_inputs))
+        if mapped.shape != shape:
+            mapped = np.broadcast_to(mapped, shape)
+
+        reduce_op = CAReduce(self.scalar_op)
+        reduced = reduce_op.ufunc.reduce(mapped, axis=self.axis, dtype=self.acc_dtype)
+        reduced = np.asarray(reduced, dtype=self.dtype)
+        if self.epilogue is not None:
+            [reduced] = _array_impl(self.epilogue)(reduced, *epilogue_inputs)
+        output_storage[0][0] = np.asarray(reduced, dtype=node.outputs[0].type.dtype)
+
+    def infer_shape(self, fgraph, node, shapes):
+        n_map = self.prologue.nin
+        map_inputs = node.inputs[:n_map]
+        ndim = map_inputs[0].type.ndim
+        out_shape = []
+        for d in range(ndim):
+            if d in self.axis:
+                continue
+            for inp, shape in zip(map_inputs, shapes, strict=False):
+                if not inp.type.broadcastable[d]:
+                    out_shape.append(shape[d])
+                    break
+            else:
+                out_shape.append(as_tensor_variable(1, dtype="int64"))
+        return [tuple(out_shape)]
+
+    def _scalar_nodes(self, node):
+        """Return the scalar nodes of the prologue, reduction and epilogue of `node`."""
+        n_map = self.prologue.nin
+        map_dtypes = [i.type.dtype for i in node.inputs[:n_map]]
+        map_node = Apply(
+            self.prologue,
+            [get_scalar_type(dtype)() for dtype in map_dtypes],
+            [get_scalar_type(self._scalar_dtype(self.prologue, map_dtypes))()],
+        )
+        acc_type = get_scalar_type(self.acc_dtype)
+        reduce_node = Apply(self.scalar_op, [acc_type(), acc_type()], [acc_type()])
+        epilogue_node = None
+        if self.epilogue is not None:
+            epilogue_node = Apply(
+                self.epilogue,
+                [
+                    get_scalar_type(self.dtype)(),
+                    *(get_scalar_type(i.type.dtype)() for i in node.inputs[n_map:]),
+                ],
+                [get_scalar_type(node.outputs[0].type.dtype)()],
+            )
+        return map_node, reduce_node, epilogue_node
+
+    def _scalar_ops(self):
+        return [
+            op
+            for op in (self.prologue, self.scalar_op, self.epilogue)
+            if op is not None
+        ]
+
+    def _openmp_minsize(self, node, epilogue=False):
+        if epilogue:
+            return openmp_minsize([self.epilogue], node.outputs[0].type.dtype)
+        return openmp_minsize(
+            [self.prologue], node.inputs[0].type.dtype, reduce_op=self.scalar_op
+        )
+
+    def prepare_node(self, node, storage_map, compute_map, impl):
+        super().prepare_node(node, storage_map, compute_map, impl)
+        for scalar_node in self._scalar_nodes(node):
+            if scalar_node is not None:
+                scalar_node.op.prepare_node(scalar_node, None, None, impl)
+
+    def c_code(self, node, name, inames, onames, sub):
+        dtypes = [v.type.dtype for v in node.inputs + node.outputs]
+        if (
+            any(dtype in ("float16", *complex_dtypes) for dtype in dtypes)
+            or self.acc_dtype in ("float16", *complex_dtypes)
+            or self.dtype in ("float16", *complex_dtypes)
+            or any(getattr(op, "inner_float16", False) for op in self._scalar_ops())
+        ):
+            raise NotImplementedError()
+
+        map_node, reduce_node, epilogue_node = self._scalar_nodes(node)
+        n_map = self.prologue.nin
+        map_inputs = node.inputs[:n_map]
+        map_names = inames[:n_map]
+        epilogue_inputs = node.inputs[n_map:]
+        epilogue_names = inames[n_map:]
+        [out] = node.outputs
+        [out_name] = onames
+        fail = sub["fail"]
+        if self.openmp:
+            # The scalar code runs in OpenMP regions, which can't be left with a "goto"
+            task_sub = dict(sub, fail=failure_code(sub, use_goto=False))
+        else:
+            task_sub = sub
+
+        def ctype(dtype):
+            return TensorType(dtype, shape=()).dtype_specs()[1]
+
+        ndim = map_inputs[0].type.ndim
+        kept = [d for d in range(ndim) if d not in self.axis]
+        out_ndim = len(kept)
+        acc_t = ctype(self.acc_dtype)
+        red_t = ctype(self.dtype)
+        map_t = ctype(map_node.outputs[0].type.dtype)
+        out_t = ctype(out.type.dtype)
+
+        identity = self.scalar_op.identity
+        if np.isposinf(identity):
+            if self.acc_dtype in float_dtypes:
+                identity = "__builtin_inf()"
+            elif self.acc_dtype.startswith("uint") or self.acc_dtype == "bool":
+                identity = "1"
+            else:
+                identity = f"NPY_MAX_{self.acc_dtype.upper()}"
+        elif np.isneginf(identity):
+            if self.acc_dtype in float_dtypes:
+                identity = "-__builtin_inf()"
+            elif self.acc_dtype.startswith("uint") or self.acc_dtype == "bool":
+                identity = "0"
+            else:
+                identity = f"NPY_MIN_{self.acc_dtype.upper()}"
+        else:
+            identity = str(identity)
+
+        # Lengths of the loop dimensions, and the strides of the inputs along them
+        code = [f"npy_intp dims[{max(ndim, 1)}] = {{1}};"]
+        for k, (inp, iname) in enumerate(zip(map_inputs, map_names, strict=True)):
+            strides = ", ".join(
+                "0" if bcast else f"PyArray_STRIDES({iname})[{d}]"
+                for d, bcast in enumerate(inp.type.broadcastable)
+            )
+            code.append(f"npy_intp x{k}_strides[{max(ndim, 1)}] = {{{strides or 0}}};")
+        for d in range(ndim):
+            sources = [
+                iname
+                for inp, iname in zip(map_inputs, map_names, strict=True)
+                if not inp.type.broadcastable[d]
+            ]
+            if not sources:
+                code.append(f"dims[{d}] = 1;")
+                continue
+            code.append(f"dims[{d}] = PyArray_DIMS({sources[0]})[{d}];")
+            code.extend(
+                dedent(
+                    f"""
+                    if (PyArray_DIMS({iname})[{d}] != dims[{d}]) {{
+                        PyErr_Format(PyExc_ValueError,
+                            "MapReduce: input dimension mismatch (%%lld vs %%lld) at dimension {d}",
+                            (long long)PyArray_DIMS({iname})[{d}], (long long)dims[{d}]);
+                        {fail}
+                    }}
+                    """
+                )
+                for iname in sources[1:]
+            )
+
+        # Allocate the output
+        out_dims = ", ".join(f"dims[{d}]" for d in kept) or "1"
+        code.append(f"npy_intp out_dims[{max(out_ndim, 1)}] = {{{out_dims}}};")
+        for inp, iname in zip(epilogue_inputs, epilogue_names, strict=True):
+            for j, bcast in enumerate(inp.type.broadcastable):
+                if not bcast:
+                    code.append(
+                        dedent(
+                            f"""
+                            if (PyArray_DIMS({iname})[{j}] != out_dims[{j}]) {{
+                                PyErr_Format(PyExc_ValueError,
+                                    "MapReduce: epilogue input dimension mismatch (%%lld vs %%lld) at dimension {j}",
+                                    (long long)PyArray_DIMS({iname})[{j}], (long long)out_dims[{j}]);
+                                {fail}
+                            }}
+                            """
+                        )
+                    )
+        typenum = out.type.dtype_specs()[2]
+        code.append(
+            dedent(
+                f"""
+                if ({out_name} == NULL
+                    || PyArray_NDIM({out_name}) != {out_ndim}
+                    || !PyArray_CompareLists(PyArray_DIMS({out_name}), out_dims, {out_ndim})
+                    || PyArray_TYPE({out_name}) != {typenum}) {{
+                    Py_XDECREF({out_name});
+                    {out_name} = (PyArrayObject*)PyArray_EMPTY({out_ndim}, out_dims, {typenum}, 0);
+                    if (!{out_name}) {{
+                        {fail}
+                    }}
+                }}
+                npy_intp out_size = 1;
+                for (int i = 0; i < {out_ndim}; i++) out_size *= out_dims[i];
+                std::vector<{acc_t}> acc(out_size, ({acc_t})({identity}));
+                """
+            )
+        )
+
+        # Strides of the accumulator along the loop dimensions
+        acc_strides = []
+        for d in range(ndim):
+            if d in self.axis:
+                acc_strides.append("0")
+            else:
+                later = [f"dims[{e}]" for e in kept if e > d]
+                acc_strides.append("*".join(later) or "1")
+        code.append(
+            f"npy_intp acc_strides[{max(ndim, 1)}] = {{{', '.join(acc_strides) or 0}}};"
+        )
+
+        # Order the loops by decreasing strides of the input with the most
+        # non-broadcastable dimensions, for contiguous memory accesses
+        ref = max(
+            range(n_map),
+            key=lambda k: sum(not b for b in map_inputs[k].type.broadcastable),
+        )
+        code.append(
+            dedent(
+                f"""
+                std::vector< std::pair<npy_intp, int> > loops({max(ndim, 1)});
+                for (int i = 0; i < {ndim}; i++) {{
+                    loops[i] = std::make_pair(std::abs(x{ref}_strides[i]), i);
+                }}
+                std::sort(loops.begin(), loops.begin() + {ndim},
+                          std::greater< std::pair<npy_intp, int> >());
+                """
+            )
+        )
+        for i in range(ndim):
+            code.append(f"npy_intp len_{i} = dims[loops[{i}].second];")
+            code.append(f"npy_intp acc_s{i} = acc_strides[loops[{i}].second];")
+            code.extend(
+                f"npy_intp x{k}_s{i} = x{k}_strides[loops[{i}].second];"
+                for k in range(n_map)
+            )
+
+        # The reduction loop
+        map_values = [f"x{k}_v" for k in range(n_map)]
+        inner = []
+        for k, (inp, iname) in enumerate(zip(map_inputs, map_names, strict=True)):
+            inner.append(
+                f"const {ctype(inp.type.dtype)} x{k}_v = "
+                f"*(const {ctype(inp.type.dtype)}*)x{k}_p{ndim};"
+            )
+        inner.append(f"{map_t} map_v;")
+        inner.append(
+            "{"
+            + self.prologue.c_code(
+                map_node, f"{name}_map", map_values, ["map_v"], task_sub
+            )
+            + "}"
+        )
+        inner.append(f"{acc_t} &acc_i = acc_p{ndim}[0];")
+        inner.append(
+            "{"
+            + self.scalar_op.c_code(
+                reduce_node, f"{name}_reduce", ["acc_i", "map_v"], ["acc_i"], task_sub
+            )
+            + "}"
+        )
+
+        def reduction_loop(acc_base, pragma=""):
+            loop = "\n".join(inner)
+            for i in reversed(range(ndim)):
+                pointers = "\n".join(
+                    f"const char* x{k}_p{i + 1} = x{k}_p{i} + it{i} * x{k}_s{i};"
+                    for k in range(n_map)
+                )
+                loop = dedent(
+                    f"""
+                    for (npy_intp it{i} = 0; it{i} < len_{i}; it{i}++) {{
+                        {pointers}
+                        {acc_t}* acc_p{i + 1} = acc_p{i} + it{i} * acc_s{i};
+                        {loop}
+                    }}
+                    """
+                )
+            starts = "\n".join(
+                f"const char* x{k}_p0 = PyArray_BYTES({iname});"
+                for k, iname in enumerate(map_names)
+            )
+            return f"{{\n{starts}\n{acc_t}* acc_p0 = {acc_base};\n{pragma}\n{loop}\n}}"
+
+        if not self.openmp or ndim == 0:
+            code.append(reduction_loop("&acc[0]"))
+        else:
+            # If the outer loop isn't reduced, the threads update distinct
+            # accumulators.  Otherwise each thread accumulates its iterations
+            # of the outer loop in its own partial accumulators, which are
+            # then combined in the order of the threads, so that the results
+            # only depend on the number of threads.
+            minsize = self._openmp_minsize(node)
+            combine = self.scalar_op.c_code(
+                reduce_node,
+                f"{name}_combine",
+                ["acc_i", "acc_part_i"],
+                ["acc_i"],
+                sub,
+            )
+            loop_size = " * ".join(f"len_{i}" for i in range(ndim))
+            code.append(
+                dedent(
+                    f"""
+                    npy_intp loop_size = {loop_size};
+                    if (loop_size >= {minsize} && acc_s0 != 0) {{
+                        {reduction_loop("&acc[0]", "#pragma omp parallel for schedule(static)")}
+                    }} else if (loop_size >= {minsize} && len_0 > 1) {{
+                        int n_threads = omp_get_max_threads();
+                        std::vector<{acc_t}> partials(n_threads * out_size, ({acc_t})({identity}));
+                        #pragma omp parallel
+                        {{
+                            {acc_t}* acc_thread = &partials[omp_get_thread_num() * out_size];
+                            {reduction_loop("acc_thread", "#pragma omp for schedule(static)")}
+                        }}
+                        for (int t = 0; t < n_threads; t++) {{
+                            for (npy_intp k = 0; k < out_size; k++) {{
+                                {acc_t} &acc_i = acc[k];
+                                const {acc_t} acc_part_i = partials[t * out_size + k];
+                                {{{combine}}}
+                            }}
+                        }}
+                    }} else {{
+                        {reduction_loop("&acc[0]")}
+                    }}
+                    """
+                )
+            )
+
+        # The epilogue loop, over the reduced array
+        inner = [f"const {red_t} red_v = ({red_t})acc[lin{out_ndim}];"]
+        inner.append(f"{out_t} &out_i = *({out_t}*)out_p{out_ndim};")
+        if epilogue_node is None:
+            inner.append(f"out_i = ({out_t})red_v;")
+        else:
+            epilogue_values = ["red_v"]
+            for k, inp in enumerate(epilogue_inputs):
+                inner.append(
+                    f"const {ctype(inp.type.dtype)} e{k}_v = "
+                    f"*(const {ctype(inp.type.dtype)}*)e{k}_p{out_ndim};"
+                )
+                epilogue_values.append(f"e{k}_v")
+            inner.append(
+                "{"
+                + self.epilogue.c_code(
+                    epilogue_node,
+                    f"{name}_epilogue",
+                    epilogue_values,
+                    ["out_i"],
+                    task_sub,
+                )
+                + "}"
+            )
+        loop = "\n".join(inner)
+        for j in reversed(range(out_ndim)):
+            pointers = [
+                f"char* out_p{j + 1} = out_p{j} + it{j} * PyArray_STRIDES({out_name})[{j}];",
+                f"const npy_intp lin{j + 1} = lin{j} * out_dims[{j}] + it{j};",
+            ]
+            for k, (inp, iname) in enumerate(
+                zip(epilogue_inputs, epilogue_names, strict=True)
+            ):
+                stride = (
+                    "0"
+                    if inp.type.broadcastable[j]
+                    else f"PyArray_STRIDES({iname})[{j}]"
+                )
+                pointers.append(
+                    f"const char* e{k}_p{j + 1} = e{k}_p{j} + it{j} * {stride};"
+                )
+            pointers = "\n".join(pointers)
+            loop = dedent(
+                f"""
+                for (npy_intp it{j} = 0; it{j} < out_dims[{j}]; it{j}++) {{
+                    {pointers}
+                    {loop}
+                }}
+                """
+            )
+        if self.openmp and out_ndim > 0:
+            minsize = self._openmp_minsize(node, epilogue=True)
+            loop = f"#pragma omp parallel for if(out_size >= {minsize})\n{loop}"
+        starts = [
+            f"char* out_p0 = PyArray_BYTES({out_name});",
+            "const npy_intp lin0 = 0;",
+        ]
+        starts.extend(
+            f"const char* e{k}_p0 = PyArray_BYTES({iname});"
+            for k, iname in enumerate(epilogue_names)
+        )
+        code.append("{\n" + "\n".join(starts) + f"\n{loop}\n}}")
+
+        return "{\n" + "\n".join(code) + "\n}\n"
+
+    def c_headers(self, **kwargs):
+        return [
+            "<vector>",
+            "<algorithm>",
+            "<functional>",
+            "<cstdlib>",
+            *super().c_headers(**kwargs),
+        ]
+
+    def c_header_dirs(self, **kwargs):
+        return list(
+            chain.from_iterable(op.c_header_dirs(**kwargs) for op in self._scalar_ops())
+        )
+
+    def c_support_code(self, **kwargs):
+        return "\n".join(
+            sorted({op.c_support_code(**kwargs).strip() for op in self._scalar_ops()})
+        )
+
+    def c_support_code_apply(self, node, name):
+        return "\n".join(
+            code
+            for scalar_node, suffix in zip(
+                self._scalar_nodes(node), ("_map", "_reduce", "_epilogue"), strict=True
+            )
+            if scalar_node is not None
+            and (
+                code := scalar_node.op.c_support_code_apply(scalar_node, name + suffix)
+            )
+        )
+
+    def c_code_cache_version_apply(self, node):
+        version = [2]
+        version.append(("openmp", self.openmp))
+        version.append(
+            (
+                "openmp_minsize",
+                self._openmp_minsize(node),
+                self._openmp_minsize(node, epilogue=True),
+            )
+        )
+        version.extend(
+            scalar_node.op.c_code_cache_version_apply(scalar_node)
+            for scalar_node in self._scalar_nodes(node)
+            if scalar_node is not None
+        )
+        version.extend(
+            get_scalar_type(dtype=v.type.dtype).c_code_cache_version()
+            for v in node.inputs + node.outputs
+        )
+        if all(version):
+            return tuple(version)
+        return ()
+
 
 def scalar_elemwise(*symbol, nfunc=None, nin=None, nout=None, symbolname=None):
     """Replace a symbol definition with an `Elemwise`-wrapped version of the corresponding scalar `Op`.
@@ -4,6 +4,13 @@ from textwrap import dedent, indent
 from pytensor.configdefaults import config
 
 
+TILE_SIZE = 32
+"""The number of iterations of each loop in the tiles of strided `Elemwise` loops."""
+
+BLOCK_SIZE = 4096
+"""The number of elements of the accumulator updated by each block of a partial reduction."""
+
+
 def make_declare(loop_orders, dtypes, sub, compute_stride_jump=True):
     """
     Produce code to declare all necessary variables.
@@ -181,6 +188,10 @@ def make_alloc(loop_orders, dtype, sub, fortran="0"):
         {{
             npy_intp dims[{nd}];
             {init_dims}
+            if ({olv} && ({fortran}) && !PyArray_IS_F_CONTIGUOUS({olv})) {{
+                // The output from a previous call is in the wrong order
+                Py_CLEAR({olv});
+            }}
             if (!{olv}) {{
                 {olv} = (PyArrayObject*)PyArray_EMPTY({nd},
                                                       dims,
@@ -196,7 +207,7 @@ def make_alloc(loop_orders, dtype, sub, fortran="0"):
                     // If we can't resize the ndarray we have we can allocate a new one.
                     PyErr_Clear();
                     Py_XDECREF({olv});
-                    {olv} = (PyArrayObject*)PyArray_EMPTY({nd}, dims, {type}, 0);
+                    {olv} = (PyArrayObject*)PyArray_EMPTY({nd}, dims, {type}, {fortran});
                 }} else {{
                     Py_DECREF(success);
                 }}
@@ -215,6 +226,7 @@ def make_loop(
     loop_tasks: list,
     sub: dict[str, str],
     openmp: bool = False,
+    openmp_minsize: int | None = None,
 ):
     """
     Make a nested loop over several arrays and associate specific code
@@ -240,6 +252,8 @@ def make_loop(
         The 'lvi' variable corresponds to the ith element of loop_orders.
 
     """
+    if openmp_minsize is None:
+        openmp_minsize = config.openmp_elemwise_minsize
 
     def loop_over(preloop, code, indices, i):
         iterv = f"ITER_{i}"
@@ -253,8 +267,9 @@ def make_loop(
             if index != "x":
                 suitable_n = f"{var}_n{index}"
         if openmp:
-            openmp_elemwise_minsize = config.openmp_elemwise_minsize
-            forloop = f"""#pragma omp parallel for if( {suitable_n} >={openmp_elemwise_minsize})\n"""
+            forloop = (
+                f"""#pragma omp parallel for if( {suitable_n} >={openmp_minsize})\n"""
+            )
         else:
             forloop = ""
         forloop += f"""for (int {iterv} = 0; {iterv}<{suitable_n}; {iterv}++)"""
@@ -292,7 +307,14 @@ def make_loop(
 
 
 def make_reordered_loop(
-    init_loop_orders, olv_index, dtypes, inner_task, sub, openmp=None
+    init_loop_orders,
+    olv_index,
+    dtypes,
+    inner_task,
+    sub,
+    openmp=None,
+    openmp_minsize=None,
+    tile_size=TILE_SIZE,
 ):
     """A bit like make_loop, but when only the inner-most loop executes code.
 
@@ -303,7 +325,19 @@ def make_reordered_loop(
 
     The output tensor's index among the loop variables is indicated by olv_index.
 
+    If `openmp` is ``True``, the outermost loop is run in parallel when it has
+    at least `openmp_minsize` iterations (defaults to
+    ``config.openmp_elemwise_minsize``).
+
+    When a variable is accessed with a stride larger than one element in the
+    inner-most loop, e.g. an input that is transposed with respect to the
+    output, and the two inner-most loops have more than `tile_size`
+    iterations, these loops iterate over tiles of ``tile_size x tile_size``
+    elements instead.  Tiling is disabled if `tile_size` is ``0``.
+
     """
+    if openmp_minsize is None:
+        openmp_minsize = config.openmp_elemwise_minsize
 
     # Number of variables
     nvars = len(init_loop_orders)
@@ -423,33 +457,242 @@ def make_reordered_loop(
             pointer_update += f"+{var}_stride_l{i}*{iterv}"
         pointer_update += ");\n"
 
-    loop = inner_task
-    for i in reversed(range(nnested)):
-        iterv = f"ITER_{i}"
-        total = f"TOTAL_{i}"
-        update = ""
-        forloop = ""
-        # The pointers are defined only in the most inner loop
-        if i == nnested - 1:
-            update = pointer_update
-        if i == 0:
-            if openmp:
-                openmp_elemwise_minsize = config.openmp_elemwise_minsize
-                forloop += f"""#pragma omp parallel for if( {total} >={openmp_elemwise_minsize})\n"""
-        forloop += f"for(int {iterv} = 0; {iterv}<{total}; {iterv}++)"
+    def nested_loops(tiled):
+        # When `tiled`, the two innermost loops iterate over square tiles
+        tiled_loops = range(nnested - 2, nnested) if tiled else ()
+        loop = inner_task
+        for i in reversed(range(nnested)):
+            iterv = f"ITER_{i}"
+            total = f"TOTAL_{i}"
+            update = ""
+            # The pointers are defined only in the most inner loop
+            if i == nnested - 1:
+                update = pointer_update
+            if i in tiled_loops:
+                forloop = (
+                    f"for(int {iterv} = TILE_{i}; "
+                    f"{iterv}<std::min(TILE_{i} + {tile_size}, {total}); {iterv}++)"
+                )
+            else:
+                forloop = f"for(int {iterv} = 0; {iterv}<{total}; {iterv}++)"
 
+            loop = f"""
+            {forloop}
+            {{ // begin loop {i}
+                {update}
+                {loop}
+            }} // end loop {i}
+            """
+            if tiled and i == nnested - 2:
+                for j in reversed(tiled_loops):
+                    loop = f"""
+                    for(int TILE_{j} = 0; TILE_{j}<TOTAL_{j}; TILE_{j} += {tile_size})
+                    {{ // begin tile loop {j}
+                        {loop}
+                    }} // end tile loop {j}
+                    """
+        if openmp:
+            loop = f"""
+            #pragma omp parallel for if( TOTAL_0 >={openmp_minsize})
+            {loop.strip()}
+            """
+        return loop
+
+    loop = nested_loops(tiled=False)
+    if nnested >= 2 and tile_size:
+        # When the innermost loop accesses a variable with a large stride, as
+        # when an input is transposed with respect to the output, tiling the
+        # two innermost loops keeps the accessed rows of all the variables in
+        # the cache
+        strided = " || ".join(
+            f"abs({sub[f'lv{i}']}_stride_l{nnested - 1}) > 1" for i in range(nvars)
+        )
+        inner_totals = " && ".join(
+            f"TOTAL_{i} > {tile_size}" for i in range(nnested - 2, nnested)
+        )
         loop = f"""
-        {forloop}
-        {{ // begin loop {i}
-            {update}
+        if (({inner_totals}) && ({strided})) {{
+            {nested_loops(tiled=True)}
+        }} else {{
             {loop}
-        }} // end loop {i}
+        }}
         """
 
     code = "\n".join((order_loops, declare_totals, declare_strides, declare_iter, loop))
     return f"{{\n{code}\n}}\n"
 
 
+def make_contiguous_loop(
+    names: list[str],
+    dtypes: list[str],
+    broadcastable: list[tuple[bool, ...]],
+    out_broadcastable: tuple[bool, ...],
+    task: str,
+    openmp: bool = False,
+    openmp_minsize: int | None = None,
+) -> tuple[str, str] | None:
+    """Make a loop over contiguous arrays that the compiler can vectorize.
+
+    The broadcast patterns of the arrays are classified, relative to the
+    dimensions of the output that aren't broadcastable and a split of these
+    dimensions into outer and inner ones, as
+
+    - full: no broadcastable dimension,
+    - scalar: only broadcastable dimensions,
+    - row: broadcastable along the outer dimensions only,
+    - column: broadcastable along the inner dimensions only.
+
+    If all the arrays are full or scalar, the generated code is a flat loop
+    over all the elements, which is used when all the arrays that aren't
+    scalars are C-contiguous, or all of them are F-contiguous.  Otherwise,
+    if there is a split for which all the arrays are classified, it is a loop
+    over the outer dimensions, which loads the elements of the columns, around
+    a flat loop over the inner dimensions, which is used when all the arrays
+    that aren't scalars are C-contiguous.  Scalars are loaded once, before the
+    loops.
+
+    The arrays are accessed through ``__restrict__`` pointers, which is valid
+    because an `Elemwise` can only work in-place on an input that isn't
+    aliased to any other of its inputs, and the loops are only used when all
+    the arrays are aligned, so that the compiler can assume it.
+
+    Parameters
+    ----------
+    names
+        The names of the arrays, inputs first.  The element of each array is
+        available as ``<name>_i`` in `task`.
+    dtypes
+        The C types of the elements of the arrays.
+    broadcastable
+        The broadcast pattern of each array.
+    out_broadcastable
+        The broadcast pattern of the output.
+    task
+        The code executed for each element.
+
+    Returns
+    -------
+    The condition under which the loop can be used and its code, or ``None``
+    if no split is possible.
+
+    """
+    if openmp_minsize is None:
+        openmp_minsize = config.openmp_elemwise_minsize
+    dims = [d for d, bcast in enumerate(out_broadcastable) if not bcast]
+    if not dims:
+        return None
+
+    def classify(split):
+        kinds = []
+        for bcast in broadcastable:
+            outer = [bcast[d] for d in dims[:split]]
+            inner = [bcast[d] for d in dims[split:]]
+            if not any(outer + inner):
+                kinds.append("full")
+            elif all(outer + inner):
+                kinds.append("scalar")
+            elif all(outer) and not any(inner):
+                kinds.append("row")
+            elif not any(outer) and all(inner):
+                kinds.append("column")
+            else:
+                return None
+        return kinds
+
+    split = len(dims)
+    kinds = classify(split)
+    if kinds is None:
+        for split in range(1, len(dims)):
+            kinds = classify(split)
+            if kinds is not None:
+                break
+        else:
+            return None
+    flat = split == len(dims)
+
+    arrays = [name for name, kind in zip(names, kinds, strict=True) if kind != "scalar"]
+    # The output is full, so it is always a valid reference for the sizes
+    ref = names[kinds.index("full")]
+
+    aligned = " && ".join(f"PyArray_ISALIGNED({name})" for name in arrays)
+    c_contiguous = " && ".join(f"PyArray_IS_C_CONTIGUOUS({name})" for name in arrays)
+    if flat:
+        f_contiguous = " && ".join(
+            f"PyArray_IS_F_CONTIGUOUS({name})" for name in arrays
+        )
+        condition = f"({aligned}) && (({c_contiguous}) || ({f_contiguous}))"
+    else:
+        condition = f"({aligned}) && ({c_contiguous})"
+    # Without the hint, the compiler predicts that such a long conjunction is
+    # rarely true, and optimizes the loops for size instead of vectorizing them
+    condition = f"__builtin_expect(!!({condition}), 1)"
+
+    declare = []
+    for name, dtype, kind in zip(names, dtypes, kinds, strict=True):
+        if kind == "scalar":
+            declare.append(f"const {dtype} {name}_i = *({dtype}*)PyArray_DATA({name});")
+        else:
+            declare.append(
+                f"{dtype}* __restrict__ {name}_ptr = ({dtype}*)"
+                f"__builtin_assume_aligned(PyArray_DATA({name}), alignof({dtype}));"
+            )
+    declare = "\n".join(declare)
+
+    if flat:
+        pragma = (
+            f"#pragma omp parallel for if(n >= {int(openmp_minsize)})" if openmp else ""
+        )
+        inner_refs = "\n".join(
+            f"{dtype}& {name}_i = {name}_ptr[i];"
+            for name, dtype, kind in zip(names, dtypes, kinds, strict=True)
+            if kind != "scalar"
+        )
+        loop = f"""
+        const npy_intp n = PyArray_SIZE({ref});
+        {pragma}
+        for (npy_intp i = 0; i < n; i++) {{
+            {inner_refs}
+            {task}
+        }}
+        """
+    else:
+        pragma = (
+            f"#pragma omp parallel for if(n_outer * n_inner >= {int(openmp_minsize)})"
+            if openmp
+            else ""
+        )
+        outer_refs = []
+        inner_refs = []
+        for name, dtype, kind in zip(names, dtypes, kinds, strict=True):
+            if kind == "full":
+                outer_refs.append(
+                    f"{dtype}* __restrict__ {name}_row = {name}_ptr + o * n_inner;"
+                )
+                inner_refs.append(f"{dtype}& {name}_i = {name}_row[i];")
+            elif kind == "row":
+                inner_refs.append(f"{dtype}& {name}_i = {name}_ptr[i];")
+            elif kind == "column":
+                outer_refs.append(f"const {dtype} {name}_i = {name}_ptr[o];")
+        outer_refs = "\n".join(outer_refs)
+        inner_refs = "\n".join(inner_refs)
+        outer_dims = " * ".join(f"PyArray_DIMS({ref})[{d}]" for d in dims[:split])
+        inner_dims = " * ".join(f"PyArray_DIMS({ref})[{d}]" for d in dims[split:])
+        loop = f"""
+        const npy_intp n_outer = {outer_dims};
+        const npy_intp n_inner = {inner_dims};
+        {pragma}
+        for (npy_intp o = 0; o < n_outer; o++) {{
+            {outer_refs}
+            for (npy_intp i = 0; i < n_inner; i++) {{
+                {inner_refs}
+                {task}
+            }}
+        }}
+        """
+
+    return condition, f"{{\n{declare}\n{loop}\n}}\n"
+
+
 ##################
 #   DimShuffle   #
 ##################
@@ -472,6 +715,9 @@ def make_complete_loop_careduce(
     initial_value: str,
     inner_task: str,
     fail_code,
+    openmp: bool = False,
+    combine_task: str | None = None,
+    openmp_minsize: int | None = None,
 ) -> str:
     """Generate C code for a complete reduction loop.
 
@@ -522,7 +768,51 @@ def make_complete_loop_careduce(
                 *(npy_float64*)(PyArray_DATA(acc)) = acc_i;
             }
         }
+
+    If `openmp` is ``True`` and `combine_task` is given, contiguous inputs
+    with at least `openmp_minsize` elements (defaults to
+    ``config.openmp_elemwise_minsize``) are reduced in parallel: each thread
+    reduces a static block of the input into its own partial accumulator, and
+    the partial results are combined in the order of the threads with
+    `combine_task`, which must update ``acc_i`` with ``acc_part_i``.  The
+    result only depends on the number of threads.
+
     """
+    if openmp_minsize is None:
+        openmp_minsize = config.openmp_elemwise_minsize
+    parallel_case = ""
+    if openmp and combine_task is not None:
+        parallel_case = dedent(
+            f"""
+            else if (PyArray_SIZE({inp_var}) >= {int(openmp_minsize)}
+                     && (PyArray_IS_C_CONTIGUOUS({inp_var}) || PyArray_IS_F_CONTIGUOUS({inp_var}))) {{
+                const {inp_dtype}* {inp_var}_ptr = ({inp_dtype}*)(PyArray_DATA({inp_var}));
+                npy_intp n = PyArray_SIZE({inp_var});
+                int n_threads = 1;
+                std::vector<{acc_dtype}> partials(omp_get_max_threads());
+
+                #pragma omp parallel
+                {{
+                    {acc_dtype} {acc_var}_i;
+                    {initial_value}
+                    #pragma omp for schedule(static)
+                    for (npy_intp i = 0; i < n; i++) {{
+                        {inp_dtype} {inp_var}_i = {inp_var}_ptr[i];
+                        {inner_task}
+                    }}
+                    partials[omp_get_thread_num()] = {acc_var}_i;
+                    #pragma omp single
+                    n_threads = omp_get_num_threads();
+                }}
+
+                {acc_dtype} {acc_var}_i = partials[0];
+                for (int t = 1; t < n_threads; t++) {{
+                    {acc_dtype} {acc_var}_part_i = partials[t];
+                    {combine_task}
+                }}
+                *({acc_dtype}*)(PyArray_DATA({acc_var})) = {acc_var}_i;
+            }}"""
+        )
     return dedent(
         f"""
         {{
@@ -535,7 +825,7 @@ def make_complete_loop_careduce(
             if (PyArray_SIZE({inp_var}) == 0) {{
                 {acc_dtype} &{acc_var}_i = *({acc_dtype}*)(PyArray_DATA({acc_var}));
                 {initial_value}
-            }}else{{
+            }}{parallel_case}else{{
                 iter = NpyIter_New({inp_var},
                                    NPY_ITER_READONLY| NPY_ITER_EXTERNAL_LOOP| NPY_ITER_REFS_OK,
                                    NPY_KEEPORDER,
@@ -584,6 +874,10 @@ def make_reordered_loop_careduce(
     reduction_axes: Sequence[int],
     initial_value: str,
     inner_task: str,
+    openmp: bool = False,
+    combine_task: str | None = None,
+    openmp_minsize: int | None = None,
+    block_size: int = BLOCK_SIZE,
 ) -> str:
     """Generate C code for a partial reduction loop, reordering for optimal memory access of the input variable.
 
@@ -592,16 +886,14 @@ def make_reordered_loop_careduce(
 
     .. code-block:: C
         {
-            // Special case for empty inputs
-            if (PyArray_SIZE(inp) == 0) {
-                acc_iter = (npy_float64*)(PyArray_DATA(acc));
-                int_n =  PyArray_SIZE(acc);
-                for(int i = 0; i < n; i++)
-                {
-                    npy_float64 &acc_i = acc_iter[i];
-                    acc_i = 0;
-                }
-            } else {
+            acc_iter = (npy_float64*)(PyArray_DATA(acc));
+            int n =  PyArray_SIZE(acc);
+            for(int i = 0; i < n; i++)
+            {
+                npy_float64 &acc_i = acc_iter[i];
+                acc_i = 0;
+            }
+            if (PyArray_SIZE(inp) != 0) {
             std::vector< std::pair<int, int> > loops(2);
             std::vector< std::pair<int, int> >::iterator loops_it = loops.begin();
 
@@ -633,34 +925,61 @@ def make_reordered_loop_careduce(
             inp_iter = (npy_float64*)(PyArray_DATA(inp));
             acc_iter = (npy_float64*)(PyArray_DATA(acc));
 
-            for(int iter_0 = 0; iter_0<dim_length_0; iter_0++){
-                for(int iter_1 = 0; iter_1<dim_length_1; iter_1++){
-                    npy_float64 &inp_i = *(inp_iter + inp_stride_1*iter_1 + inp_stride_0*iter_0);
-                    npy_float64 &acc_i = *(acc_iter + acc_stride_1*iter_1 + acc_stride_0*iter_0);
-
-                    if((!is_reduction_axis_0 || iter_0 == 0) && (!is_reduction_axis_1 || iter_1 == 0))
-                    {
-                        acc_i = 0;
+            int block_size = (is_reduction_axis_1 || !(is_reduction_axis_0)) ? dim_length_1 : 4096;
+            for(int block_start = 0; block_start < dim_length_1; block_start += block_size){
+                int block_end = std::min(block_start + block_size, dim_length_1);
+                for(int iter_0 = 0; iter_0<dim_length_0; iter_0++){
+                    npy_float64* inp_row = inp_iter + inp_stride_0*iter_0;
+                    npy_float64* acc_row = acc_iter + acc_stride_0*iter_0;
+                    if (is_reduction_axis_1) {
+                        npy_float64 acc_i = *acc_row;
+                        for(int iter_1 = block_start; iter_1<block_end; iter_1++){
+                            npy_float64 inp_i = inp_row[inp_stride_1*iter_1];
+                            {acc_i = acc_i + inp_i;}
+                        }
+                        *acc_row = acc_i;
+                    } else {
+                        for(int iter_1 = block_start; iter_1<block_end; iter_1++){
+                            npy_float64 inp_i = inp_row[inp_stride_1*iter_1];
+                            npy_float64 &acc_i = acc_row[acc_stride_1*iter_1];
+                            {acc_i = acc_i + inp_i;}
+                        }
                     }
-                    {acc_i = acc_i + inp_i;}
                 }
             }
+            }
         }
 
+    The accumulator is initialized before the loops, so that the innermost
+    loop is a plain loop, which accumulates in a local variable when it is
+    over a reduction axis.  When it isn't, and some outer loops are over
+    reduction axes, the innermost loop is split in blocks of `block_size`
+    iterations, and all the outer loops are run for each block, so that the
+    updated elements of the accumulator stay in the cache.
+
+    If `openmp` is ``True``, inputs with at least `openmp_minsize` elements
+    (defaults to ``config.openmp_elemwise_minsize``) are reduced in parallel.
+    When the outermost loop isn't over a reduction axis, its iterations are
+    split between the threads, which then update distinct elements of the
+    accumulator.  Otherwise, if `combine_task` is given and the accumulator is
+    C-contiguous, each thread reduces a static block of the outermost loop
+    into its own partial accumulator, and the partial results are combined in
+    the order of the threads with `combine_task`, which must update ``acc_i``
+    with ``acc_part_i``.
+
     """
+    if openmp_minsize is None:
+        openmp_minsize = config.openmp_elemwise_minsize
 
-    empty_case = dedent(
+    init_acc = dedent(
         f"""
-        // Special case for empty inputs
-        if (PyArray_SIZE({inp_var}) == 0) {{
-            {acc_var}_iter = ({acc_dtype}*)(PyArray_DATA({acc_var}));
-            int n =  PyArray_SIZE({acc_var});
-            for(int i = 0; i < n; i++)
-            {{
-                {acc_dtype} &{acc_var}_i = {acc_var}_iter[i];
-                {initial_value}
-            }}
-        }} else {{
+        {acc_var}_iter = ({acc_dtype}*)(PyArray_DATA({acc_var}));
+        int n =  PyArray_SIZE({acc_var});
+        for(int i = 0; i < n; i++)
+        {{
+            {acc_dtype} &{acc_var}_i = {acc_var}_iter[i];
+            {initial_value}
+        }}
         """
     )
 
@@ -717,45 +1036,112 @@ def make_reordered_loop_careduce(
         """
     )
 
-    pointer_update = ""
-    for var, dtype in ((inp_var, inp_dtype), (acc_var, acc_dtype)):
-        pointer_update += f"{dtype} &{var}_i = *({var}_iter"
-        for i in reversed(tuple(range(inp_ndim))):
+    last = inp_ndim - 1
+
+    def nested_loops(acc_iter, pragma=""):
+        # The innermost loop reads the input and updates the accumulator from
+        # pointers to the rows selected by the outer loops
+        inp_row = " + ".join(
+            (
+                f"{inp_var}_iter",
+                *(f"{inp_var}_stride_{i}*iter_{i}" for i in range(last)),
+            )
+        )
+        acc_row = " + ".join(
+            (acc_iter, *(f"{acc_var}_stride_{i}*iter_{i}" for i in range(last)))
+        )
+        loop = dedent(
+            f"""
+            {inp_dtype}* {inp_var}_row = {inp_row};
+            {acc_dtype}* {acc_var}_row = {acc_row};
+            if (is_reduction_axis_{last}) {{
+                {acc_dtype} {acc_var}_i = *{acc_var}_row;
+                for(int iter_{last} = block_start; iter_{last}<block_end; iter_{last}++){{
+                    {inp_dtype} {inp_var}_i = {inp_var}_row[{inp_var}_stride_{last}*iter_{last}];
+                    {{{inner_task}}}
+                }}
+                *{acc_var}_row = {acc_var}_i;
+            }} else {{
+                for(int iter_{last} = block_start; iter_{last}<block_end; iter_{last}++){{
+                    {inp_dtype} {inp_var}_i = {inp_var}_row[{inp_var}_stride_{last}*iter_{last}];
+                    {acc_dtype} &{acc_var}_i = {acc_var}_row[{acc_var}_stride_{last}*iter_{last}];
+                    {{{inner_task}}}
+                }}
+            }}
+            """
+        )
+        # Create outer loops recursively
+        for i in reversed(range(last)):
             iter_var = f"iter_{i}"
-            pointer_update += f" + {var}_stride_{i}*{iter_var}"
-        pointer_update += ");\n"
+            dim_length = f"dim_length_{i}"
+            loop = dedent(
+                f"""
+                for(int {iter_var} = 0; {iter_var}<{dim_length}; {iter_var}++){{
+                    {loop}
+                }}
+                """
+            )
+        return f"{pragma}\n{loop}" if pragma else loop
 
-    # Set initial value in first iteration of each output
-    # This happens on the first iteration of every reduction axis
-    initial_iteration = " && ".join(
-        f"(!is_reduction_axis_{i} || iter_{i} == 0)" for i in range(inp_ndim)
-    )
-    set_initial_value = dedent(
+    outer_reduction = " || ".join(f"is_reduction_axis_{i}" for i in range(last))
+    loop = dedent(
         f"""
-        if({initial_iteration})
-        {{
-            {initial_value}
+        int block_size = (is_reduction_axis_{last} || !({outer_reduction})) ? dim_length_{last} : {int(block_size)};
+        for(int block_start = 0; block_start < dim_length_{last}; block_start += block_size){{
+            int block_end = std::min(block_start + block_size, dim_length_{last});
+            {nested_loops(f"{acc_var}_iter")}
         }}
         """
     )
 
-    # We set do pointer_update, initial_value and inner task in inner loop
-    loop = "\n\n".join((pointer_update, set_initial_value, f"{{{inner_task}}}"))
-
-    # Create outer loops recursively
-    for i in reversed(range(inp_ndim)):
-        iter_var = f"iter_{i}"
-        dim_length = f"dim_length_{i}"
-        loop = dedent(
+    if openmp:
+        minsize = int(openmp_minsize)
+        # The parallel loops aren't split in blocks
+        parallel_loop = dedent(
             f"""
-            for(int {iter_var} = 0; {iter_var}<{dim_length}; {iter_var}++){{
-                {loop}
-            }}
-            """
+            if (!is_reduction_axis_0 && PyArray_SIZE({inp_var}) >= {minsize}) {{
+                int block_start = 0, block_end = dim_length_{last};
+                {nested_loops(f"{acc_var}_iter", pragma="#pragma omp parallel for")}
+            }}"""
         )
+        if combine_task is not None:
+            parallel_loop += dedent(
+                f"""
+                else if (dim_length_0 > 1 && PyArray_SIZE({inp_var}) >= {minsize}
+                         && PyArray_IS_C_CONTIGUOUS({acc_var})) {{
+                    npy_intp acc_size = PyArray_SIZE({acc_var});
+                    int n_threads = 1;
+                    int block_start = 0, block_end = dim_length_{last};
+                    std::vector<{acc_dtype}> partials(omp_get_max_threads() * acc_size);
+
+                    #pragma omp parallel
+                    {{
+                        {acc_dtype}* {acc_var}_part_iter = &partials[0] + omp_get_thread_num() * acc_size;
+                        for (npy_intp k = 0; k < acc_size; k++) {{
+                            {acc_dtype} &{acc_var}_i = {acc_var}_part_iter[k];
+                            {initial_value}
+                        }}
+                        {nested_loops(f"{acc_var}_part_iter", pragma="#pragma omp for schedule(static)")}
+                        #pragma omp single
+                        n_threads = omp_get_num_threads();
+                    }}
+
+                    for (npy_intp k = 0; k < acc_size; k++) {{
+                        {acc_dtype} &{acc_var}_i = {acc_var}_iter[k];
+                        {acc_var}_i = partials[k];
+                        for (int t = 1; t < n_threads; t++) {{
+                            {acc_dtype} {acc_var}_part_i = partials[t * acc_size + k];
+                            {combine_task}
+                        }}
+                    }}
+                }}"""
+            )
+        loop = f"{parallel_loop}\nelse {{\n{loop}\n}}"
 
     non_empty_case = "\n".join(
         (order_loops, unsorted_vars, sorted_vars, declare_iter, loop)
     )
-    code = "\n".join((empty_case, non_empty_case, "}"))
+    code = "\n".join(
+        (init_acc, f"if (PyArray_SIZE({inp_var}) != 0) {{", non_empty_case, "}")
+    )
     return f"{{\n{code}\n}}\n"
@@ -24,7 +24,6 @@ from pytensor.scalar.basic import BinaryScalarOp
 from pytensor.tensor import TensorLike
 from pytensor.tensor.basic import (
     alloc,
-    arange,
     as_tensor_variable,
     cast,
     concatenate,
@@ -403,6 +402,21 @@ class NonZeroDimsCAReduce(FixedOpCAReduce):
         return setup, alloc, loop, cast
 
 
+def _take_reduced(x, idx, axis):
+    """Take the elements of `x` at the positions `idx` of its reduced `axis`, as returned by `Argmax`.
+
+    `idx` holds positions in the flattened reduced axes, for each position of
+    the other axes of `x`.
+    """
+    from pytensor.tensor.basic import take_along_axis
+
+    axis = tuple(range(x.ndim)) if axis is None else tuple(sorted(axis))
+    keep_axes = [i for i in range(x.ndim) if i not in axis]
+    x = x.transpose(*keep_axes, *axis)
+    x = x.reshape((*x.shape[: len(keep_axes)], -1))
+    return take_along_axis(x, expand_dims(idx, -1), axis=-1).squeeze(-1)
+
+
 class Max(NonZeroDimsCAReduce):
     nfunc_spec = ("max", 1, 1)
 
@@ -443,22 +457,8 @@ class Max(NonZeroDimsCAReduce):
         [x] = inputs
         if eval_points[0] is None:
             return [None]
-        axis = tuple(range(x.ndim) if self.axis is None else self.axis)
-        if isinstance(axis, int):
-            axis = [axis]
-        if len(axis) != 1:
-            raise NotImplementedError("R_op supported for max only for one axis!")
-        if axis[0] > 1:
-            raise NotImplementedError("R_op supported for max only when axis is 0 or 1")
-        if inputs[0].ndim != 2:
-            raise NotImplementedError(
-                "R_op supported for max only when input is a matrix"
-            )
-        max_pos = Argmax(self.axis)(*inputs)
-        if self.axis[0] == 0:
-            return [eval_points[0][max_pos, arange(eval_points[0].shape[1])]]
-        else:
-            return [eval_points[0][arange(eval_points[0].shape[0]), max_pos]]
+        max_pos = Argmax(self.axis)(x)
+        return [_take_reduced(eval_points[0], max_pos, self.axis)]
 
 
 class Min(NonZeroDimsCAReduce):
@@ -471,6 +471,13 @@ class Min(NonZeroDimsCAReduce):
         axis = kwargs.get("axis", self.axis)
         return type(self)(axis=axis)
 
+    def R_op(self, inputs, eval_points):
+        [x] = inputs
+        if eval_points[0] is None:
+            return [None]
+        min_pos = argmin(x, axis=self.axis)
+        return [_take_reduced(eval_points[0], min_pos, self.axis)]
+
 
 def max(x, axis=None, keepdims=False):
     """
@@ -3668,6 +3675,17 @@ class Prod(FixedOpCAReduce):
 
             return [final_grad]
 
+    def R_op(self, inputs, eval_points):
+        # The tangent of a product is the sum of the tangents of its elements,
+        # each multiplied by the product of the other elements of its group,
+        # i.e. by the gradient, which also handles the groups with zeros
+        [x] = inputs
+        if eval_points[0] is None:
+            return [None]
+        out = self(x)
+        [gx] = self.L_op([x], [out], [out.ones_like()])
+        return [sum(gx * eval_points[0], axis=self.axis, dtype=out.dtype)]
+
     def c_code_cache_version(self):
         return (1,)
 
@@ -4,6 +4,7 @@ from functools import partial
 from typing import Literal, cast
 
 import numpy as np
+import scipy.linalg as scipy_linalg
 
 from pytensor import scalar as ps
 from pytensor.compile.builders import OpFromGraph
@@ -224,6 +225,14 @@ class Det(Op):
         (x,) = inputs
         return [gz * self(x) * matrix_inverse(x).T]
 
+    def R_op(self, inputs, eval_points):
+        # d det(X) = det(X) tr(X^{-1} V)
+        (x,) = inputs
+        (ev,) = eval_points
+        if ev is None:
+            return [None]
+        return [self(x) * ptm.sum(matrix_inverse(x).T * ev)]
+
     def infer_shape(self, fgraph, node, shapes):
         return [()]
 
@@ -330,11 +339,16 @@ class Eigh(Eig):
 
     """
 
-    __props__ = ("UPLO",)
+    __props__ = ("UPLO", "overwrite_a")
+    # `np.linalg.eigh` takes `UPLO` as an argument, and can't overwrite its input
+    gufunc_spec = None
 
-    def __init__(self, UPLO="L"):
+    def __init__(self, UPLO="L", *, overwrite_a: bool = False):
         assert UPLO in ("L", "U")
         self.UPLO = UPLO
+        self.overwrite_a = overwrite_a
+        if self.overwrite_a:
+            self.destroy_map = {1: [0]}
 
     def make_node(self, x):
         x = as_tensor_variable(x)
@@ -352,7 +366,20 @@ class Eigh(Eig):
     def perform(self, node, inputs, outputs):
         (x,) = inputs
         (w, v) = outputs
-        w[0], v[0] = np.linalg.eigh(x, self.UPLO)
+        if self.overwrite_a and x.flags["F_CONTIGUOUS"]:
+            # LAPACK can only overwrite Fortran contiguous arrays, in which it
+            # writes the eigenvectors. `np.linalg.eigh` uses the same driver.
+            w_val, v_val = scipy_linalg.eigh(
+                x,
+                lower=self.UPLO == "L",
+                overwrite_a=True,
+                check_finite=False,
+                driver="evd",
+            )
+        else:
+            w_val, v_val = np.linalg.eigh(x, self.UPLO)
+        w[0] = w_val.astype(node.outputs[0].type.dtype, copy=False)
+        v[0] = v_val.astype(node.outputs[1].type.dtype, copy=False)
 
     def grad(self, inputs, g_outputs):
         r"""The gradient function should return
@@ -378,12 +405,19 @@ class Eigh(Eig):
 
         """
         (x,) = inputs
-        w, v = self(x)
+        w, v = Eigh(self.UPLO)(x)
         # Replace gradients wrt disconnected variables with
         # zeros. This is a work-around for issue #1063.
         gw, gv = _zero_disconnected([w, v], g_outputs)
         return [EighGrad(self.UPLO)(x, w, v, gw, gv)]
 
+    def inplace_on_inputs(self, allowed_inplace_inputs: list[int]) -> "Op":
+        if not allowed_inplace_inputs:
+            return self
+        new_props = self._props_dict()  # type: ignore
+        new_props["overwrite_a"] = True
+        return type(self)(**new_props)
+
 
 def _zero_disconnected(outputs, grads):
     l = []
@@ -462,7 +496,7 @@ class EighGrad(Op):
 
 
 def eigh(a, UPLO="L"):
-    return Eigh(UPLO)(a)
+    return Blockwise(Eigh(UPLO))(a)
 
 
 class SVD(Op):
@@ -0,0 +1,235 @@
+"""Machine-specific sizes from which elementwise loops are run with OpenMP.
+
+Whether an `Elemwise`, `CAReduce` or `MapReduce` loop is faster on several
+OpenMP threads depends on the cost of its scalar operations, on their dtype
+and on the number of threads, so a single ``config.openmp_elemwise_minsize``
+is either too small for cheap operations or too large for expensive ones.
+
+`tune` times a few representative scalar operations with and without OpenMP,
+and stores the smallest number of elements from which the parallel loops were
+faster in the compiledir, for the current number of threads.  When
+``config.openmp_tuned_minsize`` is enabled, `openmp_minsize` returns these
+thresholds to the C code generators, which fall back to
+``config.openmp_elemwise_minsize`` for operations that weren't tuned.
+
+"""
+
+import json
+import os
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from pytensor.configdefaults import config
+
+
+NEVER = int(np.iinfo(np.int64).max)
+"""The threshold of operations that were never faster with OpenMP."""
+
+DEFAULT_SIZES = tuple(4**k for k in range(5, 12))
+
+_thresholds_cache: dict[Path, dict[str, dict[str, int]]] = {}
+
+
+def openmp_n_threads() -> int:
+    """Return the number of threads used by OpenMP loops."""
+    try:
+        return max(int(os.environ["OMP_NUM_THREADS"]), 1)
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+def thresholds_path() -> Path:
+    """Return the path of the file in which the tuned thresholds are stored."""
+    return Path(config.compiledir) / "openmp_thresholds.json"
+
+
+def load_thresholds(n_threads: int | None = None) -> dict[str, int]:
+    """Return the thresholds tuned for `n_threads` threads.
+
+    `n_threads` defaults to `openmp_n_threads`.  The keys of the returned
+    dictionary are built by `threshold_key`.
+
+    """
+    path = thresholds_path()
+    if path not in _thresholds_cache:
+        try:
+            with path.open() as f:
+                _thresholds_cache[path] = json.load(f)
+        except (OSError, ValueError):
+            _thresholds_cache[path] = {}
+    if n_threads is None:
+        n_threads = openmp_n_threads()
+    return _thresholds_cache[path].get(str(n_threads), {})
+
+
+def save_thresholds(thresholds: dict[str, int], n_threads: int | None = None):
+    """Add `thresholds` to those stored for `n_threads` threads."""
+    path = thresholds_path()
+    try:
+        with path.open() as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    if n_threads is None:
+        n_threads = openmp_n_threads()
+    stored.setdefault(str(n_threads), {}).update(thresholds)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w") as f:
+        json.dump(stored, f, indent=1, sort_keys=True)
+    tmp_path.replace(path)
+    _thresholds_cache[path] = stored
+
+
+def threshold_key(kind: str, scalar_op_name: str, dtype: str) -> str:
+    """Return the key of the threshold of a scalar `Op` class in an ``"elemwise"`` or ``"careduce"`` loop."""
+    return f"{kind}:{scalar_op_name}:{dtype}"
+
+
+def _scalar_op_names(scalar_op) -> set[str]:
+    from pytensor.scalar.basic import Composite
+
+    if isinstance(scalar_op, Composite):
+        return {type(node.op).__name__ for node in scalar_op.fgraph.apply_nodes}
+    return {type(scalar_op).__name__}
+
+
+def openmp_minsize(scalar_ops, dtype: str, reduce_op=None) -> int:
+    """Return the number of elements from which a loop is run with OpenMP.
+
+    A loop that applies all the `scalar_ops`, and accumulates the results with
+    `reduce_op` if it isn't ``None``, is at least as expensive as the most
+    expensive of these operations, so the smallest of their tuned thresholds
+    is used.  ``config.openmp_elemwise_minsize`` is returned if none of them
+    were tuned, or if ``config.openmp_tuned_minsize`` is disabled.
+
+    """
+    default = int(config.openmp_elemwise_minsize)
+    if not config.openmp_tuned_minsize:
+        return default
+    thresholds = load_thresholds()
+    if not thresholds:
+        return default
+
+    keys = [
+        threshold_key("elemwise", name, dtype)
+        for scalar_op in scalar_ops
+        if scalar_op is not None
+        for name in _scalar_op_names(scalar_op)
+    ]
+    if reduce_op is not None:
+        keys.append(threshold_key("careduce", type(reduce_op).__name__, dtype))
+    return min((thresholds[key] for key in keys if key in thresholds), default=default)
+
+
+def _representative_graphs(dtype):
+    import pytensor.scalar as ps
+    from pytensor.scalar.math import erfcx
+    from pytensor.tensor.elemwise import CAReduce, Elemwise
+    from pytensor.tensor.type import vector
+
+    def elemwise(scalar_op):
+        def build(openmp):
+            n_inputs = 2 if scalar_op.nin == -1 else scalar_op.nin
+            inputs = [vector(dtype=dtype) for _ in range(n_inputs)]
+            return inputs, Elemwise(scalar_op, openmp=openmp)(*inputs)
+
+        return "elemwise", scalar_op, build
+
+    def careduce(scalar_op):
+        def build(openmp):
+            x = vector(dtype=dtype)
+            return [x], CAReduce(scalar_op, axis=None, openmp=openmp)(x)
+
+        return "careduce", scalar_op, build
+
+    # A cheap arithmetic operation, a transcendental function and a special
+    # function, and the reductions of the cheapest ones
+    return [
+        elemwise(ps.add),
+        elemwise(ps.exp),
+        elemwise(erfcx),
+        careduce(ps.add),
+        careduce(ps.scalar_maximum),
+    ]
+
+
+def _time(fn, values, min_time=0.01, repeat=5):
+    number = 1
+    while timeit.timeit(lambda: fn(*values), number=number) < min_time:
+        number *= 2
+    return min(timeit.repeat(lambda: fn(*values), number=number, repeat=repeat))
+
+
+def tune(
+    dtypes=("float64", "float32"),
+    sizes=DEFAULT_SIZES,
+    save: bool = True,
+) -> dict[str, int]:
+    """Measure the sizes from which representative loops are faster with OpenMP.
+
+    For each representative scalar operation and dtype, the loop is timed on
+    vectors of each of the `sizes`, with and without OpenMP, and its threshold
+    is the smallest size from which the parallel loop was faster for all the
+    larger sizes, or `NEVER`.
+
+    Parameters
+    ----------
+    dtypes
+        The dtypes for which the thresholds are measured.
+    sizes
+        The increasing numbers of elements of the timed vectors.
+    save
+        Whether to add the thresholds to those stored in the compiledir for
+        the current number of threads.
+
+    Returns
+    -------
+    The thresholds, indexed by `threshold_key`.
+
+    """
+    from pytensor.compile.function import function
+    from pytensor.compile.mode import Mode
+    from pytensor.link.c.op import OpenMPOp
+
+    if not config.cxx:
+        raise RuntimeError("Tuning the OpenMP thresholds requires a C++ compiler.")
+    if not OpenMPOp.test_gxx_support():
+        raise RuntimeError("The C++ compiler doesn't support OpenMP.")
+
+    rng = np.random.default_rng(2087)
+    mode = Mode(linker="c", optimizer=None)
+    thresholds = {}
+    for dtype in dtypes:
+        for kind, scalar_op, build in _representative_graphs(dtype):
+            fns = {}
+            # Always use the parallel loop, ignoring any previously tuned thresholds
+            with config.change_flags(
+                openmp_elemwise_minsize=0, openmp_tuned_minsize=False
+            ):
+                for openmp in (False, True):
+                    inputs, output = build(openmp)
+                    fns[openmp] = function(inputs, output, mode=mode)
+                    fns[openmp].trust_input = True
+
+            faster = []
+            for size in sizes:
+                values = [
+                    rng.uniform(0.5, 1.5, size=size).astype(dtype)
+                    for _ in fns[False].maker.fgraph.inputs
+                ]
+                faster.append(_time(fns[True], values) < _time(fns[False], values))
+
+            threshold = NEVER
+            for size, is_faster in zip(reversed(sizes), reversed(faster), strict=True):
+                if not is_faster:
+                    break
+                threshold = size
+            key = threshold_key(kind, type(scalar_op).__name__, dtype)
+            thresholds[key] = int(threshold)
+
+    if save:
+        save_thresholds(thresholds)
+    return thresholds
@@ -8,8 +8,10 @@ import pytensor.tensor.rewriting.extra_ops
 import pytensor.tensor.rewriting.jax
 import pytensor.tensor.rewriting.linalg
 import pytensor.tensor.rewriting.math
+import pytensor.tensor.rewriting.memory_order
 import pytensor.tensor.rewriting.numba
 import pytensor.tensor.rewriting.ofg
+import pytensor.tensor.rewriting.remat
 import pytensor.tensor.rewriting.shape
 import pytensor.tensor.rewriting.special
 import pytensor.tensor.rewriting.subtensor
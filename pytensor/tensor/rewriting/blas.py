@@ -83,6 +83,7 @@ from pytensor.graph.rewriting.db import SequenceDB
 from pytensor.graph.utils import InconsistencyError
 from pytensor.tensor import basic as ptb
 from pytensor.tensor.blas import (
+    BatchedDot,
     Dot22,
     _batched_dot,
     _dot22,
@@ -94,6 +95,7 @@ from pytensor.tensor.blas import (
     ger,
     ger_destructive,
 )
+from pytensor.tensor.blockwise import Blockwise
 from pytensor.tensor.elemwise import DimShuffle, Elemwise
 from pytensor.tensor.exceptions import NotScalarConstantError
 from pytensor.tensor.math import (
@@ -888,12 +890,16 @@ blas_optdb.register(
 
 
 @register_specialize
-@node_rewriter([_matmul])
+@node_rewriter([Blockwise])
 def specialize_matmul_to_batched_dot(fgraph, node):
-    """Rewrite Matmul (Blockwise matrix-matrix) without implicit broadcasted batched dimension as BatchedDot.
+    """Rewrite Matmul and Blockwise BatchedDot without implicit broadcasted batched dimension as BatchedDot.
 
-    TODO: Do the same for Blockwise BatchedDot
+    The batch dimensions of a Blockwise BatchedDot are raveled with its core
+    batch dimension.
     """
+    if not (node.op == _matmul or isinstance(node.op.core_op, BatchedDot)):
+        return None
+
     x, y = node.inputs
 
     if x.type.ndim < 3:
@@ -32,8 +32,8 @@ from pytensor.tensor.basic import (
     MakeVector,
     constant,
 )
-from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise
-from pytensor.tensor.math import add, exp, mul
+from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise, MapReduce
+from pytensor.tensor.math import NonZeroDimsCAReduce, add, exp, mul
 from pytensor.tensor.rewriting.basic import (
     alloc_like,
     broadcasted_by,
@@ -1099,11 +1099,128 @@ def local_careduce_fusion(fgraph, node):
         acc_dtype=car_acc_dtype,
         dtype=car_op.dtype,
         upcast_discrete_output=car_op.upcast_discrete_output,
+        openmp=car_op.openmp,
     )
 
     return [new_car_op(*elm_inputs)]
 
 
+@node_rewriter([CAReduce])
+def local_map_reduce_fusion(fgraph, node):
+    """Fuse a `CAReduce` with the `Elemwise` it reduces, and the `Elemwise` applied to its result.
+
+    The reduction of an `Elemwise` with several inputs, e.g. ``sum(exp(x - m) * w,
+    axis=1)``, is replaced by a `MapReduce` that evaluates the `Elemwise` while
+    reducing it, without allocating its output.  If the only client of the
+    reduction is an `Elemwise` that doesn't broadcast it, it is fused in as
+    well, as the epilogue of the `MapReduce`.
+
+    The case of a single input without epilogue is left to
+    `local_careduce_fusion`.
+
+    """
+    (car_input,) = node.inputs
+    car_op = node.op
+    car_scalar_op = car_op.scalar_op
+
+    # `Max` and `Min` must fail on empty inputs, which a `MapReduce` doesn't do
+    if type(car_scalar_op) not in (
+        ps.Add,
+        ps.Mul,
+        ps.ScalarMaximum,
+        ps.ScalarMinimum,
+    ) or isinstance(car_op, NonZeroDimsCAReduce):
+        return None
+
+    elm_node = car_input.owner
+    if not (
+        elm_node is not None
+        and isinstance(elm_node.op, Elemwise)
+        and len(elm_node.outputs) == 1
+        and len(fgraph.clients[car_input]) == 1
+    ):
+        return None
+
+    [car_output] = node.outputs
+    epi_node = None
+    car_clients = fgraph.clients[car_output]
+    if len(car_clients) == 1:
+        [(client, _)] = car_clients
+        if (
+            isinstance(client.op, Elemwise)
+            and len(client.outputs) == 1
+            and client.outputs[0].type.broadcastable == car_output.type.broadcastable
+        ):
+            epi_node = client
+
+    if len(elm_node.inputs) == 1 and epi_node is None:
+        return None
+
+    # Don't form the fusion when the target language is Python
+    target_language = get_target_language()
+    if target_language == ("py",):
+        return None
+
+    if "c" in target_language:
+        fused_nodes = (
+            [elm_node, node] if epi_node is None else [elm_node, node, epi_node]
+        )
+        if any(
+            var.type.dtype == "float16" or var.type.dtype.startswith("complex")
+            for fused_node in fused_nodes
+            for var in fused_node.inputs + fused_node.outputs
+        ) or not all(
+            fused_node.op.scalar_op.supports_c_code(
+                fused_node.inputs, fused_node.outputs
+            )
+            for fused_node in (elm_node, epi_node)
+            if fused_node is not None
+        ):
+            return None
+
+    epi_scalar_op = None
+    epi_inputs = []
+    if epi_node is not None:
+        reduced = ps.get_scalar_type(car_output.type.dtype).make_variable()
+        scalar_inputs = []
+        for inp in epi_node.inputs:
+            if inp is car_output:
+                scalar_inputs.append(reduced)
+            else:
+                scalar_inputs.append(ps.get_scalar_type(inp.type.dtype).make_variable())
+                epi_inputs.append(inp)
+        epi_scalar_op = ps.Composite(
+            [reduced, *(s for s in scalar_inputs if s is not reduced)],
+            epi_node.op.scalar_op.make_node(*scalar_inputs).outputs,
+        )
+
+    map_scalar_op = elm_node.op.scalar_op
+    if not isinstance(map_scalar_op, ps.Composite):
+        # `MapReduce` needs a fixed number of inputs
+        scalar_inputs = [
+            ps.get_scalar_type(inp.type.dtype).make_variable()
+            for inp in elm_node.inputs
+        ]
+        map_scalar_op = ps.Composite(
+            scalar_inputs, map_scalar_op.make_node(*scalar_inputs).outputs
+        )
+
+    map_reduce_op = MapReduce(
+        car_scalar_op,
+        map_scalar_op,
+        epi_scalar_op,
+        axis=car_op.axis,
+        dtype=car_output.type.dtype,
+        acc_dtype=getattr(car_op, "acc_dtype", None),
+        openmp=car_op.openmp,
+    )
+    new_out = map_reduce_op(*elm_node.inputs, *epi_inputs)
+
+    old_out = car_output if epi_node is None else epi_node.outputs[0]
+    copy_stack_trace(old_out, new_out)
+    return {old_out: new_out}
+
+
 @node_rewriter([Elemwise])
 def local_inline_composite_constants(fgraph, node):
     """Inline scalar constants in Composite graphs."""
@@ -1246,6 +1363,13 @@ fuse_seqopt.register(
     "fusion",
     position=2,
 )
+fuse_seqopt.register(
+    "local_map_reduce_fusion",
+    in2out(local_map_reduce_fusion),
+    "fast_run",
+    "fusion",
+    position=9,
+)
 fuse_seqopt.register(
     "local_careduce_fusion",
     in2out(local_careduce_fusion),
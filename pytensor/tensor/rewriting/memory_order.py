@@ -0,0 +1,193 @@
+"""Propagation of the memory order preferred by LAPACK-based `Op`\\s.
+
+The SciPy LAPACK wrappers behind `Solve`, `LU` or `Eigh` work on Fortran
+ordered matrices, and copy any C ordered input into a Fortran ordered one
+before the call, which also prevents their ``overwrite_*`` flags from avoiding
+a copy.  Most of these matrices are produced by an `Elemwise` or an `Alloc`,
+that could just as well have allocated their output in Fortran order.
+
+The `PropagateMemoryOrder` rewrite collects the orders that the `Op`\\s of a
+graph prefer for their inputs, as reported by `preferred_input_orders`, and
+propagates them upwards through the `Elemwise`\\s, transpositions and
+`SpecifyShape`\\s.  The outputs of the `Elemwise`\\s and `Alloc`\\s that can
+be allocated in the preferred order at no cost are tagged with
+``tag.memory_order = "F"``, which their C implementations then use to allocate
+them.
+
+"""
+
+from collections import defaultdict
+from functools import singledispatch
+from typing import Literal
+
+from pytensor.compile.mode import optdb
+from pytensor.graph.basic import Apply, Variable
+from pytensor.graph.fg import FunctionGraph
+from pytensor.graph.op import Op
+from pytensor.graph.rewriting.basic import GraphRewriter
+from pytensor.tensor.basic import Alloc
+from pytensor.tensor.blockwise import Blockwise
+from pytensor.tensor.elemwise import DimShuffle, Elemwise
+from pytensor.tensor.nlinalg import Eigh
+from pytensor.tensor.shape import SpecifyShape
+from pytensor.tensor.slinalg import (
+    LU,
+    CholeskySolve,
+    LUFactor,
+    Solve,
+    SolveTriangular,
+)
+from pytensor.tensor.type import TensorType
+
+
+MemoryOrder = Literal["C", "F"]
+
+
+@singledispatch
+def preferred_input_orders(op: Op, node: Apply) -> dict[int, MemoryOrder]:
+    """Return the memory orders in which `node` would rather receive its inputs.
+
+    The returned dictionary maps the indices of the inputs for which `op` has
+    a preference to ``"C"`` or ``"F"``.  `Op`\\s without a preference, the
+    default, return an empty dictionary.
+
+    """
+    return {}
+
+
+def _fortran_matrices(node: Apply, idxs: tuple[int, ...]) -> dict[int, MemoryOrder]:
+    return {i: "F" for i in idxs if node.inputs[i].type.ndim == 2}
+
+
+@preferred_input_orders.register(Solve)
+@preferred_input_orders.register(CholeskySolve)
+def _solve_preferred_input_orders(op, node):
+    return _fortran_matrices(node, (0, 1))
+
+
+@preferred_input_orders.register(SolveTriangular)
+def _solve_triangular_preferred_input_orders(op, node):
+    # SciPy solves with the transpose of C ordered triangular matrices instead
+    # of copying them
+    return _fortran_matrices(node, (1,))
+
+
+@preferred_input_orders.register(LU)
+@preferred_input_orders.register(LUFactor)
+@preferred_input_orders.register(Eigh)
+def _factorization_preferred_input_orders(op, node):
+    return _fortran_matrices(node, (0,))
+
+
+@preferred_input_orders.register(Blockwise)
+def _blockwise_preferred_input_orders(op, node):
+    # The matrices of a batch aren't contiguous in either order
+    if op.batch_ndim(node) > 0:
+        return {}
+    return preferred_input_orders(op.core_op, node)
+
+
+_FLIPPED_ORDER: dict[MemoryOrder, MemoryOrder] = {"C": "F", "F": "C"}
+
+
+class PropagateMemoryOrder(GraphRewriter):
+    """Tag the outputs that can be allocated in the memory order their clients prefer.
+
+    The clients of each variable are visited before the variable itself, and
+    the variable is assigned an order when all its clients that have a
+    preference agree on it:
+
+    - `Op`\\s state their preferences with `preferred_input_orders`.
+    - An `Elemwise` passes the order of its outputs to its inputs that aren't
+      broadcasted.
+    - A `DimShuffle` that reverses the dimensions of its input passes the
+      other order to it, and a `SpecifyShape` passes the order unchanged.
+
+    The outputs of the `Elemwise`\\s and of the `Alloc`\\s of a broadcasted
+    value that should be in Fortran order are tagged with
+    ``tag.memory_order = "F"``.  A tagged `Elemwise` allocates a Fortran
+    ordered output when its inputs that aren't broadcasted all are Fortran
+    ordered, or when there are none, which doesn't change the number of
+    operations of its loop.  The C order is the default of all the producers,
+    so it is never tagged.
+
+    """
+
+    def add_requirements(self, fgraph):
+        pass
+
+    def apply(self, fgraph: FunctionGraph):
+        requested: dict[Variable, set[MemoryOrder]] = defaultdict(set)
+        nb_tagged = 0
+
+        for node in reversed(fgraph.toposort()):
+            op = node.op
+            if isinstance(op, Elemwise):
+                orders = {self._order(requested, out) for out in node.outputs}
+                order = orders.pop() if len(orders) == 1 else None
+                if order is not None:
+                    full_inputs = [
+                        inp for inp in node.inputs if not any(inp.type.broadcastable)
+                    ]
+                    for inp in full_inputs:
+                        requested[inp].add(order)
+                    if order == "F":
+                        nb_tagged += self._tag_fortran(node)
+            elif isinstance(op, Alloc):
+                value = node.inputs[0]
+                broadcasted_value = value.type.ndim < node.outputs[0].type.ndim or any(
+                    value.type.broadcastable
+                )
+                if broadcasted_value and self._order(requested, node.outputs[0]) == "F":
+                    nb_tagged += self._tag_fortran(node)
+            elif isinstance(op, DimShuffle):
+                order = self._order(requested, node.outputs[0])
+                if order is not None and op.new_order == tuple(
+                    reversed(range(op.input_ndim))
+                ):
+                    requested[node.inputs[0]].add(_FLIPPED_ORDER[order])
+            elif isinstance(op, SpecifyShape):
+                order = self._order(requested, node.outputs[0])
+                if order is not None:
+                    requested[node.inputs[0]].add(order)
+
+            for i, order in preferred_input_orders(op, node).items():
+                requested[node.inputs[i]].add(order)
+
+        return self, nb_tagged
+
+    @staticmethod
+    def _order(
+        requested: dict[Variable, set[MemoryOrder]], var: Variable
+    ) -> MemoryOrder | None:
+        orders = requested.get(var, ())
+        if len(orders) != 1:
+            return None
+        (order,) = orders
+        return order
+
+    @staticmethod
+    def _tag_fortran(node: Apply) -> int:
+        nb_tagged = 0
+        for out in node.outputs:
+            if isinstance(out.type, TensorType) and out.type.ndim >= 2:
+                out.tag.memory_order = "F"
+                nb_tagged += 1
+        return nb_tagged
+
+    @classmethod
+    def print_profile(cls, stream, prof, level=0):
+        blanc = "    " * level
+        print(blanc, cls.__name__, file=stream)
+        if prof is None:
+            return
+        print(blanc, " nb_tagged", prof[1], file=stream)
+
+
+optdb.register(
+    "propagate_memory_order",
+    PropagateMemoryOrder(),
+    "fast_run",
+    "cxx_only",
+    position=100.7,
+)
@@ -0,0 +1,396 @@
+"""Rematerialization of intermediate results under a peak memory budget.
+
+Gradient graphs keep every forward intermediate that the backward pass needs
+alive until it is used, which is usually what determines their peak memory.
+The `Rematerialize` rewrite trades compute for memory by recomputing some of
+those intermediates right before their later uses, so that the originals can
+be freed early.
+
+"""
+
+from collections import defaultdict
+
+from pytensor.compile.mode import optdb
+from pytensor.configdefaults import config
+from pytensor.graph.basic import Variable
+from pytensor.graph.features import AlreadyThere, Feature
+from pytensor.graph.fg import FunctionGraph
+from pytensor.graph.op import HasInnerGraph
+from pytensor.graph.rewriting.basic import GraphRewriter, copy_stack_trace
+from pytensor.graph.utils import InconsistencyError
+from pytensor.tensor.basic import get_scalar_constant_value
+from pytensor.tensor.exceptions import NotScalarConstantError
+from pytensor.tensor.type import TensorType
+
+
+def _variable_size(fgraph: FunctionGraph, var: Variable) -> int:
+    """Return the number of bytes taken by `var`, or 0 if it isn't known statically."""
+    if not isinstance(var.type, TensorType):
+        return 0
+
+    shape = var.type.shape
+    if None in shape:
+        shape_feature = getattr(fgraph, "shape_feature", None)
+        shape_of = getattr(shape_feature, "shape_of", {})
+        inferred = shape_of.get(var)
+        if inferred is None:
+            return 0
+        try:
+            shape = tuple(
+                static if static is not None else int(get_scalar_constant_value(s))
+                for static, s in zip(shape, inferred, strict=True)
+            )
+        except NotScalarConstantError:
+            return 0
+
+    return int(var.type.get_size(shape))
+
+
+def _running_memory(
+    fgraph: FunctionGraph, order: list, sizes: dict
+) -> tuple[list[int], dict[Variable, int], dict[Variable, Variable]]:
+    """Simulate the memory allocated while the nodes of `order` are evaluated.
+
+    This follows the model of `ProfileStats.summary_memory`: the outputs of a
+    node that are views of, or that destroy, one of its inputs don't allocate
+    memory, and the memory of any other output is freed after the last node
+    that uses it, or a view of it, unless it is an output of the graph.
+
+    Returns
+    -------
+    The memory allocated right after each node has computed its outputs, the
+    position of the last node that uses each variable that allocates memory,
+    and the variable whose memory each view uses.
+
+    """
+    origin: dict[Variable, Variable] = {}
+    last_use: dict[Variable, int] = {}
+    for i, node in enumerate(order):
+        for inp in node.inputs:
+            last_use[origin.get(inp, inp)] = i
+
+        aliased = {**node.op.view_map, **node.op.destroy_map}
+        for out_idx, out in enumerate(node.outputs):
+            if out_idx in aliased:
+                inp = node.inputs[aliased[out_idx][0]]
+                origin[out] = origin.get(inp, inp)
+            else:
+                # Outputs that aren't used are freed right away
+                last_use[out] = i
+
+    kept = {origin.get(out, out) for out in fgraph.outputs}
+    freed_after = defaultdict(list)
+    for var, i in last_use.items():
+        if var.owner is not None and var not in kept:
+            freed_after[i].append(var)
+
+    running = 0
+    memory = []
+    for i, node in enumerate(order):
+        running += sum(sizes[out] for out in node.outputs if out not in origin)
+        memory.append(running)
+        running -= sum(sizes[var] for var in freed_after[i])
+
+    return memory, last_use, origin
+
+
+def estimate_peak_memory(fgraph: FunctionGraph, order: list | None = None) -> int:
+    """Estimate the peak memory, in bytes, allocated while evaluating `fgraph`.
+
+    Only the variables whose sizes can be determined from their static shapes,
+    or from constant shapes inferred by the graph's ``ShapeFeature``, are
+    accounted for.
+
+    Parameters
+    ----------
+    fgraph
+        The graph to evaluate.
+    order
+        The order in which the nodes are evaluated.  Defaults to
+        `FunctionGraph.toposort`.
+
+    """
+    if order is None:
+        order = fgraph.toposort()
+    sizes = {out: _variable_size(fgraph, out) for node in order for out in node.outputs}
+    memory, _, _ = _running_memory(fgraph, order, sizes)
+    return max(memory, default=0)
+
+
+class RematerializeFeature(Feature):
+    """Schedule the nodes added by `Rematerialize` after the point at which they replace the originals."""
+
+    def __init__(self):
+        self.after: dict = {}
+
+    def on_attach(self, fgraph):
+        if hasattr(fgraph, "rematerialize_feature"):
+            raise AlreadyThere("RematerializeFeature is already present")
+        fgraph.rematerialize_feature = self
+
+    def on_detach(self, fgraph):
+        del fgraph.rematerialize_feature
+
+    def on_prune(self, fgraph, node, reason):
+        self.after.pop(node, None)
+
+    def orderings(self, fgraph):
+        apply_nodes = fgraph.apply_nodes
+        return {
+            node: [prereq]
+            for node, prereq in self.after.items()
+            if prereq in apply_nodes
+        }
+
+    def clone(self):
+        return type(self)()
+
+
+class Rematerialize(GraphRewriter):
+    r"""Recompute intermediate results to bring the peak memory within a budget.
+
+    The peak memory of the graph is estimated with `estimate_peak_memory`.
+    While it is above the budget, the node of one of the variables that are
+    alive at the peak, and used both before and after it, is cloned, and the
+    uses after the peak are replaced by the clone, which is scheduled to run
+    after the peak.  The variables whose rematerialization would free the most
+    memory, net of the inputs that would have to be kept alive for it, are
+    tried first, and a rematerialization is only kept if it actually lowers
+    the estimated peak.
+
+    Each node of the graph is recomputed at most once, so the extra compute is
+    bounded by that of a second evaluation of the graph.  Nodes that return
+    views or work in-place, nodes with inner graphs and nodes that don't only
+    work with `TensorType`\s (e.g. that use random generators) are never
+    recomputed.
+
+    Parameters
+    ----------
+    memory_budget
+        The peak memory budget, in bytes.  Defaults to
+        ``config.rematerialize__memory_budget``.  The rewrite doesn't do
+        anything if it is 0.
+
+    """
+
+    def __init__(self, memory_budget: int | None = None):
+        super().__init__()
+        self.memory_budget = memory_budget
+
+    def add_requirements(self, fgraph):
+        try:
+            fgraph.attach_feature(RematerializeFeature())
+        except AlreadyThere:
+            pass
+
+    @staticmethod
+    def _aliased_input(node, out_idx: int) -> int | None:
+        aliased = node.op.view_map.get(out_idx) or node.op.destroy_map.get(out_idx)
+        return aliased[0] if aliased else None
+
+    def _chain(self, fgraph: FunctionGraph, var: Variable, origin: dict) -> list | None:
+        """Return the nodes that compute `var` from the variable whose memory it uses.
+
+        ``None`` is returned if any of them can't be recomputed.
+
+        """
+        has_destroyers = getattr(fgraph, "has_destroyers", None)
+        chain = []
+        while True:
+            node = var.owner
+            op = node.op
+            if isinstance(op, HasInnerGraph) or not all(
+                isinstance(v.type, TensorType) for v in node.inputs + node.outputs
+            ):
+                return None
+            if any(len(idx) > 1 for idx in op.destroy_map.values()):
+                return None
+            aliased = self._aliased_input(node, var.index)
+            other_inputs = [inp for j, inp in enumerate(node.inputs) if j != aliased]
+            if has_destroyers is not None and has_destroyers(other_inputs):
+                return None
+            chain.append((node, aliased))
+            if var not in origin:
+                return chain[::-1]
+            var = node.inputs[aliased]
+
+    def apply(self, fgraph):
+        memory_budget = self.memory_budget
+        if memory_budget is None:
+            memory_budget = config.rematerialize__memory_budget
+        if memory_budget <= 0:
+            return None
+
+        feature = fgraph.rematerialize_feature
+        order = fgraph.toposort()
+        sizes = {
+            out: _variable_size(fgraph, out) for node in order for out in node.outputs
+        }
+        memory, last_use, origin = _running_memory(fgraph, order, sizes)
+        peak = max(memory, default=0)
+        peak_before = peak
+        # The nodes that were recomputed, or that are recomputations
+        recomputed = set()
+        nb_rematerialized = 0
+        nb_rejected = 0
+
+        while peak > memory_budget:
+            t = memory.index(peak)
+            position = {node: i for i, node in enumerate(order)}
+            kept = {origin.get(out, out) for out in fgraph.outputs}
+            views = defaultdict(list)
+            for view, var in origin.items():
+                views[var].append(view)
+
+            # The variables that are alive at the peak and used after it, with
+            # the nodes that compute their late uses and the memory that
+            # recomputing them would save
+            candidates = []
+            for node in order[: t + 1]:
+                if node in recomputed:
+                    continue
+                for out in node.outputs:
+                    if out in origin or out in kept or last_use[out] <= t:
+                        continue
+                    # Views that are computed after the peak are recomputed
+                    # with the uses they lead to
+                    late_uses = [
+                        (client, i, var)
+                        for var in (out, *views[out])
+                        for client, i in fgraph.clients[var]
+                        if position.get(client, -1) > t
+                        and not any(
+                            i in idx
+                            for idx in (
+                                *client.op.view_map.values(),
+                                *client.op.destroy_map.values(),
+                            )
+                        )
+                    ]
+                    chains = [
+                        self._chain(fgraph, var, origin) for _, _, var in late_uses
+                    ]
+                    if not late_uses or None in chains:
+                        continue
+                    # The inputs that would have to be kept alive past the peak
+                    extended = {
+                        origin.get(inp, inp)
+                        for chain in chains
+                        for chain_node, aliased in chain
+                        for j, inp in enumerate(chain_node.inputs)
+                        if j != aliased
+                    }
+                    cost = sum(
+                        sizes.get(inp, 0)
+                        for inp in extended
+                        if inp.owner is not None and last_use[inp] <= t
+                    )
+                    if sizes[out] > cost:
+                        candidates.append(
+                            (sizes[out] - cost, position[node], out, late_uses)
+                        )
+
+            if not candidates:
+                break
+
+            # Largest saving first, and the latest node among equal ones
+            candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+            for _, _, out, late_uses in candidates:
+                node = out.owner
+                first_late = min(position[client] for client, _, _ in late_uses)
+
+                # Clone the nodes that compute the late uses from `out`
+                memo: dict[Variable, Variable] = {}
+                new_nodes = []
+
+                def clone(var):
+                    if var not in memo:
+                        var_node = var.owner
+                        new_inputs = list(var_node.inputs)
+                        if var in origin:
+                            aliased = self._aliased_input(var_node, var.index)
+                            new_inputs[aliased] = clone(new_inputs[aliased])
+                        new_node = var_node.clone_with_new_inputs(new_inputs)
+                        copy_stack_trace(var_node.outputs, new_node.outputs)
+                        new_nodes.append(new_node)
+                        for old_var, new_var in zip(
+                            var_node.outputs, new_node.outputs, strict=True
+                        ):
+                            memo[old_var] = new_var
+                            sizes[new_var] = sizes[old_var]
+                    return memo[var]
+
+                feature.after[clone(out).owner] = order[first_late - 1]
+                for client, i, var in late_uses:
+                    fgraph.change_node_input(
+                        client,
+                        i,
+                        clone(var),
+                        reason="rematerialize",
+                        import_missing=True,
+                    )
+
+                try:
+                    if hasattr(fgraph, "validate"):
+                        fgraph.validate()
+                    new_order = fgraph.toposort()
+                except (InconsistencyError, ValueError):
+                    new_order = None
+
+                if new_order is not None:
+                    new_memory, new_last_use, new_origin = _running_memory(
+                        fgraph, new_order, sizes
+                    )
+                    if max(new_memory) < peak:
+                        break
+
+                # Undo the rematerialization, which prunes the new nodes
+                for client, i, var in late_uses:
+                    fgraph.change_node_input(
+                        client, i, var, reason="rematerialize_revert"
+                    )
+                feature.after.pop(memo[out].owner, None)
+                recomputed.add(node)
+                nb_rejected += 1
+            else:
+                break
+
+            recomputed.add(node)
+            recomputed.update(new_nodes)
+            nb_rematerialized += 1
+            order, memory, last_use, origin = (
+                new_order,
+                new_memory,
+                new_last_use,
+                new_origin,
+            )
+            peak = max(memory)
+
+        return (
+            self,
+            peak_before,
+            peak,
+            memory_budget,
+            nb_rematerialized,
+            nb_rejected,
+        )
+
+    @classmethod
+    def print_profile(cls, stream, prof, level=0):
+        blanc = "    " * level
+        print(blanc, cls.__name__, file=stream)
+        if prof is None:
+            return
+        print(blanc, " peak_memory_before", prof[1], file=stream)
+        print(blanc, " peak_memory_after", prof[2], file=stream)
+        print(blanc, " memory_budget", prof[3], file=stream)
+        print(blanc, " nb_rematerialized", prof[4], file=stream)
+        print(blanc, " nb_rejected", prof[5], file=stream)
+
+
+optdb.register(
+    "rematerialize",
+    Rematerialize(),
+    "fast_run",
+    position=100.5,
+)
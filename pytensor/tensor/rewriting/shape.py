@@ -635,6 +635,10 @@ class ShapeFeature(Feature):
                     )
 
                 self.scheduled[shpnode] = new_r
+        self.update_shape_references(r, new_r)
+
+    def update_shape_references(self, r, new_r):
+        """Update the shapes that refer to `r`, which is replaced by `new_r`."""
         # In case 2, if r is a variable that we've scheduled for shape update,
         # then we should cancel it.
         unscheduled = [k for k, v in self.scheduled.items() if v == r]
@@ -726,11 +730,110 @@ class ShapeFeature(Feature):
         return type(self)()
 
 
+class _LazyShapeDict(dict):
+    """A ``shape_of`` dictionary that infers missing shapes on access."""
+
+    def __init__(self, shape_feature):
+        super().__init__()
+        self.shape_feature = shape_feature
+
+    def __missing__(self, var):
+        self.shape_feature.infer_shape_of(var)
+        return dict.__getitem__(self, var)
+
+    def get(self, var, default=None):
+        try:
+            return self[var]
+        except KeyError:
+            return default
+
+
+class LazyShapeFeature(ShapeFeature):
+    r"""A `ShapeFeature` that only infers the shapes rewrites ask for.
+
+    `ShapeFeature` calls ``infer_shape`` on every node that is imported in the
+    `FunctionGraph`, and keeps the resulting shape graphs in memory, even if
+    only a handful of them are ever used.  This `Feature` instead fills the
+    ``shape_of`` dictionary on access: the first lookup of a `Variable`
+    infers (and memoizes) the shapes of its ancestors that are still missing,
+    in topological order.
+
+    ``var in shape_of`` is only true for the shapes that were already inferred.
+
+    When a `Variable` whose shape was never inferred is replaced, there are
+    no shape graphs that depend on it, so the replacement doesn't force the
+    inference of any shape, unless it has `Shape_i` clients. The shape
+    information of such a `Variable` is then not merged into the shape of
+    its replacement, as `ShapeFeature` does.
+
+    """
+
+    def on_attach(self, fgraph):
+        super().on_attach(fgraph)
+        self.shape_of = _LazyShapeDict(self)
+
+    def on_import(self, fgraph, node, reason):
+        # Shapes are inferred when they are first requested
+        pass
+
+    def init_r(self, r):
+        if r not in self.shape_of:
+            self.infer_shape_of(r)
+
+    def infer_shape_of(self, var):
+        """Infer the shape of `var` and of its ancestors that don't have one yet."""
+        shape_of = self.shape_of
+        if var.owner is None:
+            self.set_shape(var, self.shape_tuple(var))
+            return
+
+        # Iterative post-order traversal, so that the inputs of a node always
+        # have a shape when we infer the shapes of its outputs.
+        order = []
+        seen = {var.owner}
+        stack = [(var.owner, iter(var.owner.inputs))]
+        while stack:
+            node, inputs = stack[-1]
+            for inp in inputs:
+                owner = inp.owner
+                if (
+                    owner is not None
+                    and owner not in seen
+                    and owner.outputs[0] not in shape_of
+                ):
+                    seen.add(owner)
+                    stack.append((owner, iter(owner.inputs)))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+        for node in order:
+            super().on_import(self.fgraph, node, reason="infer_shape_of")
+
+    def on_change_input(self, fgraph, node, i, r, new_r, reason):
+        if r in self.shape_of or any(
+            isinstance(client.op, Shape_i)
+            for client, _ in [*fgraph.clients[r], (node, i)]
+        ):
+            self.init_r(r)
+            super().on_change_input(fgraph, node, i, r, new_r, reason)
+        else:
+            self.update_shape_references(r, new_r)
+
+
 class ShapeOptimizer(GraphRewriter):
-    """Rewriter that adds `ShapeFeature` as a feature."""
+    """Rewriter that adds `ShapeFeature` as a feature.
+
+    A `LazyShapeFeature` is used instead when ``config.shape_feature__lazy``
+    is set.
+    """
 
     def add_requirements(self, fgraph):
-        fgraph.attach_feature(ShapeFeature())
+        if config.shape_feature__lazy:
+            fgraph.attach_feature(LazyShapeFeature())
+        else:
+            fgraph.attach_feature(ShapeFeature())
 
     def apply(self, fgraph):
         pass
@@ -171,6 +171,50 @@ class Cholesky(Op):
         else:
             return [grad]
 
+    def R_op(self, inputs, eval_points):
+        r"""Cholesky decomposition forward-mode update.
+
+        For :math:`A = L L^T`, :math:`dL = L \Phi(L^{-1} dA L^{-T})`, where
+        :math:`\Phi` extracts the lower triangle and halves the diagonal [#]_.
+        Like the decomposition itself, only the lower (or upper) triangle of
+        :math:`dA` is used.
+
+        References
+        ----------
+        .. [#] I. Murray, "Differentiation of the Cholesky decomposition",
+           http://arxiv.org/abs/1602.07527
+
+        """
+        (x,) = inputs
+        (dx,) = eval_points
+        if dx is None:
+            return [None]
+        chol_x = self(x)
+
+        # Replace the cholesky decomposition with the identity if there are nans
+        if self.on_error == "nan":
+            ok = ~ptm.any(ptm.isnan(chol_x))
+            chol_x = ptb.switch(ok, chol_x, ptb.eye(chol_x.shape[0]))
+
+        # Symmetrize the tangent from the triangle that is used, and deal with
+        # upper triangular by converting to lower triangular
+        if self.lower:
+            dx = ptb.tril(dx) + ptb.tril(dx, k=-1).T
+        else:
+            chol_x = chol_x.T
+            dx = ptb.triu(dx) + ptb.triu(dx, k=1).T
+
+        solve_lower = SolveTriangular(lower=True, b_ndim=2)
+        inner = solve_lower(chol_x, solve_lower(chol_x, dx).T)
+        dchol = chol_x.dot(ptb.tril(inner) - ptb.diag(ptb.diagonal(inner) / 2.0))
+
+        if not self.lower:
+            dchol = dchol.T
+        if self.on_error == "nan":
+            return [ptb.switch(ok, dchol, np.nan)]
+        else:
+            return [dchol]
+
     def inplace_on_inputs(self, allowed_inplace_inputs: list[int]) -> "Op":
         if not allowed_inplace_inputs:
             return self
@@ -345,6 +389,26 @@ class SolveBase(Op):
 
         return [A_bar, b_bar]
 
+    def R_op(self, inputs, eval_points):
+        r"""Forward-mode updates for matrix solve operation :math:`c = A^{-1} b`.
+
+        Differentiating :math:`A c = b` gives :math:`dc = A^{-1} (db - dA c)`.
+
+        """
+        A, b = inputs
+        A_dot, b_dot = eval_points
+        if A_dot is None and b_dot is None:
+            return [None]
+
+        if A_dot is None:
+            rhs = b_dot
+        else:
+            c = self(A, b)
+            A_dot_c = A_dot.dot(c)
+            rhs = -A_dot_c if b_dot is None else b_dot - A_dot_c
+
+        return [self(A, rhs)]
+
 
 def _default_b_ndim(b, b_ndim):
     if b_ndim is not None:
@@ -398,6 +462,10 @@ class CholeskySolve(SolveBase):
         # TODO: Base impl should work, let's try it
         raise NotImplementedError()
 
+    def R_op(self, *args, **kwargs):
+        # The base implementation doesn't apply, as `A` is a Cholesky factor
+        raise NotImplementedError()
+
     def inplace_on_inputs(self, allowed_inplace_inputs: list[int]) -> "Op":
         if 1 in allowed_inplace_inputs:
             new_props = self._props_dict()  # type: ignore
@@ -885,6 +953,14 @@ class SolveTriangular(SolveBase):
 
         return res
 
+    def R_op(self, inputs, eval_points):
+        A_dot, b_dot = eval_points
+        if A_dot is not None:
+            # Only the triangle of `A` that is used matters
+            k = 1 if self.unit_diagonal else 0
+            A_dot = ptb.tril(A_dot, k=-k) if self.lower else ptb.triu(A_dot, k=k)
+        return super().R_op(inputs, [A_dot, b_dot])
+
     def inplace_on_inputs(self, allowed_inplace_inputs: list[int]) -> "Op":
         if 1 in allowed_inplace_inputs:
             new_props = self._props_dict()  # type: ignore
@@ -1657,6 +1657,17 @@ def inc_subtensor(
         raise TypeError("x must be the result of a subtensor operation")
 
 
+def _inc_subtensor_tangents(inputs, eval_points):
+    """Return the tangents of the `x` and `y` inputs of an (advanced) `IncSubtensor` for its `R_op`.
+
+    The one that doesn't depend on the `wrt` of `Rop`, if any, has zero tangents.
+    """
+    return [
+        inp.zeros_like() if ev is None else ev
+        for inp, ev in zip(inputs[:2], eval_points[:2], strict=True)
+    ]
+
+
 class IncSubtensor(COp):
     """
     Increment a subtensor.
@@ -2005,11 +2016,12 @@ class IncSubtensor(COp):
         return [shapes[0]]
 
     def R_op(self, inputs, eval_points):
-        if eval_points[0] is None or eval_points[1] is None:
+        if eval_points[0] is None and eval_points[1] is None:
             return [None]
         # Again we ignore eval points for indices because incsubtensor is
         # not differentiable wrt to those
-        return self(eval_points[0], eval_points[1], *inputs[2:], return_list=True)
+        x_tangent, y_tangent = _inc_subtensor_tangents(inputs, eval_points)
+        return self(x_tangent, y_tangent, *inputs[2:], return_list=True)
 
     def connection_pattern(self, node):
         rval = [[True], [True], *([False] for _ in node.inputs[2:])]
@@ -2729,9 +2741,10 @@ class AdvancedIncSubtensor1(COp):
         return [x]
 
     def R_op(self, inputs, eval_points):
-        if None in eval_points[:2]:
+        if eval_points[0] is None and eval_points[1] is None:
             return [None]
-        return self.make_node(eval_points[0], eval_points[1], *inputs[2:]).outputs
+        x_tangent, y_tangent = _inc_subtensor_tangents(inputs, eval_points)
+        return self.make_node(x_tangent, y_tangent, *inputs[2:]).outputs
 
     def connection_pattern(self, node):
         rval = [[True], [True], [False]]
@@ -3065,9 +3078,10 @@ class AdvancedIncSubtensor(Op):
         return rval
 
     def R_op(self, inputs, eval_points):
-        if None in eval_points[:2]:
+        if eval_points[0] is None and eval_points[1] is None:
             return [None]
-        return self.make_node(eval_points[0], eval_points[1], *inputs[2:]).outputs
+        x_tangent, y_tangent = _inc_subtensor_tangents(inputs, eval_points)
+        return self.make_node(x_tangent, y_tangent, *inputs[2:]).outputs
 
     def grad(self, inpt, output_gradients):
         x, y = inpt[:2]
@@ -81,6 +81,9 @@ def shape_of_variables(
         fgraph.attach_feature(ShapeFeature())
 
     shape_feature = fgraph.shape_feature  # type: ignore[attr-defined]
+    # A `LazyShapeFeature` only has the shapes that were requested so far
+    for var in fgraph.variables:
+        shape_feature.init_r(var)
 
     input_dims = [
         dimension for inp in fgraph.inputs for dimension in shape_feature.shape_of[inp]
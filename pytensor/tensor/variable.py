@@ -26,6 +26,8 @@ _TensorTypeType = TypeVar("_TensorTypeType", bound=TensorType)
 
 
 class _tensor_py_operators:
+    __slots__ = ()
+
     # These can't work because Python requires native output types
     def __bool__(self):
         raise TypeError(
@@ -881,6 +883,8 @@ class TensorVariable(
 
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         type: _TensorTypeType,
@@ -938,7 +942,10 @@ TensorType.variable_type = TensorVariable
 class TensorConstantSignature(tuple):
     r"""A signature object for comparing `TensorConstant` instances.
 
-    An instance is a pair with the type ``(Type, ndarray)``.
+    An instance is a pair with the type ``(Type, ndarray)``. The values
+    computed from the array (e.g. its sum and hash) are cached, and
+    `TensorConstant.signature` returns the same instance every time, so that
+    they're only computed once per constant.
 
     TODO FIXME: Subclassing `tuple` is unnecessary, and it appears to be
     preventing the use of a much more convenient `__init__` that removes the
@@ -963,6 +970,14 @@ class TensorConstantSignature(tuple):
         if t0 != t1 or d0.shape != d1.shape:
             return False
 
+        if d0 is d1:
+            return True
+        # Equal digests imply equal data, unequal digests don't imply unequal
+        # data (e.g. `-0.0 == 0.0`)
+        h0 = getattr(self, "_pytensor_hash", None)
+        if h0 is not None and h0 == getattr(other, "_pytensor_hash", None):
+            return True
+
         self.no_nan  # Ensure has_nan is computed.
         # Note that in the comparisons below, the elementwise comparisons
         # come last because they are the most expensive checks.
@@ -993,8 +1008,12 @@ class TensorConstantSignature(tuple):
         return hash((type(self), t, d.shape, self.sum))
 
     def pytensor_hash(self):
-        _, d = self
-        return hash_from_ndarray(d)
+        try:
+            return self._pytensor_hash
+        except AttributeError:
+            _, d = self
+            self._pytensor_hash = hash_from_ndarray(d)
+        return self._pytensor_hash
 
     @property
     def sum(self):
@@ -1058,6 +1077,8 @@ def get_unique_constant_value(x: TensorVariable) -> Number | None:
 class TensorConstant(TensorVariable, Constant[_TensorTypeType]):
     """Subclass to add the tensor operators to the basic `Constant` class."""
 
+    __slots__ = ("_signature", "_unique_value")
+
     def __init__(self, type: _TensorTypeType, data, name=None):
         data_shape = np.shape(data)
 
@@ -1078,7 +1099,11 @@ class TensorConstant(TensorVariable, Constant[_TensorTypeType]):
         Constant.__init__(self, new_type, data, name)
 
     def signature(self):
-        return TensorConstantSignature((self.type, self.data))
+        try:
+            return self._signature
+        except AttributeError:
+            self._signature = TensorConstantSignature((self.type, self.data))
+        return self._signature
 
     @property
     def unique_value(self) -> Number | None:
@@ -919,7 +919,11 @@ class XTensorConstant(XTensorVariable, Constant[_XTensorTypeType]):
         Constant.__init__(self, type, data, name)
 
     def signature(self):
-        return XTensorConstantSignature((self.type, self.data))
+        try:
+            return self._signature
+        except AttributeError:
+            self._signature = XTensorConstantSignature((self.type, self.data))
+        return self._signature
 
 
 XTensorType.variable_type = XTensorVariable  # type: ignore
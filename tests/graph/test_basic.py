@@ -1,9 +1,15 @@
+import os
 import pickle
+import subprocess
+import sys
+import tracemalloc
 from itertools import count
+from pathlib import Path
 
 import numpy as np
 import pytest
 
+import pytensor
 from pytensor import shared
 from pytensor import tensor as pt
 from pytensor.compile import UnusedInputError
@@ -21,6 +27,7 @@ from pytensor.graph.basic import (
     explicit_graph_inputs,
     general_toposort,
     get_var_by_name,
+    graph_hash,
     graph_inputs,
     io_toposort,
     orphans_between,
@@ -31,6 +38,7 @@ from pytensor.graph.basic import (
 )
 from pytensor.graph.op import Op
 from pytensor.graph.type import Type
+from pytensor.graph.utils import MissingInputError
 from pytensor.printing import debugprint
 from pytensor.tensor import constant
 from pytensor.tensor.math import max_and_argmax
@@ -463,6 +471,69 @@ def test_equal_computations():
     assert equal_computations(max_argmax1, max_argmax2)
 
 
+def test_graph_hash():
+    def build(x, y):
+        return pt.exp(x).sum(0) + y * 2 + pt.constant(np.arange(3.0))
+
+    x, y = matrix("x"), vector("y")
+    out = build(x, y)
+    h = graph_hash(out)
+
+    # Names and identities don't matter
+    assert graph_hash(build(matrix("a"), vector("b"))) == h
+    assert graph_hash([out]) == graph_hash(out, [x, y]) == h
+    # Input order, ops, types and constant values do
+    assert graph_hash(out, [y, x]) != h
+    assert graph_hash(pt.log(x).sum(0) + y * 2 + np.arange(3.0)) != h
+    assert graph_hash(build(matrix("x", dtype="float32"), y)) != h
+    assert graph_hash(pt.exp(x).sum(0) + y * 2 + np.arange(1.0, 4.0)) != h
+    assert graph_hash(x + np.zeros((0, 1))) != graph_hash(x + np.zeros((0, 2)))
+    # Shared subgraphs don't hash like distinct inputs
+    assert graph_hash(x + x) != graph_hash(x + matrix())
+
+    # Per-variable digests can be reused
+    digests = {}
+    assert graph_hash(out, [x, y], digests) == h
+    assert x in digests and out in digests
+    assert graph_hash(out, [x, y], digests) == h
+
+    with pytest.raises(MissingInputError):
+        graph_hash(out, [x])
+
+    a, b = NominalVariable(0, x.type), NominalVariable(1, x.type)
+    assert graph_hash(a + b) == graph_hash(a + b, [])
+    assert graph_hash(a + b, []) != graph_hash(b + a, [])
+
+    inner_x = pt.scalar("inner_x")
+    op1 = MyInnerGraphOp([inner_x], [inner_x + 1])
+    op2 = MyInnerGraphOp([inner_x], [inner_x * 2])
+    s = pt.scalar()
+    assert graph_hash(op1(s)) == graph_hash(op1(s))
+    assert graph_hash(op1(s)) != graph_hash(op2(s))
+
+
+def test_graph_hash_stable_across_processes():
+    code = (
+        "import numpy as np; import pytensor.tensor as pt;"
+        "from pytensor.graph.basic import graph_hash;"
+        "x = pt.matrix('x');"
+        "print(graph_hash(pt.exp(x).sum(0) + x.shape[0] + np.arange(3.0)))"
+    )
+    hashes = set()
+    for seed in ("0", "1"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [str(Path(pytensor.__file__).parents[1]), env.get("PYTHONPATH", "")]
+        )
+        hashes.add(
+            subprocess.check_output([sys.executable, "-c", code], env=env).strip()
+        )
+
+    x = matrix("x")
+    local_hash = graph_hash(pt.exp(x).sum(0) + x.shape[0] + np.arange(3.0))
+    assert hashes == {local_hash.encode()}
+
+
 def test_walk():
     r1, r2, r3 = MyVariable(1), MyVariable(2), MyVariable(3)
     o1 = MyOp(r1, r2)
@@ -681,6 +752,88 @@ def test_clone_get_equiv():
     assert equal_computations([memo[b]], [z + 1.0])
 
 
+def chain_graph(n):
+    x = vector("x")
+    out = x
+    for _ in range(n):
+        out = pt.exp(out) * x
+    return x, out
+
+
+def test_slots_and_lazy_tags():
+    x, out = chain_graph(2)
+    node = out.owner
+    assert not hasattr(out, "__dict__")
+    assert not hasattr(node, "__dict__")
+    assert not hasattr(constant(1.0), "__dict__")
+    assert node._tag is None
+
+    cloned = node.clone()
+    assert cloned._tag is None
+    node.tag.info = "info"
+    assert node.clone().tag.info == "info"
+
+    out.tag.test_value = [1.0]
+    assert isinstance(out.tag.test_value, np.ndarray)
+
+    x_unpickled, out_unpickled = pickle.loads(pickle.dumps((x, out)))
+    assert out_unpickled.name == out.name
+    assert out_unpickled.auto_name == out.auto_name
+    assert out_unpickled.owner.tag.info == "info"
+    assert np.array_equal(out_unpickled.tag.test_value, [1.0])
+    assert equal_computations([out_unpickled], [out], [x_unpickled], [x])
+
+    # Subclasses without `__slots__` still get a `__dict__`
+    class MyVariable(TensorVariable):
+        pass
+
+    var = MyVariable(x.type, None)
+    var.extra = 1
+    assert var.extra == 1
+
+
+def test_clone_get_equiv_benchmark(benchmark):
+    x, out = chain_graph(5000)
+    equiv = benchmark(clone_get_equiv, [x], [out])
+    assert equiv[out] is not out
+
+
+def lattice_graph(depth, width):
+    """Build a layered graph in which each node reads two nodes of the previous layer."""
+    layer = [MyVariable(1) for _ in range(width)]
+    inputs = list(layer)
+    for _ in range(depth):
+        layer = [
+            Apply(MyOp, [layer[i], layer[(i + 1) % width]], [MyVariable(1)]).outputs[0]
+            for i in range(width)
+        ]
+    return inputs, layer
+
+
+def test_io_toposort_benchmark(benchmark):
+    inputs, outputs = lattice_graph(200, 100)
+    order = benchmark(io_toposort, inputs, outputs)
+    assert len(order) == 200 * 100
+
+
+def test_clone_get_equiv_lattice_benchmark(benchmark):
+    inputs, outputs = lattice_graph(200, 100)
+    equiv = benchmark(clone_get_equiv, inputs, outputs)
+    assert all(equiv[out] is not out for out in outputs)
+
+
+def test_graph_memory_benchmark(benchmark):
+    tracemalloc.start()
+    try:
+        _, out = chain_graph(1000)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["bytes_per_node"] = size // 2000
+
+    benchmark(chain_graph, 1000)
+
+
 def test_NominalVariable():
     type1 = MyType(1)
 
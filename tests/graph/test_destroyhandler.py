@@ -1,10 +1,11 @@
 from copy import copy
 
+import numpy as np
 import pytest
 
 from pytensor.configdefaults import config
 from pytensor.graph.basic import Apply, Constant, Variable, clone
-from pytensor.graph.destroyhandler import DestroyHandler
+from pytensor.graph.destroyhandler import DestroyHandler, _contains_cycle
 from pytensor.graph.features import ReplaceValidate
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.op import Op
@@ -460,3 +461,42 @@ def test_multiple_inplace():
     ).rewrite(g)
     assert g.consistent()
     assert fail.failures == 1
+
+
+@pytest.mark.skipif(
+    config.cycle_detection == "fast", reason="Only used by regular cycle detection"
+)
+def test_incremental_cycle_detection_matches_full_check():
+    rng = np.random.default_rng(2291)
+    x, y, z = inputs()
+    out = x
+    for i in range(30):
+        op = [sigmoid, transpose_view][i % 2]
+        out = add(op(out), y if i % 3 else z)
+    g = create_fgraph([x, y, z], [out])
+    dh = g.destroy_handler
+
+    n_checks = n_cycles = 0
+    for _ in range(300):
+        nodes = [n for n in g.apply_nodes if n.op in (add, add_in_place)]
+        node = nodes[rng.integers(len(nodes))]
+        variables = list(g.variables)
+        new = variables[rng.integers(len(variables))]
+        new_node = (add_in_place if rng.random() < 0.5 else add)(new, node.inputs[1])
+
+        chk = g.checkpoint()
+        g.replace(node.outputs[0], new_node, reason="test")
+        try:
+            ords = dh.orderings(g, ordered=False)
+        except InconsistencyError:
+            g.revert(chk)
+            continue
+        expected = _contains_cycle(g, ords)
+        assert dh._contains_cycle(g, ords) == expected
+        n_checks += 1
+        n_cycles += expected
+        if expected or len(g.apply_nodes) < 20:
+            g.revert(chk)
+
+    assert n_checks > 100
+    assert n_cycles > 0
@@ -5,7 +5,7 @@ import numpy as np
 import pytest
 
 from pytensor.configdefaults import config
-from pytensor.graph.basic import NominalVariable
+from pytensor.graph.basic import NominalVariable, graph_hash
 from pytensor.graph.fg import FunctionGraph, Output
 from pytensor.graph.utils import MissingInputError
 from pytensor.printing import debugprint
@@ -726,6 +726,90 @@ class TestFunctionGraph:
         assert nm in fg.variables
         assert nm2 in fg.variables
 
+    def test_structural_hash(self):
+        var1 = MyVariable("var1")
+        var2 = MyVariable("var2")
+        var3 = op1(var2, var1)
+        var4 = op2(var3, var2)
+        var5 = op3(var4, var2, var2)
+        fg = FunctionGraph([var1, var2], [var3, var5], clone=False)
+
+        h = fg.structural_hash()
+        assert h == graph_hash(fg.outputs, fg.inputs)
+        assert fg.structural_hash() == h
+        assert fg.clone().structural_hash() == h
+
+        feature = fg._structural_hash_feature
+        assert var5 in feature.digests
+
+        # Only the digests downstream of a replacement are invalidated
+        fg.replace(var4, op2(var2, var2))
+        assert var3 in feature.digests
+        assert var5 not in feature.digests
+        h2 = fg.structural_hash()
+        assert h2 != h
+        assert h2 == graph_hash(fg.outputs, fg.inputs)
+
+        fg.replace(var3, op1(var1, var2))
+        assert fg.structural_hash() == graph_hash(fg.outputs, fg.inputs)
+
+        fg.remove_input(0)
+        assert fg.structural_hash() == graph_hash(fg.outputs, fg.inputs)
+
+    def test_freeze(self):
+        var1 = MyVariable("var1")
+        var2 = MyVariable("var2")
+        const = MyConstant("const")
+        var3 = op1(var2, var1)
+        var4 = op2(var3, const)
+        var5 = op1(var4, var3)
+        fg = FunctionGraph([var1, var2], [var3, var5], clone=False)
+
+        snapshot = fg.freeze()
+        assert snapshot.nodes == tuple(fg.toposort())
+        assert snapshot.variables[:2] == (var1, var2)
+        assert set(snapshot.variables) == fg.variables
+        assert snapshot.outputs.tolist() == [
+            snapshot.variable_ids[var3],
+            snapshot.variable_ids[var5],
+        ]
+        assert not snapshot.input_ids.flags.writeable
+
+        for node_id, node in enumerate(snapshot.nodes):
+            assert snapshot.ops[snapshot.node_op[node_id]] == node.op
+            assert [
+                snapshot.variables[i] for i in snapshot.node_inputs(node_id)
+            ] == node.inputs
+            assert [
+                snapshot.variables[i] for i in snapshot.node_outputs(node_id)
+            ] == node.outputs
+
+        for var_id, var in enumerate(snapshot.variables):
+            assert snapshot.types[snapshot.variable_type[var_id]] == var.type
+            owner_id = snapshot.variable_owner[var_id]
+            assert (snapshot.nodes[owner_id] if owner_id >= 0 else None) is var.owner
+            client_ids, positions = snapshot.clients(var_id)
+            assert [
+                (snapshot.nodes[n], p)
+                for n, p in zip(client_ids, positions, strict=True)
+            ] == [c for c in fg.clients[var] if not isinstance(c[0].op, Output)]
+            assert snapshot.is_output[var_id] == (var in fg.outputs)
+
+        # The snapshot is cached until the graph changes
+        assert fg.freeze() is snapshot
+        fg.replace(var4, op2(var2, var2))
+        new_snapshot = fg.freeze()
+        assert new_snapshot is not snapshot
+        assert var4 not in new_snapshot.variable_ids
+        assert fg.freeze() is new_snapshot
+
+        fg.add_output(var2)
+        assert fg.freeze().is_output[fg.freeze().variable_ids[var2]]
+
+        # The cache isn't carried over to clones or pickles
+        assert fg.clone().freeze().variables[0] is not var1
+        assert pickle.loads(pickle.dumps(fg))._snapshot_feature.snapshot is None
+
     def test_dprint(self):
         r1, r2 = MyVariable("x"), MyVariable("y")
         o1 = op1(r1, r2)
@@ -6,11 +6,12 @@ import pytensor.graph.op as op
 import pytensor.tensor as pt
 from pytensor import shared
 from pytensor.configdefaults import config
-from pytensor.graph.basic import Apply, Variable
-from pytensor.graph.op import Op
+from pytensor.graph.basic import Apply, Variable, applys_between
+from pytensor.graph.op import Op, intern_nodes
 from pytensor.graph.type import Type
 from pytensor.graph.utils import TestValueError
 from pytensor.link.c.type import Generic
+from pytensor.tensor.inplace import exp_inplace
 from pytensor.tensor.math import log
 from pytensor.tensor.type import dmatrix, dscalar, dvector, vector
 
@@ -275,3 +276,47 @@ def test_call_name(multi_output):
 
         res_nameless = single_op(x)
         assert res_nameless.name is None
+
+
+def test_intern_nodes():
+    x = dvector("x")
+    sigma = dscalar("sigma")
+
+    with intern_nodes() as interner:
+        a = log(sigma) + (x - 1.0)
+        b = log(sigma) + (x - 1.0)
+        # Inplace nodes are never shared
+        c = pt.exp(x)
+        c_inplace = exp_inplace(c)
+        d_inplace = exp_inplace(c)
+
+    assert a is b
+    assert interner.hits >= 3
+    assert c_inplace is not d_inplace
+
+    # Outside of the context, nothing is shared anymore
+    assert log(sigma) is not log(sigma)
+    assert log(sigma) is not a.owner.inputs[0].owner.inputs[0]
+
+    with intern_nodes() as interner:
+        e = log(sigma) + (x - 1.0)
+    assert e is not a
+    assert interner.hits == 0
+
+
+def test_intern_nodes_benchmark(benchmark):
+    sigma = dscalar("sigma")
+    x = dvector("x")
+
+    def build():
+        terms = [-log(sigma) - 0.5 * ((x - 1.0) / sigma) ** 2 for _ in range(500)]
+        return pt.add(*terms).sum()
+
+    def interned_build():
+        with intern_nodes():
+            return build()
+
+    out = benchmark(interned_build)
+    n_nodes = len(list(applys_between([x, sigma], [out])))
+    assert n_nodes < len(list(applys_between([x, sigma], [build()]))) / 100
+    benchmark.extra_info["n_nodes"] = n_nodes
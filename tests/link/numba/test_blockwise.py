@@ -1,12 +1,12 @@
 import numpy as np
 import pytest
 
-from pytensor import function
+from pytensor import config, function
 from pytensor.tensor import tensor, tensor3
 from pytensor.tensor.basic import ARange
 from pytensor.tensor.blockwise import Blockwise, BlockwiseWithCoreShape
 from pytensor.tensor.nlinalg import SVD, Det
-from pytensor.tensor.slinalg import Cholesky, cholesky
+from pytensor.tensor.slinalg import Cholesky, Solve, cholesky
 from tests.link.numba.test_basic import compare_numba_and_py, numba_mode
 
 
@@ -35,6 +35,35 @@ def test_blockwise(core_op, shape_opt):
     )
 
 
+@pytest.mark.parametrize("core_op", [Det(), Cholesky(), SVD(compute_uv=True)], ids=str)
+def test_parallel_blockwise(core_op):
+    x = tensor(shape=(None, 3, None, None))
+    outs = Blockwise(core_op=core_op)(x, return_list=True)
+
+    rng = np.random.default_rng(38)
+    x_test = rng.normal(size=(2, 3, 3, 3))
+    x_test = x_test @ x_test.swapaxes(-1, -2) + np.eye(3)
+    with config.change_flags(numba__parallel_blockwise=True):
+        compare_numba_and_py([x], outs, [x_test], eval_obj_mode=False)
+
+
+def test_parallel_blockwise_broadcast():
+    a = tensor(shape=(None, 1, 3, 3))
+    b = tensor(shape=(None, 4, 3))
+    out = Blockwise(Solve(b_ndim=1))(a, b)
+
+    rng = np.random.default_rng(39)
+    a_test = rng.normal(size=(2, 1, 3, 3)) + 3 * np.eye(3)
+    b_test = rng.normal(size=(2, 4, 3))
+    with config.change_flags(numba__parallel_blockwise=True):
+        fn, _ = compare_numba_and_py(
+            [a, b], [out], [a_test, b_test], eval_obj_mode=False
+        )
+
+    with pytest.raises(ValueError, match="Incompatible Blockwise batch input shapes"):
+        fn(a_test, rng.normal(size=(3, 4, 3)))
+
+
 def test_non_square_blockwise():
     """Test that Op that cannot always be blockwised at runtime fails gracefully."""
     x = tensor(shape=(3,), dtype="int64")
@@ -9,11 +9,12 @@ import pytensor.tensor as pt
 import pytensor.tensor.inplace as pti
 import pytensor.tensor.math as ptm
 from pytensor import config, function
+from pytensor import scalar as ps
 from pytensor.compile import get_mode
 from pytensor.compile.ops import deep_copy_op
 from pytensor.gradient import grad
 from pytensor.scalar import Composite, float64
-from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise
+from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise, MapReduce
 from pytensor.tensor.math import All, Any, Max, Min, Prod, ProdWithoutZeros, Sum
 from pytensor.tensor.special import LogSoftmax, Softmax, SoftmaxGrad
 from tests.link.numba.test_basic import (
@@ -348,6 +349,31 @@ def test_CAReduce(careduce_fn, axis, v):
     assert isinstance(node.op, CAReduce)
 
 
+@pytest.mark.parametrize("epilogue", (False, True), ids=["no_epilogue", "epilogue"])
+@pytest.mark.parametrize("axis", [None, 0, 1, (0, 2)])
+@pytest.mark.parametrize(
+    "scalar_op", [ps.add, ps.mul, ps.scalar_maximum], ids=["add", "mul", "max"]
+)
+def test_MapReduce(scalar_op, axis, epilogue):
+    a, b = float64("a"), float64("b")
+    prologue = Composite([a, b], [ps.sqr(a - b) + 1])
+    red_epilogue = Composite([a, b], [ps.log(a) + b]) if epilogue else None
+    map_reduce = MapReduce(scalar_op, prologue, red_epilogue, axis=axis)
+
+    x = pt.tensor3("x", dtype="float64")
+    y = pt.tensor3("y", shape=(None, 1, None), dtype="float64")
+    x_val = rng.normal(size=(4, 3, 2))
+    y_val = rng.uniform(0.5, 1.5, size=(4, 1, 2))
+    if epilogue:
+        z_val = rng.normal(size=np.sum(x_val, axis=axis).shape)
+        z = pt.tensor("z", shape=(None,) * z_val.ndim, dtype="float64")
+        inputs, test_inputs = [x, y, z], [x_val, y_val, z_val]
+    else:
+        inputs, test_inputs = [x, y], [x_val, y_val]
+
+    compare_numba_and_py(inputs, [map_reduce(*inputs)], test_inputs)
+
+
 def test_scalar_Elemwise_Clip():
     a = pt.scalar("a")
     b = pt.scalar("b")
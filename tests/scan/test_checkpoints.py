@@ -1,12 +1,14 @@
 import numpy as np
 import pytest
 
+import pytensor.tensor as pt
 from pytensor.compile.function import function
+from pytensor.configdefaults import config
 from pytensor.gradient import grad
 from pytensor.scan.basic import scan
-from pytensor.scan.checkpoints import scan_checkpoints
+from pytensor.scan.checkpoints import checkpoint_schedule, scan_checkpoints
 from pytensor.tensor.basic import arange, ones_like
-from pytensor.tensor.type import iscalar, vector
+from pytensor.tensor.type import iscalar, matrix, vector
 
 
 class TestScanCheckpoint:
@@ -50,3 +52,135 @@ class TestScanCheckpoint:
         # Test that an error rises if we use taps in outputs_info.
         with pytest.raises(RuntimeError):
             scan_checkpoints(lambda: None, [], {"initial": self.A, "taps": [-2]})
+
+
+@pytest.mark.parametrize(
+    "n_steps, checkpoints, segment_lengths",
+    [
+        (10, 20, ()),
+        (37, 12, (16, 4)),
+        (50, 11, (27, 9, 3)),
+        (100_000, 100, (5832, 324, 18)),
+    ],
+)
+def test_checkpoint_schedule(n_steps, checkpoints, segment_lengths):
+    schedule = checkpoint_schedule(n_steps, checkpoints)
+    assert schedule.segment_lengths == segment_lengths
+    assert schedule.n_snapshots <= checkpoints
+    # Each step is recomputed once per level of segments, and once more by the
+    # gradient of the last level
+    assert schedule.recompute_factor <= len(segment_lengths) + 1
+
+
+def test_checkpoint_schedule_errors():
+    with pytest.raises(ValueError, match="At least 2"):
+        checkpoint_schedule(10, 1)
+    with pytest.raises(ValueError, match="not enough"):
+        checkpoint_schedule(37, 9)
+
+
+class TestCheckpointedGrad:
+    n_steps = 37
+
+    def setup_method(self):
+        self.x0 = vector("x0", shape=(3,))
+        self.y0 = matrix("y0", shape=(2, 3))
+        self.W = matrix("W", shape=(3, 3))
+        self.seq = matrix("seq", shape=(self.n_steps, 3))
+        self.inputs = [self.x0, self.y0, self.W, self.seq]
+        rng = np.random.default_rng(2081)
+        self.values = [
+            (rng.normal(size=inp.type.shape) / 2).astype(config.floatX)
+            for inp in self.inputs
+        ]
+
+    def grads(self, n_steps, **kwargs):
+        def step(s, y2, y1, x, W):
+            x_new = pt.tanh(x @ W + s)
+            return pt.sin(y2) / 2 + y1 * x, x_new, (x_new**2).sum()
+
+        (ys, xs, zs), _ = scan(
+            step,
+            sequences=[self.seq],
+            outputs_info=[{"initial": self.y0, "taps": [-2, -1]}, self.x0, None],
+            non_sequences=[self.W],
+            n_steps=n_steps,
+            **kwargs,
+        )
+        cost = xs.sum() + (ys**2).sum() + zs[::3].sum()
+        return grad(cost, self.inputs)
+
+    @pytest.mark.parametrize("checkpoints", [11, 12, 40])
+    def test_static_n_steps(self, checkpoints):
+        ref = function(self.inputs, self.grads(self.n_steps))
+        fn = function(self.inputs, self.grads(self.n_steps, checkpoints=checkpoints))
+        for res, expected in zip(fn(*self.values), ref(*self.values), strict=True):
+            np.testing.assert_allclose(res, expected, rtol=1e-5)
+
+    @pytest.mark.parametrize("n_steps", [1, 5, 37])
+    def test_symbolic_n_steps(self, n_steps):
+        n = iscalar("n")
+        ref = function([*self.inputs, n], self.grads(n))
+        fn = function([*self.inputs, n], self.grads(n, checkpoints=4))
+        for res, expected in zip(
+            fn(*self.values, n_steps), ref(*self.values, n_steps), strict=True
+        ):
+            np.testing.assert_allclose(res, expected, rtol=1e-5)
+
+    def test_checkpoints_memory(self):
+        state_nbytes = 3 * 3 * np.dtype(config.floatX).itemsize
+        ref = function(self.inputs, self.grads(self.n_steps, checkpoints=12))
+        fn = function(
+            self.inputs,
+            self.grads(self.n_steps, checkpoints_memory=12 * state_nbytes),
+        )
+        for res, expected in zip(fn(*self.values), ref(*self.values), strict=True):
+            np.testing.assert_allclose(res, expected, rtol=1e-5)
+
+        with pytest.raises(ValueError, match="Only one of"):
+            self.grads(self.n_steps, checkpoints=12, checkpoints_memory=1000)
+
+    def test_unsupported(self):
+        x0 = vector("x0")
+
+        def truncated_grad(**kwargs):
+            xs, _ = scan(
+                lambda x: x * 2,
+                outputs_info=[x0],
+                n_steps=10,
+                truncate_gradient=5,
+                **kwargs,
+            )
+            return grad(xs.sum(), x0)
+
+        # Truncated gradients fall back to the regular gradient
+        with pytest.warns(UserWarning, match="can't use checkpoints"):
+            g = truncated_grad(checkpoints=4)
+        x0_val = np.ones(2, dtype=config.floatX)
+        np.testing.assert_allclose(
+            g.eval({x0: x0_val}), truncated_grad().eval({x0: x0_val})
+        )
+
+
+@pytest.mark.parametrize("checkpoints", (None, 100), ids=["store_all", "checkpoints"])
+def test_checkpointed_grad_benchmark(checkpoints, benchmark):
+    n_steps = 2_000
+    x0 = vector("x0", shape=(64,))
+    W = matrix("W", shape=(64, 64))
+    xs, _ = scan(
+        lambda x, W: pt.tanh(x @ W),
+        outputs_info=[x0],
+        non_sequences=[W],
+        n_steps=n_steps,
+        checkpoints=checkpoints,
+    )
+    fn = function([x0, W], grad(xs[-1].sum(), W))
+
+    rng = np.random.default_rng(2081)
+    x0_val = rng.normal(size=64).astype(config.floatX)
+    W_val = (rng.normal(size=(64, 64)) / 8).astype(config.floatX)
+    benchmark(fn, x0_val, W_val)
+    if checkpoints is not None:
+        schedule = checkpoint_schedule(n_steps, checkpoints)
+        benchmark.extra_info["recompute_factor"] = schedule.recompute_factor
+        benchmark.extra_info["n_snapshots"] = schedule.n_snapshots
@@ -21,6 +21,7 @@ from pytensor.tensor import (
     vectorize,
 )
 from pytensor.tensor.blas import BatchedDot
+from pytensor.tensor.blockwise import Blockwise
 from pytensor.tensor.elemwise import DimShuffle
 from pytensor.tensor.rewriting.blas import (
     _as_scalar,
@@ -91,6 +92,29 @@ def test_specialize_matmul_to_batched_dot(aligned):
     )
 
 
+@pytest.mark.skipif(
+    config.mode == "FAST_COMPILE", reason="Test requires specialization rewrites"
+)
+def test_specialize_blockwise_batched_dot():
+    x = tensor("x", shape=(2, None, 3, 4))
+    y = tensor("y", shape=(2, None, 4, 5))
+    out = Blockwise(BatchedDot())(x, y)
+
+    fn = function([x, y], out)
+    nodes = fn.maker.fgraph.apply_nodes
+    assert not any(isinstance(node.op, Blockwise) for node in nodes)
+    assert sum(isinstance(node.op, BatchedDot) for node in nodes) == 1
+
+    rng = np.random.default_rng(43)
+    x_test = rng.normal(size=(2, 7, 3, 4)).astype(x.type.dtype)
+    y_test = rng.normal(size=(2, 7, 4, 5)).astype(y.type.dtype)
+    np.testing.assert_allclose(
+        fn(x_test, y_test),
+        x_test @ y_test,
+        rtol=1e-5 if config.floatX == "float32" else 1e-7,
+    )
+
+
 def test_gemm_factor():
     X, Y = matrix("X"), matrix("Y")
 
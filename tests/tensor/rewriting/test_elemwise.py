@@ -20,7 +20,7 @@ from pytensor.graph.rewriting.utils import rewrite_graph
 from pytensor.raise_op import assert_op
 from pytensor.scalar.basic import Composite, float64
 from pytensor.tensor.basic import MakeVector
-from pytensor.tensor.elemwise import DimShuffle, Elemwise
+from pytensor.tensor.elemwise import DimShuffle, Elemwise, MapReduce
 from pytensor.tensor.math import abs as pt_abs
 from pytensor.tensor.math import (
     add,
@@ -42,6 +42,7 @@ from pytensor.tensor.math import (
     mul,
     neg,
     neq,
+    prod,
     reciprocal,
     sin,
     sinh,
@@ -53,6 +54,7 @@ from pytensor.tensor.math import (
     xor,
 )
 from pytensor.tensor.math import all as pt_all
+from pytensor.tensor.math import max as pt_max
 from pytensor.tensor.math import pow as pt_pow
 from pytensor.tensor.math import round as pt_round
 from pytensor.tensor.math import sum as pt_sum
@@ -514,7 +516,8 @@ class TestFusion:
                 (fwx.sum()) + (fwx) + (fy + fz),
                 (fw, fx, fy, fz),
                 (fwv, fxv, fyv, fzv),
-                4,
+                # The sum of `fwx` is fused into a `MapReduce`
+                3,
                 (fwv + fxv).sum() + fwv + fxv + fyv + fzv,
                 "float32",
             ),
@@ -1253,7 +1256,6 @@ class TestFusion:
             if hasattr(out_node.op, "scalar_op")
         )
 
-    @pytest.mark.xfail(reason="Not implemented")
     @pytest.mark.parametrize("linker", ["cvm", "py"])
     @pytest.mark.parametrize("axis", [None, 0, 1, (0, 1), (0, 1, 2)])
     def test_CAReduce_multiple_inputs(self, linker, axis):
@@ -1261,7 +1263,7 @@ class TestFusion:
 
         mode = Mode(linker=linker)
         mode._optimizer = mode._optimizer.including(
-            "local_careduce_fusion",
+            "local_map_reduce_fusion",
             "canonicalize",
             "inplace",
         )
@@ -1271,9 +1273,14 @@ class TestFusion:
         out = (x + y).sum(axis=axis)
 
         out_fn = function([x, y], out, mode=mode)
-        (out_node,) = out_fn.maker.fgraph.toposort()
+        out_nodes = out_fn.maker.fgraph.toposort()
 
-        assert isinstance(getattr(out_node.op, "scalar_op"), ps.basic.Composite)
+        if linker != "py":
+            (out_node,) = out_nodes
+            assert isinstance(out_node.op, MapReduce)
+            assert isinstance(out_node.op.scalar_op, ps.Add)
+        else:
+            assert not any(isinstance(node.op, MapReduce) for node in out_nodes)
 
         rng = np.random.default_rng(2320)
         x_val = rng.random((4, 3, 2), dtype=config.floatX)
@@ -1283,6 +1290,90 @@ class TestFusion:
         assert out_val.shape == exp_res.shape
         assert np.allclose(out_val, exp_res)
 
+    @pytest.mark.parametrize("linker", ["cvm", "py"])
+    @pytest.mark.parametrize(
+        "careduce_op, numpy_op, fused",
+        [
+            (pt_sum, np.sum, True),
+            (prod, np.prod, True),
+            # `Max` must fail on empty inputs, which `MapReduce` doesn't do
+            (pt_max, np.max, False),
+        ],
+    )
+    @pytest.mark.parametrize("axis", [None, 0, 1, (0, 2)])
+    def test_CAReduce_epilogue(self, linker, careduce_op, numpy_op, fused, axis):
+        """Make sure that the `Elemwise` applied to a reduction is fused into the `MapReduce`."""
+        mode = Mode(linker=linker, optimizer=get_default_mode().optimizer)
+
+        out_ndim = 0 if axis is None else 3 - len(np.atleast_1d(axis))
+        x = tensor(dtype="float64", shape=(None, None, None), name="x")
+        y = tensor(dtype="float64", shape=(None, None, None), name="y")
+        z = tensor(dtype="float64", shape=(None,) * out_ndim, name="z")
+        out = log(careduce_op(exp(x) * y, axis=axis)) + z
+
+        out_fn = function([x, y, z], out, mode=mode)
+        map_reduce_nodes = [
+            node
+            for node in out_fn.maker.fgraph.toposort()
+            if isinstance(node.op, MapReduce)
+        ]
+        if linker == "py" or not fused:
+            assert not map_reduce_nodes
+        else:
+            [map_reduce_node] = map_reduce_nodes
+            assert map_reduce_node.op.epilogue is not None
+            assert map_reduce_node.outputs[0] in out_fn.maker.fgraph.outputs
+
+        rng = np.random.default_rng(2320)
+        x_val = rng.random((4, 3, 2))
+        y_val = rng.random((4, 3, 2)) + 0.5
+        exp_red = numpy_op(np.exp(x_val) * y_val, axis=axis)
+        z_val = rng.random(np.shape(exp_red))
+        np.testing.assert_allclose(out_fn(x_val, y_val, z_val), np.log(exp_red) + z_val)
+
+    def test_CAReduce_epilogue_broadcast(self):
+        """An `Elemwise` that broadcasts the reduction isn't fused into the `MapReduce`."""
+        x = matrix("x")
+        y = matrix("y")
+        out = exp((x * y).sum(axis=1, keepdims=True) + x)
+
+        out_fn = function([x, y], out, mode=self.mode)
+        [map_reduce_node] = [
+            n for n in out_fn.maker.fgraph.toposort() if isinstance(n.op, MapReduce)
+        ]
+        assert map_reduce_node.op.epilogue is None
+
+        rng = np.random.default_rng(2320)
+        x_val = rng.random((4, 3)).astype(x.type.dtype)
+        y_val = rng.random((4, 3)).astype(y.type.dtype)
+        np.testing.assert_allclose(
+            out_fn(x_val, y_val),
+            np.exp((x_val * y_val).sum(axis=1, keepdims=True) + x_val),
+            rtol=1e-5,
+        )
+
+    @pytest.mark.skipif(not config.cxx, reason="No cxx compiler")
+    @pytest.mark.parametrize("fuse", (False, True), ids=["unfused", "fused"])
+    def test_map_reduce_benchmark(self, fuse, benchmark):
+        rng = np.random.default_rng(123)
+        x = matrix("x", shape=(2000, 1000), dtype="float64")
+        w = matrix("w", shape=(2000, 1000), dtype="float64")
+        m = x.max(axis=1)
+        out = log(pt_sum(exp(x - m[:, None]) * w, axis=1)) + m
+
+        mode = get_default_mode().including("fusion")
+        if not fuse:
+            mode = mode.excluding("local_map_reduce_fusion")
+        fn = function([x, w], out, mode=mode, trust_input=True)
+        assert (
+            any(isinstance(n.op, MapReduce) for n in fn.maker.fgraph.apply_nodes)
+            == fuse
+        )
+
+        x_val = rng.normal(size=(2000, 1000))
+        w_val = rng.random((2000, 1000))
+        benchmark(fn, x_val, w_val)
+
     def test_not_fusing_broadcasted_subgraphs(self):
         """Test that broadcasted Elemwise subgraphs are not fused in a single Elemwise Composite Op.
 
@@ -1356,7 +1447,7 @@ class TestFusion:
             nb_replacement = opt.apply(fg.clone())[2]
             return nb_replacement
 
-        assert benchmark(rewrite_func) == 103
+        assert benchmark(rewrite_func) == 102
 
     def test_no_warning_from_old_client(self):
         # There used to be a warning issued when creating fuseable mapping
@@ -2708,7 +2708,11 @@ class TestLocalSumProd:
     """Test sum/prod rewrites."""
 
     def setup_method(self):
-        self.mode = get_default_mode().including("canonicalize", "specialize")
+        self.mode = (
+            get_default_mode()
+            .including("canonicalize", "specialize")
+            .excluding("local_map_reduce_fusion")
+        )
 
     def test_local_sum_prod_of_scalar_mul(self):
         # Test the rewrite `local_sum_prod_mul_by_scalar` for both Sum and
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+import pytensor
+import pytensor.tensor as pt
+from pytensor import function
+from pytensor.graph.fg import FunctionGraph
+from pytensor.tensor.basic import Alloc
+from pytensor.tensor.elemwise import Elemwise
+from pytensor.tensor.rewriting.memory_order import PropagateMemoryOrder
+from pytensor.tensor.slinalg import Solve, solve
+from pytensor.tensor.type import matrix, vector
+
+
+pytestmark = pytest.mark.skipif(
+    not pytensor.config.cxx, reason="G++ not available, so we need to skip this test."
+)
+
+
+def memory_order(var):
+    return getattr(var.tag, "memory_order", None)
+
+
+def test_propagate_memory_order():
+    x = vector("x")
+    A = matrix("A")
+    row_col = pt.exp(x[:, None] - x[None, :])
+    full = pt.exp(A)
+    transposed = pt.exp(A + 1)
+    conflicting = pt.exp(A + 2)
+    alloc = pt.alloc(x, 3, x.shape[0])
+    outs = [
+        solve(row_col, x),
+        solve(full, alloc, b_ndim=2),
+        solve(transposed.T, x),
+        solve(conflicting, x),
+        solve(conflicting.T, x),
+    ]
+    fg = FunctionGraph([x, A], outs, clone=False)
+    PropagateMemoryOrder().rewrite(fg)
+
+    assert memory_order(row_col) == "F"
+    assert memory_order(full) == "F"
+    assert memory_order(alloc) == "F"
+    assert memory_order(transposed) is None
+    assert memory_order(conflicting) is None
+
+
+def test_fortran_outputs():
+    x = vector("x")
+    y = vector("y")
+    M = matrix("M")
+    # The inputs of the elemwise and the value of the alloc are broadcasted
+    K = pt.exp(-((x[:, None] - x[None, :]) ** 2)) + pt.eq(x[:, None], x[None, :])
+    B = pt.alloc(y[:, None], y.shape[0], 3)
+
+    fn = function([x, y, M], [solve(K, y), solve(M, B, b_ndim=2), K, B])
+    [K_node] = [
+        node
+        for node in fn.maker.fgraph.apply_nodes
+        if isinstance(node.op, Elemwise) and node.outputs[0].ndim == 2
+    ]
+    [B_node] = [
+        node for node in fn.maker.fgraph.apply_nodes if isinstance(node.op, Alloc)
+    ]
+    assert memory_order(K_node.outputs[0]) == "F"
+    assert memory_order(B_node.outputs[0]) == "F"
+
+    rng = np.random.default_rng(2090)
+    x_val = rng.normal(size=(5,)).astype(x.dtype)
+    y_val = rng.normal(size=(5,)).astype(y.dtype)
+    M_val = rng.normal(size=(5, 5)).astype(M.dtype) + 5 * np.eye(5, dtype=M.dtype)
+    for _ in range(2):
+        res, res_B, K_res, B_res = fn(x_val, y_val, M_val)
+        assert K_res.flags.f_contiguous and not K_res.flags.c_contiguous
+        assert B_res.flags.f_contiguous and not B_res.flags.c_contiguous
+
+    K_val = np.exp(-((x_val[:, None] - x_val[None, :]) ** 2)) + np.eye(5)
+    B_val = np.repeat(y_val[:, None], 3, axis=1)
+    atol = 1e-3 if x.dtype == "float32" else 1e-8
+    np.testing.assert_allclose(K_res, K_val)
+    np.testing.assert_allclose(B_res, B_val)
+    np.testing.assert_allclose(res, np.linalg.solve(K_val, y_val), atol=atol)
+    np.testing.assert_allclose(res_B, np.linalg.solve(M_val, B_val), atol=atol)
+
+
+def test_fortran_output_of_c_ordered_inputs():
+    A = matrix("A")
+    x = vector("x")
+    A2 = pt.exp(A) + x
+    fn = function([A, x], [solve(A2, x), A2])
+    [solve_node] = [
+        node for node in fn.maker.fgraph.apply_nodes if isinstance(node.op, Solve)
+    ]
+    assert memory_order(solve_node.inputs[0]) == "F"
+
+    rng = np.random.default_rng(2091)
+    A_val = rng.normal(size=(4, 4)).astype(A.dtype)
+    x_val = rng.normal(size=(4,)).astype(x.dtype)
+
+    # Writing a C ordered input in fortran order wouldn't be free
+    _, A2_res = fn(A_val, x_val)
+    assert A2_res.flags.c_contiguous and not A2_res.flags.f_contiguous
+
+    _, A2_res = fn(np.asfortranarray(A_val), x_val)
+    assert A2_res.flags.f_contiguous and not A2_res.flags.c_contiguous
+    np.testing.assert_allclose(A2_res, np.exp(A_val) + x_val, rtol=1e-6)
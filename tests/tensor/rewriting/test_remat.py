@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+import pytensor
+import pytensor.tensor as pt
+from pytensor import function
+from pytensor.compile.mode import get_default_mode
+from pytensor.configdefaults import config
+from pytensor.graph.fg import FunctionGraph
+from pytensor.tensor.random.basic import NormalRV
+from pytensor.tensor.random.type import random_generator_type
+from pytensor.tensor.rewriting.remat import Rematerialize, estimate_peak_memory
+from pytensor.tensor.type import matrix
+
+
+def mlp_grad(n_layers=8, n=64):
+    x = matrix("x", shape=(n, n))
+    ws = [matrix(f"w{i}", shape=(n, n)) for i in range(n_layers)]
+    h = x
+    for w in ws:
+        h = pt.tanh(h @ w)
+    return [x, *ws], pytensor.grad((h**2).sum(), ws)
+
+
+def test_estimate_peak_memory():
+    x = pt.vector("x", shape=(100,))
+    y = pt.exp(x)
+    z = pt.log(y)
+    fg = FunctionGraph([x], [z.T * 2], clone=False)
+    itemsize = np.dtype(config.floatX).itemsize
+    # `y` is freed after `z` is computed
+    assert estimate_peak_memory(fg) == 200 * itemsize
+
+    # Variables with unknown sizes are ignored
+    x = pt.vector("x")
+    fg = FunctionGraph([x], [pt.exp(x)])
+    assert estimate_peak_memory(fg) == 0
+
+
+class TestRematerialize:
+    mode = get_default_mode().including("fast_run")
+
+    def fgraphs(self, memory_budget):
+        inputs, outputs = mlp_grad()
+        ref = function(inputs, outputs, mode=self.mode.excluding("rematerialize"))
+        with config.change_flags(rematerialize__memory_budget=memory_budget):
+            fn = function(inputs, outputs, mode=self.mode)
+        return inputs, ref, fn
+
+    def test_peak_memory(self):
+        inputs, ref, _ = self.fgraphs(0)
+        peak = estimate_peak_memory(ref.maker.fgraph)
+
+        _, _, fn = self.fgraphs(peak // 2)
+        fgraph = fn.maker.fgraph
+        assert estimate_peak_memory(fgraph) < peak
+        # Each forward node is recomputed at most once
+        assert len(fgraph.apply_nodes) < 2 * len(ref.maker.fgraph.apply_nodes)
+
+        rng = np.random.default_rng(2081)
+        values = [
+            (rng.normal(size=inp.type.shape) / 4).astype(config.floatX)
+            for inp in inputs
+        ]
+        for res, expected in zip(fn(*values), ref(*values), strict=True):
+            np.testing.assert_allclose(res, expected, rtol=1e-5)
+
+    def test_disabled(self):
+        _, ref, fn = self.fgraphs(0)
+        assert len(fn.maker.fgraph.apply_nodes) == len(ref.maker.fgraph.apply_nodes)
+
+    def test_within_budget(self):
+        inputs, outputs = mlp_grad()
+        fg = FunctionGraph(inputs, outputs)
+        n_nodes = len(fg.apply_nodes)
+        peak = estimate_peak_memory(fg)
+        Rematerialize(peak).rewrite(fg)
+        assert len(fg.apply_nodes) == n_nodes
+
+    def test_random_variables(self):
+        x = matrix("x", shape=(64, 64))
+        rng = random_generator_type("rng")
+        noise = pt.random.normal(size=(64, 64), rng=rng)
+        h = x
+        for _ in range(4):
+            h = pt.tanh(h @ x + noise)
+        g = pytensor.grad((h**2).sum(), x)
+
+        fg = FunctionGraph([x, rng], [g], clone=False)
+        n_nodes = len(fg.apply_nodes)
+        Rematerialize(estimate_peak_memory(fg) // 2).rewrite(fg)
+        assert len(fg.apply_nodes) > n_nodes
+        assert sum(isinstance(node.op, NormalRV) for node in fg.apply_nodes) == 1
+
+
+@pytest.mark.parametrize("rematerialize", (False, True), ids=["keep", "recompute"])
+def test_rematerialize_benchmark(rematerialize, benchmark):
+    inputs, outputs = mlp_grad(n_layers=16, n=128)
+    mode = get_default_mode().including("fast_run")
+    fn = function(inputs, outputs, mode=mode.excluding("rematerialize"))
+    peak = estimate_peak_memory(fn.maker.fgraph)
+    if rematerialize:
+        with config.change_flags(rematerialize__memory_budget=peak // 2):
+            fn = function(inputs, outputs, mode=mode)
+
+    rng = np.random.default_rng(2081)
+    values = [
+        (rng.normal(size=inp.type.shape) / 8).astype(config.floatX) for inp in inputs
+    ]
+    benchmark(fn, *values)
+    benchmark.extra_info["peak_memory"] = int(estimate_peak_memory(fn.maker.fgraph))
+    benchmark.extra_info["n_nodes"] = len(fn.maker.fgraph.apply_nodes)
@@ -20,6 +20,7 @@ from pytensor.tensor.elemwise import DimShuffle, Elemwise
 from pytensor.tensor.math import add, exp, maximum
 from pytensor.tensor.rewriting.basic import register_specialize
 from pytensor.tensor.rewriting.shape import (
+    LazyShapeFeature,
     ShapeFeature,
     local_reshape_to_dimshuffle,
     local_useless_reshape,
@@ -593,6 +594,64 @@ class TestSameShape:
             shape_feature.same_shape(x, o, 0, 1)
 
 
+class TestLazyShapeFeature:
+    def test_infer_on_access(self):
+        x = matrix("x")
+        y = vector("y")
+        a = exp(x).T
+        b = exp(y)
+        fgraph = FunctionGraph([x, y], [a, b], clone=False)
+        shape_feature = LazyShapeFeature()
+        fgraph.attach_feature(shape_feature)
+        assert not shape_feature.shape_of
+
+        a_shape = shape_feature.shape_of[a]
+        # Only the ancestors of `a` were inferred
+        assert a.owner.inputs[0] in shape_feature.shape_of
+        assert x in shape_feature.shape_of
+        assert b not in shape_feature.shape_of
+        assert y not in shape_feature.shape_of
+
+        eager_fgraph = FunctionGraph([x, y], [a, b], clone=False)
+        eager_shape_feature = ShapeFeature()
+        eager_fgraph.attach_feature(eager_shape_feature)
+        assert equal_computations(a_shape, eager_shape_feature.shape_of[a])
+        assert equal_computations(
+            shape_feature.shape_of.get(b), eager_shape_feature.shape_of[b]
+        )
+
+    def test_replacement(self):
+        n = lscalar("n")
+        x = alloc(0.0, n, 3)
+        fgraph = FunctionGraph([n], [x], clone=False)
+        shape_feature = LazyShapeFeature()
+        fgraph.attach_feature(shape_feature)
+        assert shape_feature.shape_of[x][0] is n
+
+        new_n = n + 1
+        fgraph.replace(n, new_n, import_missing=True)
+        assert shape_feature.shape_of[x][0] is new_n
+
+        # Replacing a variable whose shape was never requested doesn't infer it
+        y = exp(fgraph.outputs[0])
+        fgraph.add_output(y)
+        new_y = exp(fgraph.outputs[0] + 1)
+        fgraph.replace(y, new_y)
+        assert new_y not in shape_feature.shape_of
+
+    def test_rewrite(self):
+        x = matrix("x")
+        out = exp(x).shape[0] + pt.log(x).shape[1]
+        with config.change_flags(shape_feature__lazy=True):
+            f = function([x], out, mode=rewrite_mode)
+        topo = f.maker.fgraph.toposort()
+        # The shapes of `exp(x)` and `log(x)` no longer need them to be computed
+        assert not any(
+            isinstance(node.op, Elemwise) and node.outputs[0].ndim == 2 for node in topo
+        )
+        assert f(np.zeros((2, 3), dtype=config.floatX)) == 5
+
+
 def test_useless_specify_shape():
     x = tensor("x", shape=(None, 5, 3))
 
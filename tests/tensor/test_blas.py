@@ -2554,6 +2554,45 @@ def test_batched_dot_blas_flags():
     np.testing.assert_allclose(fn(x_test, y_test), x_test @ y_test)
 
 
+@pytest.mark.skipif(
+    not config.blas__ldflags, reason="BatchedDot C code requires BLAS flags"
+)
+@pytest.mark.parametrize("openmp", (False, True))
+def test_batched_dot_c(openmp):
+    rng = np.random.default_rng(2538)
+    x = tensor3("x")
+    y = tensor3("y")
+    with config.change_flags(openmp_elemwise_minsize=0):
+        fn = function(
+            [x, y],
+            BatchedDot(openmp=openmp)(x, y),
+            mode=Mode(linker="c", optimizer=None),
+        )
+
+    x_test = rng.normal(size=(50, 4, 3)).astype(x.type.dtype)
+    y_test = rng.normal(size=(50, 3, 5)).astype(y.type.dtype)
+    # Batches with zero or negative strides aren't copied
+    for x_val, y_val in [
+        (x_test, y_test),
+        (np.broadcast_to(x_test[0], x_test.shape), y_test[::-1]),
+        (x_test.transpose(0, 2, 1)[::2].swapaxes(1, 2), y_test[::2]),
+    ]:
+        utt.assert_allclose(fn(x_val, y_val), np.matmul(x_val, y_val))
+
+
+@pytest.mark.parametrize("openmp", (False, True))
+def test_batched_dot_benchmark(openmp, benchmark):
+    rng = np.random.default_rng(2563)
+    x = tensor3("x")
+    y = tensor3("y")
+    fn = function([x, y], BatchedDot(openmp=openmp)(x, y), trust_input=True)
+
+    x_test = rng.normal(size=(10_000, 8, 8)).astype(x.type.dtype)
+    y_test = rng.normal(size=(10_000, 8, 8)).astype(y.type.dtype)
+    utt.assert_allclose(fn(x_test, y_test), np.matmul(x_test, y_test))
+    benchmark(fn, x_test, y_test)
+
+
 def test_batched_tensordot():
     rng = np.random.default_rng(unittest_tools.fetch_seed())
     first = tensor4("first")
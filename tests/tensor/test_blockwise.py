@@ -9,6 +9,7 @@ import pytensor
 from pytensor import In, config, function, scan
 from pytensor.compile import get_default_mode, get_mode
 from pytensor.compile.function.types import add_supervisor_to_fgraph
+from pytensor.compile.mode import Mode
 from pytensor.gradient import grad
 from pytensor.graph import Apply, FunctionGraph, Op, rewrite_graph
 from pytensor.graph.replace import vectorize_graph, vectorize_node
@@ -24,7 +25,7 @@ from pytensor.tensor import (
     vector,
 )
 from pytensor.tensor.blockwise import Blockwise, vectorize_node_fallback
-from pytensor.tensor.nlinalg import MatrixInverse
+from pytensor.tensor.nlinalg import Eigh, MatrixInverse, eigh
 from pytensor.tensor.rewriting.blas import specialize_matmul_to_batched_dot
 from pytensor.tensor.signal import convolve1d
 from pytensor.tensor.slinalg import (
@@ -515,6 +516,41 @@ def test_small_blockwise_performance(benchmark):
     benchmark(fn, a_test, b_test)
 
 
+@pytest.mark.skipif(
+    not config.cxx, reason="G++ not available, so we need to skip this test."
+)
+def test_c_code():
+    a = tensor("a", shape=(None, 1, None))
+    b = tensor("b", shape=(None, 3, None))
+    out = convolve1d(a, b, mode="valid")
+    fn = function([a, b], [out, out.sum()], mode=Mode(linker="c"))
+    assert any(isinstance(node.op, Blockwise) for node in fn.maker.fgraph.apply_nodes)
+
+    rng = np.random.default_rng(537)
+    a_test = rng.normal(size=(2, 1, 13))
+    b_test = rng.normal(size=(2, 3, 4))
+    # The outputs are reused in the second call
+    for _ in range(2):
+        res, res_sum = fn(a_test, b_test)
+        expected = [
+            [np.convolve(a_test[i, 0], b_test[i, j], mode="valid") for j in range(3)]
+            for i in range(2)
+        ]
+        np.testing.assert_allclose(res, expected)
+        np.testing.assert_allclose(res_sum, np.sum(expected))
+
+    # Non-contiguous batches
+    np.testing.assert_allclose(
+        fn(a_test[::-1], b_test.transpose(0, 2, 1)[..., ::2, :].swapaxes(1, 2))[0],
+        fn(a_test[::-1].copy(), b_test[:, :, ::2].copy())[0],
+    )
+
+    with pytest.raises(ValueError, match="Runtime broadcasting not allowed"):
+        fn(a_test, b_test[:1])
+    with pytest.raises(ValueError, match="Incompatible Blockwise batch input shapes"):
+        fn(a_test, rng.normal(size=(3, 3, 4)))
+
+
 def test_cop_with_params():
     matrix_assert = Blockwise(core_op=assert_op, signature="(x1,x2),()->(x1,x2)")
 
@@ -577,6 +613,40 @@ class TestInplace:
             atol=1e-5 if config.floatX == "float32" else 0,
         )
 
+    @pytest.mark.parametrize("is_batched", (False, True))
+    def test_eigh(self, is_batched):
+        X = tensor("X", shape=(5, None, None) if is_batched else (None, None))
+        w, v = eigh(X)
+        f = function([In(X, mutable=True)], [w, v])
+
+        assert not v.owner.op.core_op.destroy_map
+
+        [eigh_op] = [
+            node.op.core_op if isinstance(node.op, Blockwise) else node.op
+            for node in f.maker.fgraph.apply_nodes
+            if isinstance(getattr(node.op, "core_op", node.op), Eigh)
+        ]
+        assert eigh_op.destroy_map == {1: [0]}
+
+        rng = np.random.default_rng(483 + is_batched)
+        X_val = rng.normal(size=(10, 10)).astype(config.floatX)
+        X_val_in = X_val @ X_val.T
+        if is_batched:
+            X_val_in = np.broadcast_to(X_val_in, (5, *X_val_in.shape)).copy()
+        # LAPACK can only overwrite matrices in Fortran order
+        X_val_in = np.swapaxes(np.swapaxes(X_val_in, -1, -2).copy(), -1, -2)
+        X_val_in_copy = X_val_in.copy()
+
+        w_res, v_res = f(X_val_in)
+
+        atol = 1e-4 if config.floatX == "float32" else 1e-8
+        np.testing.assert_allclose(w_res, np.linalg.eigvalsh(X_val_in_copy), atol=atol)
+        np.testing.assert_allclose(
+            X_val_in_copy @ v_res, v_res * w_res[..., None, :], atol=atol
+        )
+        # The eigenvectors were written in the input
+        np.testing.assert_allclose(X_val_in, v_res)
+
     @pytest.mark.parametrize("batched_A", (False, True))
     @pytest.mark.parametrize("batched_b", (False, True))
     @pytest.mark.parametrize("solve_fn", (solve, solve_triangular, cho_solve))
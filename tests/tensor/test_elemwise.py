@@ -22,8 +22,9 @@ from pytensor.link.c.basic import CLinker, OpWiseCLinker
 from pytensor.npy_2_compat import numpy_maxdims
 from pytensor.scalar import ScalarOp, float32, float64, int32, int64
 from pytensor.tensor import as_tensor_variable
+from pytensor.tensor import elemwise_cgen as cgen
 from pytensor.tensor.basic import get_scalar_constant_value, second
-from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise
+from pytensor.tensor.elemwise import CAReduce, DimShuffle, Elemwise, MapReduce
 from pytensor.tensor.math import Any, Sum, exp
 from pytensor.tensor.math import all as pt_all
 from pytensor.tensor.math import any as pt_any
@@ -685,6 +686,142 @@ class TestCAReduce(unittest_tools.InferShapeTester):
                 Mode(linker="c"), ps.scalar_maximum, dtype=dtype, test_nan=True
             )
 
+    @pytest.mark.skipif(
+        not pytensor.config.cxx,
+        reason="G++ not available, so we need to skip this test.",
+    )
+    @pytest.mark.parametrize(
+        "scalar_op, dtype",
+        [
+            (ps.add, "float64"),
+            (ps.mul, "float64"),
+            (ps.scalar_maximum, "float64"),
+            (ps.scalar_minimum, "int32"),
+            (ps.and_, "bool"),
+            (ps.or_, "bool"),
+        ],
+    )
+    @pytest.mark.parametrize("axis", [None, 0, 1, (0, 2), (1, 2)])
+    @pytest.mark.parametrize("c_contiguous", [True, False])
+    def test_c_openmp(self, scalar_op, dtype, axis, c_contiguous):
+        rng = np.random.default_rng(2083)
+        if dtype == "bool":
+            x_val = rng.random((7, 11, 13)) > 0.01
+        elif dtype == "int32":
+            x_val = rng.integers(-100, 100, size=(7, 11, 13)).astype(dtype)
+        else:
+            x_val = rng.uniform(0.9, 1.1, size=(7, 11, 13))
+        transpose_axis = (0, 1, 2) if c_contiguous else (2, 0, 1)
+
+        x = tensor3("x", dtype=dtype)
+        out = self.op(scalar_op, axis=axis, openmp=True)(x.transpose(transpose_axis))
+        with config.change_flags(openmp_elemwise_minsize=10):
+            fn = function([x], out, mode=Mode(linker="c", optimizer=None))
+        [node] = [n for n in fn.maker.fgraph.apply_nodes if isinstance(n.op, CAReduce)]
+        assert node.op.openmp
+
+        nfunc = {
+            ps.add: np.sum,
+            ps.mul: np.prod,
+            ps.scalar_maximum: np.max,
+            ps.scalar_minimum: np.min,
+            ps.and_: np.all,
+            ps.or_: np.any,
+        }[scalar_op]
+        np.testing.assert_allclose(
+            fn(x_val), nfunc(x_val.transpose(transpose_axis), axis=axis), rtol=1e-12
+        )
+
+    @pytest.mark.skipif(
+        not pytensor.config.cxx,
+        reason="G++ not available, so we need to skip this test.",
+    )
+    @pytest.mark.parametrize("axis", [None, 0, (1, 2)])
+    def test_c_openmp_fused(self, axis):
+        # The partial results of a reduction fused with an `Elemwise` by
+        # `local_careduce_fusion` are combined with its reduction `Op`
+        acc = ps.float64("acc")
+        x_scalar = ps.float64("x")
+        composite = ps.Composite([acc, x_scalar], [ps.add(acc, ps.exp(x_scalar))])
+        composite.identity = ps.add.identity
+        composite.nin = 2
+        composite.nout = 1
+
+        x = tensor3("x", dtype="float64")
+        out = self.op(composite, axis=axis, openmp=True)(x)
+        with config.change_flags(openmp_elemwise_minsize=10):
+            fn = function([x], out, mode=Mode(linker="c", optimizer=None))
+
+        x_val = np.random.default_rng(2084).normal(size=(7, 11, 13))
+        np.testing.assert_allclose(fn(x_val), np.exp(x_val).sum(axis=axis))
+
+    @pytest.mark.skipif(
+        not pytensor.config.cxx,
+        reason="G++ not available, so we need to skip this test.",
+    )
+    @pytest.mark.parametrize("axis", [None, 0, 2, (0, 2)])
+    @pytest.mark.parametrize("c_contiguous", [True, False])
+    def test_c_openmp_map_reduce(self, axis, c_contiguous):
+        x_scalar = ps.float64("x")
+        y_scalar = ps.float64("y")
+        prologue = ps.Composite([x_scalar, y_scalar], [ps.exp(x_scalar) * y_scalar])
+        red_scalar = ps.float64("red")
+        z_scalar = ps.float64("z")
+        epilogue = ps.Composite([red_scalar, z_scalar], [ps.log(red_scalar) + z_scalar])
+        transpose_axis = (0, 1, 2) if c_contiguous else (2, 0, 1)
+
+        rng = np.random.default_rng(2085)
+        x_val = rng.uniform(0.5, 1, size=(7, 11, 13))
+        y_val = rng.uniform(0.5, 1, size=(7, 11, 13))
+        expected_red = (
+            np.exp(x_val.transpose(transpose_axis)) * y_val.transpose(transpose_axis)
+        ).sum(axis=axis)
+        z_val = rng.normal(size=expected_red.shape)
+
+        x = tensor3("x", dtype="float64")
+        y = tensor3("y", dtype="float64")
+        z = tensor("z", dtype="float64", shape=(None,) * z_val.ndim)
+        out = MapReduce(ps.add, prologue, epilogue, axis=axis, openmp=True)(
+            x.transpose(transpose_axis), y.transpose(transpose_axis), z
+        )
+        with config.change_flags(openmp_elemwise_minsize=10):
+            fn = function([x, y, z], out, mode=Mode(linker="c", optimizer=None))
+
+        np.testing.assert_allclose(
+            fn(x_val, y_val, z_val), np.log(expected_red) + z_val, rtol=1e-12
+        )
+
+    @pytest.mark.skipif(
+        not pytensor.config.cxx,
+        reason="G++ not available, so we need to skip this test.",
+    )
+    @pytest.mark.parametrize(
+        "scalar_op, dtype",
+        [(ps.add, "float64"), (ps.scalar_maximum, "float64"), (ps.and_, "bool")],
+    )
+    @pytest.mark.parametrize("axis", [0, 1, (0, 1), 2, (0, 2)])
+    @pytest.mark.parametrize("c_contiguous", [True, False])
+    def test_c_blocked(self, scalar_op, dtype, axis, c_contiguous):
+        # The innermost loop has more iterations than `BLOCK_SIZE`, so
+        # reductions over the outer axes are split in blocks
+        shape = (3, 2, cgen.BLOCK_SIZE + 5)
+        rng = np.random.default_rng(2090)
+        if dtype == "bool":
+            x_val = rng.random(shape) > 0.01
+        else:
+            x_val = rng.normal(size=shape)
+        transpose_axis = (0, 1, 2) if c_contiguous else (2, 0, 1)
+        x_val = np.ascontiguousarray(x_val.transpose(transpose_axis)).transpose(
+            np.argsort(transpose_axis)
+        )
+
+        x = tensor3("x", dtype=dtype)
+        out = self.op(scalar_op, axis=axis)(x)
+        fn = function([x], out, mode=Mode(linker="c", optimizer=None))
+
+        nfunc = {ps.add: np.sum, ps.scalar_maximum: np.max, ps.and_: np.all}[scalar_op]
+        np.testing.assert_allclose(fn(x_val), nfunc(x_val, axis=axis), rtol=1e-12)
+
     def test_infer_shape(self, dtype=None, pre_scalar_op=None):
         if dtype is None:
             dtype = pytensor.config.floatX
@@ -832,6 +969,30 @@ class TestElemwise(unittest_tools.InferShapeTester):
         g = pytensor.function([a, b, c, d, e, f], s, mode=Mode(linker="py"))
         g(*[np.zeros(2**11, config.floatX) for i in range(6)])
 
+    @pytest.mark.skipif(
+        not pytensor.config.cxx,
+        reason="G++ not available, so we need to skip this test.",
+    )
+    @pytest.mark.parametrize("openmp", [False, True])
+    def test_c_tiled(self, openmp):
+        # Transposed inputs are accessed with large strides in the innermost
+        # loop, so the two innermost loops, longer than `TILE_SIZE`, are tiled
+        n = cgen.TILE_SIZE
+        rng = np.random.default_rng(2091)
+        x_val = rng.normal(size=(2, n + 7, 2 * n + 3))
+        y_val = rng.normal(size=(2, 2 * n + 3, n + 7))
+        z_val = rng.normal(size=(2 * n + 3,))
+
+        x = tensor3("x")
+        y = tensor3("y")
+        z = vector("z")
+        out = Elemwise(ps.add, openmp=openmp)(x, y.transpose(0, 2, 1), z)
+        with config.change_flags(openmp_elemwise_minsize=1):
+            fn = function([x, y, z], out, mode=Mode(linker="c", optimizer=None))
+        np.testing.assert_array_equal(
+            fn(x_val, y_val, z_val), x_val + y_val.transpose(0, 2, 1) + z_val
+        )
+
     def test_runtime_broadcast_python(self):
         check_elemwise_runtime_broadcast(Mode(linker="py"))
 
@@ -965,6 +1126,129 @@ class TestElemwise(unittest_tools.InferShapeTester):
 
         np.testing.assert_array_equal(f(x1, y1), np_op.outer(x1, y1))
 
+    def test_perform_output_storage(self):
+        x = matrix("x", dtype="float64")
+        node = exp(x).owner
+        x_val = np.random.default_rng(2081).normal(size=(3, 4))
+
+        # A buffer with the right shape and dtype is reused
+        buffer = np.empty((3, 4))
+        storage = [[buffer]]
+        node.op.perform(node, [x_val], storage)
+        assert storage[0][0] is buffer
+        np.testing.assert_allclose(buffer, np.exp(x_val))
+
+        # Otherwise a new one is allocated
+        for buffer in (np.empty((4, 3)), np.empty((3, 4), dtype="float32")):
+            storage = [[buffer]]
+            node.op.perform(node, [x_val], storage)
+            assert storage[0][0] is not buffer
+            assert storage[0][0].dtype == "float64"
+            np.testing.assert_allclose(storage[0][0], np.exp(x_val))
+
+    def test_perform_inplace(self):
+        x = vector("x", dtype="float64")
+        y = vector("y", dtype="float64")
+        node = Elemwise(ps.add, inplace_pattern={0: 1})(x, y).owner
+        x_val = np.arange(3.0)
+        y_val = np.ones(3)
+        storage = [[None]]
+        node.op.perform(node, [x_val, y_val], storage)
+        assert storage[0][0] is y_val
+        np.testing.assert_allclose(y_val, [1, 2, 3])
+
+    def test_perform_discrete_output(self):
+        # The ufunc computes in float64, the output is cast like before
+        x = vector("x", dtype="float64")
+        node = Elemwise(ps.Cast(ps.int8))(x).owner
+        storage = [[None]]
+        node.op.perform(node, [np.array([1.7, -2.2])], storage)
+        assert storage[0][0].dtype == "int8"
+        np.testing.assert_array_equal(storage[0][0], [1, -2])
+
+    def test_perform_many_operands(self):
+        xs = vectors(*(f"x{i}" for i in range(40)))
+        scalars = [ps.float64(f"s{i}") for i in range(40)]
+        composite = ps.Composite(
+            scalars,
+            [ps.exp(ps.add(*scalars)) * scalars[0] - ps.constant(2.0)],
+        )
+        out = Elemwise(composite)(*xs)
+        fn = function(xs, out, mode=Mode(linker="py", optimizer=None))
+
+        rng = np.random.default_rng(2081)
+        values = [rng.normal(size=5) / 10 for _ in xs]
+        np.testing.assert_allclose(
+            fn(*values), np.exp(np.sum(values, axis=0)) * values[0] - 2
+        )
+
+
+@pytest.mark.parametrize("inplace", (False, True), ids=["new", "inplace"])
+def test_python_elemwise_benchmark(inplace, benchmark):
+    x = matrix("x", dtype="float64", shape=(512, 512))
+    y = matrix("y", dtype="float64", shape=(512, 512))
+    op = Elemwise(ps.add, inplace_pattern={0: 0} if inplace else {})
+    fn = function(
+        [In(x, mutable=inplace), y],
+        Out(op(x, y), borrow=True),
+        mode=Mode(linker="py", optimizer=None),
+        accept_inplace=True,
+    )
+    rng = np.random.default_rng(2081)
+    x_val = rng.normal(size=(512, 512))
+    y_val = rng.normal(size=(512, 512))
+    benchmark(fn, x_val, y_val)
+
+
+@pytest.mark.parametrize(
+    "broadcast", ("none", "row", "column"), ids=lambda x: f"broadcast={x}"
+)
+@pytest.mark.parametrize(
+    "c_contiguous", (True, False), ids=lambda x: f"c_contiguous={x}"
+)
+def test_c_fused_elemwise_benchmark(broadcast, c_contiguous, benchmark):
+    x = matrix("x")
+    w = matrix("w")
+    y = {
+        "none": matrix("y"),
+        "row": tensor("y", shape=(1, None)),
+        "column": tensor("y", shape=(None, 1)),
+    }[broadcast]
+    # Cheap arithmetic operations, so that the loop itself is measured
+    out = (x * y + w * 2 - x) * (w - 1.5)
+    fn = function([x, y, w], out, mode="FAST_RUN")
+    [node] = fn.maker.fgraph.apply_nodes
+    assert isinstance(node.op.scalar_op, ps.Composite)
+
+    rng = np.random.default_rng(2089)
+    x_val = rng.normal(size=(128, 512))
+    w_val = rng.normal(size=(128, 512))
+    y_val = rng.normal(
+        size=(1 if broadcast == "row" else 128, 1 if broadcast == "column" else 512)
+    )
+    if not c_contiguous:
+        x_val = x_val[:, ::-1]
+    np.testing.assert_allclose(
+        fn(x_val, y_val, w_val), (x_val * y_val + w_val * 2 - x_val) * (w_val - 1.5)
+    )
+    benchmark(fn, x_val, y_val, w_val)
+
+
+@pytest.mark.parametrize("transposed", (False, True), ids=lambda x: f"transposed={x}")
+def test_c_transposed_elemwise_benchmark(transposed, benchmark):
+    x = matrix("x")
+    y = matrix("y")
+    out = (x.T if transposed else x) + y
+    fn = function([x, y], out, mode="FAST_RUN")
+
+    rng = np.random.default_rng(2092)
+    x_val = rng.normal(size=(2048, 2048))
+    y_val = rng.normal(size=(2048, 2048))
+    np.testing.assert_allclose(
+        fn(x_val, y_val), (x_val.T if transposed else x_val) + y_val
+    )
+    benchmark(fn, x_val, y_val)
+
 
 def test_not_implemented_elemwise_grad():
     # Regression test for unimplemented gradient in an Elemwise Op.
@@ -1070,6 +1354,18 @@ def test_c_careduce_benchmark(axis, c_contiguous, benchmark):
     )
 
 
+@pytest.mark.parametrize("openmp", (False, True), ids=lambda x: f"openmp={x}")
+@pytest.mark.parametrize("axis", (0, 2, None), ids=lambda x: f"axis={x}")
+def test_c_careduce_openmp_benchmark(openmp, axis, benchmark):
+    with config.change_flags(openmp=openmp, openmp_elemwise_minsize=100_000):
+        careduce_benchmark_tester(
+            axis,
+            c_contiguous=True,
+            mode=Mode(linker="c").including("fast_run"),
+            benchmark=benchmark,
+        )
+
+
 def test_gradient_mixed_discrete_output_scalar_op():
     class MixedDtypeScalarOp(ScalarOp):
         def make_node(self, *inputs):
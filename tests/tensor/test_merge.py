@@ -1,11 +1,12 @@
 import numpy as np
 
 import pytensor.tensor.basic as ptb
-from pytensor.graph.basic import Apply, Variable
+from pytensor.graph.basic import Apply, Constant, Variable
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.op import Op
 from pytensor.graph.rewriting.basic import MergeOptimizer
 from pytensor.graph.type import Type
+from pytensor.tensor.type import matrix
 
 
 def is_variable(x):
@@ -90,3 +91,21 @@ def test_merge_with_weird_eq():
     node = next(iter(g.apply_nodes))
     assert len(node.inputs) == 2
     assert node.inputs[0] is node.inputs[1]
+
+
+def test_merge_large_constants_benchmark(benchmark):
+    x = matrix("x")
+    data = np.random.default_rng(0).normal(size=(1000, 1000))
+    consts = [ptb.constant(data.copy()) for _ in range(20)]
+    outs = [x + c * i for i, c in enumerate(consts)]
+
+    def merge():
+        fg = FunctionGraph([x], outs)
+        MergeOptimizer().rewrite(fg)
+        return fg
+
+    fg = benchmark(merge)
+    large_consts = [
+        v for v in fg.variables if isinstance(v, Constant) and v.type.ndim == 2
+    ]
+    assert len(large_consts) == 1
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+import pytensor
+import pytensor.scalar as ps
+from pytensor import config, function
+from pytensor.compile.mode import Mode
+from pytensor.tensor import openmp_tuning
+from pytensor.tensor.elemwise import CAReduce, Elemwise
+from pytensor.tensor.openmp_tuning import (
+    NEVER,
+    load_thresholds,
+    openmp_minsize,
+    save_thresholds,
+    threshold_key,
+    tune,
+)
+from pytensor.tensor.type import vector
+
+
+@pytest.fixture
+def thresholds_path(tmp_path, monkeypatch):
+    path = tmp_path / "openmp_thresholds.json"
+    monkeypatch.setattr(openmp_tuning, "thresholds_path", lambda: path)
+    monkeypatch.setenv("OMP_NUM_THREADS", "4")
+    return path
+
+
+def test_save_load_thresholds(thresholds_path):
+    assert load_thresholds() == {}
+
+    save_thresholds({threshold_key("elemwise", "Exp", "float64"): 1000})
+    save_thresholds({threshold_key("elemwise", "Add", "float64"): 5000}, n_threads=2)
+    save_thresholds({threshold_key("elemwise", "Add", "float64"): NEVER})
+    assert thresholds_path.exists()
+    assert load_thresholds() == {
+        "elemwise:Exp:float64": 1000,
+        "elemwise:Add:float64": NEVER,
+    }
+    assert load_thresholds(n_threads=2) == {"elemwise:Add:float64": 5000}
+    assert load_thresholds(n_threads=8) == {}
+
+
+def test_openmp_minsize(thresholds_path):
+    with config.change_flags(openmp_elemwise_minsize=200_000):
+        # Nothing was tuned
+        assert openmp_minsize([ps.exp], "float64") == 200_000
+
+        save_thresholds(
+            {
+                threshold_key("elemwise", "Add", "float64"): 50_000,
+                threshold_key("elemwise", "Exp", "float64"): 1000,
+                threshold_key("careduce", "Add", "float64"): 100_000,
+            }
+        )
+        assert openmp_minsize([ps.exp], "float64") == 1000
+        assert openmp_minsize([ps.exp], "float32") == 200_000
+        assert openmp_minsize([ps.log], "float64") == 200_000
+        assert openmp_minsize([], "float64", reduce_op=ps.add) == 100_000
+
+        # A `Composite` is as expensive as its most expensive operation
+        x = ps.float64("x")
+        y = ps.float64("y")
+        assert openmp_minsize([ps.Composite([x, y], [x + y])], "float64") == 50_000
+        assert (
+            openmp_minsize([ps.Composite([x, y], [ps.exp(x) + y])], "float64") == 1000
+        )
+
+        with config.change_flags(openmp_tuned_minsize=False):
+            assert openmp_minsize([ps.exp], "float64") == 200_000
+
+
+@pytest.mark.skipif(
+    not pytensor.config.cxx,
+    reason="G++ not available, so we need to skip this test.",
+)
+def test_tuned_c_code(thresholds_path):
+    save_thresholds(
+        {
+            threshold_key("elemwise", "Exp", "float64"): 10,
+            threshold_key("careduce", "Add", "float64"): 20,
+        }
+    )
+    x = vector("x", dtype="float64")
+    exp_out = Elemwise(ps.exp, openmp=True)(x)
+    sum_out = CAReduce(ps.add, axis=None, openmp=True)(x)
+    add_out = Elemwise(ps.add, openmp=True)(x, x)
+    with config.change_flags(openmp_elemwise_minsize=200_000):
+        assert exp_out.owner.op._openmp_minsize(exp_out.owner) == 10
+        assert sum_out.owner.op._openmp_minsize(sum_out.owner) == 20
+        assert add_out.owner.op._openmp_minsize(add_out.owner) == 200_000
+        assert ("openmp_minsize", 10) in exp_out.owner.op.c_code_cache_version_apply(
+            exp_out.owner
+        )
+
+        fn = function(
+            [x], [exp_out, sum_out, add_out], mode=Mode(linker="c", optimizer=None)
+        )
+    x_val = np.random.default_rng(2088).normal(size=(50,))
+    exp_res, sum_res, add_res = fn(x_val)
+    np.testing.assert_allclose(exp_res, np.exp(x_val))
+    np.testing.assert_allclose(sum_res, x_val.sum())
+    np.testing.assert_allclose(add_res, 2 * x_val)
+
+
+@pytest.mark.skipif(
+    not pytensor.config.cxx,
+    reason="G++ not available, so we need to skip this test.",
+)
+def test_tune(thresholds_path):
+    sizes = (16, 256)
+    thresholds = tune(dtypes=("float64",), sizes=sizes)
+    assert set(thresholds) == {
+        "elemwise:Add:float64",
+        "elemwise:Exp:float64",
+        "elemwise:Erfcx:float64",
+        "careduce:Add:float64",
+        "careduce:ScalarMaximum:float64",
+    }
+    assert all(threshold in (*sizes, NEVER) for threshold in thresholds.values())
+    assert load_thresholds() == thresholds
@@ -1,3 +1,4 @@
+import pickle
 import re
 from copy import copy
 
@@ -362,6 +363,29 @@ class TestTensorConstantSignature:
 
         assert hash(x_sig) == hash(y_sig)
 
+    def test_cached(self, mocker):
+        data = np.r_[1.0, -0.0, np.nan]
+        x = constant(data)
+        y = constant(np.r_[1.0, 0.0, np.nan])
+
+        x_sig = x.signature()
+        assert x.signature() is x_sig
+        assert hash(x_sig) == hash(y.signature())
+
+        hash_spy = mocker.spy(pytensor.tensor.variable, "hash_from_ndarray")
+        assert x_sig.pytensor_hash() == x_sig.pytensor_hash()
+        assert hash_spy.call_count == 1
+
+        # Values are compared when the digests differ
+        assert x_sig.pytensor_hash() != y.signature().pytensor_hash()
+        assert x_sig == y.signature()
+        assert x_sig == constant(data.copy()).signature()
+
+        # The cached signature isn't pickled
+        x_unpickled = pickle.loads(pickle.dumps(x))
+        assert not hasattr(x_unpickled, "_signature")
+        assert x_unpickled.signature() == x_sig
+
 
 class TestTensorInstanceMethods:
     def setup_method(self):
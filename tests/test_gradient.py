@@ -1,19 +1,23 @@
 import numpy as np
 import pytest
+import scipy.sparse
 from scipy.optimize import rosen_hess_prod
 
 import pytensor
 import pytensor.tensor.basic as ptb
 from pytensor import function
+from pytensor.compile.builders import OpFromGraph
 from pytensor.configdefaults import config
 from pytensor.gradient import (
     DisconnectedInputError,
     DisconnectedType,
     GradClip,
+    GradientError,
     GradScale,
     NullTypeGradError,
     Rop,
     UndefinedGrad,
+    _color_rows,
     disconnected_grad,
     disconnected_grad_,
     grad,
@@ -24,11 +28,16 @@ from pytensor.gradient import (
     hessian,
     hessian_vector_product,
     jacobian,
+    jacobian_sparsity,
+    memoize_grads,
+    numeric_grad,
+    sparse_jacobian,
     subgraph_grad,
+    verify_grad,
     zero_grad,
     zero_grad_,
 )
-from pytensor.graph.basic import Apply, graph_inputs
+from pytensor.graph.basic import Apply, ancestors, graph_inputs, io_toposort
 from pytensor.graph.null_type import NullType
 from pytensor.graph.op import Op
 from pytensor.scan.op import Scan
@@ -654,6 +663,113 @@ def test_known_grads():
             assert np.allclose(a, b)
 
 
+def test_grad_deep_graph():
+    # The gradient of graphs deeper than the recursion limit can be built
+    x = scalar("x")
+    out = x
+    for _ in range(1500):
+        out = tanh(out)
+    g = grad(out, x)
+    assert g.type == x.type
+    assert len(list(ancestors([g], blockers=[x]))) > 1500
+
+
+def test_grad_sums_terms_at_once():
+    x = vector("x")
+    cost = (exp(x) + sigmoid(x) + tanh(x)).sum()
+    g = grad(cost, x)
+    assert g.owner.op == add
+    assert len(g.owner.inputs) == 3
+
+    x_val = np.array([0.1, -0.5], dtype=x.type.dtype)
+    np.testing.assert_allclose(
+        g.eval({x: x_val}),
+        np.exp(x_val)
+        + np.exp(-x_val) / (1 + np.exp(-x_val)) ** 2
+        + 1
+        - np.tanh(x_val) ** 2,
+        rtol=1e-5,
+    )
+
+
+@pytest.mark.parametrize("graph", ["deep", "wide"])
+def test_grad_benchmark(graph, benchmark):
+    x = vector("x")
+    ws = [scalar(f"w{i}") for i in range(20)]
+    if graph == "deep":
+        out = x
+        for i in range(100):
+            out = tanh(out * ws[i % 20])
+        cost = out.sum()
+    else:
+        cost = add(*(exp(x * ws[i % 20]).sum() * ws[(i + 1) % 20] for i in range(100)))
+
+    grads = benchmark(grad, cost, [x, *ws])
+    benchmark.extra_info["n_nodes"] = len(list(io_toposort([x, *ws], grads)))
+
+
+class TestMemoizeGrads:
+    def test_reuse(self):
+        x = vector("x")
+        y = vector("y")
+        cost = (exp(x * y) + tanh(x)).sum()
+
+        with memoize_grads() as cache:
+            g_x = grad(cost, x)
+            g_x2, g_y = grad(cost, [x, y])
+            # Another key
+            g_x3 = grad(cost, x, consider_constant=[y])
+
+        assert g_x2 is g_x
+        assert g_x3 is not g_x
+        assert cache.hits == 1
+        assert len(cache) == 2
+        # Both gradients use the same adjoint of `exp(x * y)`
+        assert set(ancestors([g_x])) & set(ancestors([g_y])) - set(ancestors([cost]))
+
+        assert grad(cost, x) is not g_x
+        x_val = np.array([0.5, -1.0], dtype=x.type.dtype)
+        y_val = np.array([2.0, 0.3], dtype=y.type.dtype)
+        np.testing.assert_allclose(
+            g_y.eval({x: x_val, y: y_val}),
+            grad(cost, y).eval({x: x_val, y: y_val}),
+        )
+
+    def test_wrt_dependent_adjoints(self):
+        # The second output isn't a function of `x`, so its adjoint is
+        # disconnected when differentiating with respect to `x` only.  That
+        # must not be reused when differentiating with respect to `y`.
+        a = vector("a")
+        b = vector("b")
+        x = vector("x")
+        y = vector("y")
+        o1, o2 = OpFromGraph([a, b], [a * 2, b * 3])(x, y)
+        cost = (o1 + o2**2).sum()
+
+        with memoize_grads():
+            grad(cost, x)
+            g_y = grad(cost, y)
+
+        x_val = np.array([3.0, 4.0], dtype=x.type.dtype)
+        y_val = np.array([1.0, 2.0], dtype=y.type.dtype)
+        np.testing.assert_allclose(g_y.eval({x: x_val, y: y_val}), 18 * y_val)
+
+    def test_benchmark(self, benchmark):
+        x = vector("x")
+        ws = [scalar(f"w{i}") for i in range(10)]
+        out = x
+        for i in range(30):
+            out = tanh(out * ws[i % 10])
+        cost = out.sum()
+
+        def grads():
+            with memoize_grads():
+                return [grad(cost, w) for w in ws]
+
+        g = benchmark(grads)
+        benchmark.extra_info["n_nodes"] = len(list(io_toposort([x, *ws], g)))
+
+
 def test_dxdx():
     # Tests that the gradient of a scalar with respect to itself is 1
     # I use an integer in this case because people keep changing this
@@ -1162,6 +1278,93 @@ class TestJacobian:
         benchmark(f, x_test)
 
 
+class TestSparseJacobian:
+    def test_banded(self):
+        x = vector("x", shape=(8,), dtype="float64")
+        y = exp(x[:-2]) - 2 * x[1:-1] + x[2:] ** 2
+
+        pattern = jacobian_sparsity(y, x)
+        expected = np.zeros((6, 8), dtype=bool)
+        for i in range(6):
+            expected[i, i : i + 3] = True
+        np.testing.assert_array_equal(pattern.toarray(), expected)
+        assert _color_rows(pattern)[1] == 3
+
+        x_val = np.linspace(0, 1, 8)
+        res = function([x], sparse_jacobian(y, x))(x_val)
+        assert isinstance(res, scipy.sparse.csr_matrix)
+        np.testing.assert_allclose(
+            res.toarray(), function([x], jacobian(y, x, vectorize=True))(x_val)
+        )
+
+    def test_block_diagonal(self):
+        x = vector("x", shape=(8,), dtype="float64")
+        y = pt_sum(x.reshape((4, 2)) ** 2, axis=1)
+
+        pattern = jacobian_sparsity(y, x)
+        np.testing.assert_array_equal(
+            pattern.toarray(), np.kron(np.eye(4), np.ones((1, 2)))
+        )
+        assert _color_rows(pattern)[1] == 1
+
+        x_val = np.arange(8.0)
+        res = function([x], sparse_jacobian(y, x))(x_val)
+        np.testing.assert_allclose(
+            res.toarray(), np.kron(np.eye(4), np.ones((1, 2))) * 2 * x_val
+        )
+
+    def test_sparsity_rules(self):
+        x = vector("x", shape=(6,), dtype="float64")
+
+        a = np.eye(6) + np.eye(6, k=1)
+        np.testing.assert_array_equal(
+            jacobian_sparsity(dot(a, tanh(x)), x).toarray(), a != 0
+        )
+        np.testing.assert_array_equal(
+            jacobian_sparsity(ptb.concatenate([x[:2], x[4:] * 2]), x).toarray(),
+            np.eye(6)[[0, 1, 4, 5]],
+        )
+        # Unknown `Op`s make every output depend on all of their inputs
+        np.testing.assert_array_equal(
+            jacobian_sparsity(pytensor.tensor.sort(x[:3]) + x[3:], x).toarray(),
+            np.hstack([np.ones((3, 3)), np.eye(3)]),
+        )
+        # Constants don't depend on `wrt`
+        y = x[:3] * 2
+        np.testing.assert_array_equal(
+            jacobian_sparsity(y + x[3:], x, consider_constant=[y]).toarray(),
+            np.eye(3, 6, k=3),
+        )
+
+        with pytest.raises(ValueError, match="must be known"):
+            jacobian_sparsity(vector("z") * x, x)
+
+    def test_given_sparsity(self):
+        x = vector("x", dtype="float64")
+        y = x[1:] * x[:-1]
+
+        pattern = np.eye(4, 5, dtype=bool) | np.eye(4, 5, k=1, dtype=bool)
+        x_val = np.arange(5.0)
+        res = function([x], sparse_jacobian(y, x, sparsity=pattern))(x_val)
+        np.testing.assert_allclose(
+            res.toarray(), function([x], jacobian(y, x, vectorize=True))(x_val)
+        )
+
+    @pytest.mark.parametrize("sparse", (True, False), ids=("sparse", "dense"))
+    def test_benchmark(self, sparse, benchmark):
+        n = 200
+        x = vector("x", shape=(n,), dtype="float64")
+        y = x[:-2] * exp(x[1:-1]) - x[2:] ** 2
+
+        if sparse:
+            jac = sparse_jacobian(y, x)
+            benchmark.extra_info["n_colors"] = _color_rows(jacobian_sparsity(y, x))[1]
+        else:
+            jac = jacobian(y, x, vectorize=True)
+        fn = function([x], jac, trust_input=True)
+        benchmark(fn, np.linspace(0, 1, n))
+
+
 def test_hessian():
     x = vector()
     y = pt_sum(x**2)
@@ -1206,3 +1409,64 @@ class TestHessianVectorProduct:
         hessp_x_eval, hessp_y_eval = hessp_fn(**test)
         np.testing.assert_allclose(hessp_x_eval, [2, 4, 6])
         np.testing.assert_allclose(hessp_y_eval, [-6, -4, -2])
+
+
+class TestBatchedVerifyGrad:
+    @staticmethod
+    def fun(a, b):
+        return tanh(a @ b) * exp(a).sum(0).mean()
+
+    def values(self):
+        rng = np.random.default_rng(2081)
+        return [rng.normal(size=(5, 4)), rng.normal(size=(4,))]
+
+    def test_numeric_grad(self):
+        x_val, y_val = self.values()
+
+        def f(x, y):
+            return np.sum(np.sin(x) * y[..., None, :], axis=(-2, -1))
+
+        expected = numeric_grad(f, [x_val, y_val]).gf
+        for batch_size in (1, 7, 100):
+            res = numeric_grad(f, [x_val, y_val], batch_size=batch_size).gf
+            for r, e in zip(res, expected, strict=True):
+                np.testing.assert_allclose(r, e)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"batch_size": 8},
+            {"n_directions": 10},
+            {"n_directions": 10, "batch_size": 3},
+        ],
+    )
+    def test_verify_grad(self, kwargs):
+        verify_grad(self.fun, self.values(), rng=np.random.default_rng(1), **kwargs)
+
+    @pytest.mark.parametrize("kwargs", [{"batch_size": 8}, {"n_directions": 10}])
+    def test_wrong_grad(self, kwargs):
+        with pytest.raises(GradientError):
+            verify_grad(
+                lambda a, b: grad_scale(self.fun(a, b), 1.5),
+                self.values(),
+                rng=np.random.default_rng(1),
+                **kwargs,
+            )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"batch_size": 256}, {"n_directions": 16}],
+    ids=["loop", "batched", "directional"],
+)
+def test_verify_grad_benchmark(kwargs, benchmark):
+    rng = np.random.default_rng(2081)
+    values = [rng.normal(size=(100, 100)), rng.normal(size=(100,))]
+    benchmark(
+        verify_grad,
+        TestBatchedVerifyGrad.fun,
+        values,
+        n_tests=1,
+        rng=rng,
+        **kwargs,
+    )
@@ -28,6 +28,7 @@ from pytensor.graph.basic import Apply
 from pytensor.graph.op import Op
 from pytensor.tensor.math import argmax, dot
 from pytensor.tensor.math import max as pt_max
+from pytensor.tensor.math import min as pt_min
 from pytensor.tensor.type import matrix, vector
 from tests import unittest_tools as utt
 
@@ -212,6 +213,28 @@ class TestRopLop(RopLopChecker):
         self.check_mat_rop_lop(pt_max(self.mx, axis=0), (self.mat_in_shape[1],))
         self.check_mat_rop_lop(pt_max(self.mx, axis=1), (self.mat_in_shape[0],))
 
+    def test_max_multiple_axes(self):
+        self.check_mat_rop_lop(
+            pt_max(self.mx[None], axis=(0, 2)), (self.mat_in_shape[0],)
+        )
+
+    def test_min(self):
+        self.check_mat_rop_lop(pt_min(self.mx, axis=0), (self.mat_in_shape[1],))
+        self.check_mat_rop_lop(pt_min(self.mx, axis=1), (self.mat_in_shape[0],))
+
+    def test_prod(self):
+        # The second derivative of `prod` isn't implemented, so this can only
+        # be computed in forward mode
+        y = pt.prod(self.mx, axis=1)
+        rop_f = function([self.mx, self.mv], Rop(y, self.mx, self.mv))
+
+        vx = np.array([[1.0, 2.0, 3.0], [0.0, 2.0, 3.0], [0.0, 0.0, 3.0]])
+        vv = np.array([[1.0, 1.0, 2.0], [1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+        np.testing.assert_allclose(
+            rop_f(vx.astype(config.floatX), vv.astype(config.floatX)),
+            [6 + 3 + 4, 6, 0],
+        )
+
     def test_argmax(self):
         self.check_nondiff_rop(argmax(self.mx, axis=1), self.mx, self.mv)
 
@@ -407,3 +430,81 @@ class TestRopLop(RopLopChecker):
                 use_op_rop_implementation=use_op_rop_implementation,
                 disconnected_outputs="raise",
             )
+
+
+def test_rop_through_pullback():
+    # `CumOp` doesn't implement `R_op`, so only its own node is differentiated
+    # through its pullback
+    x = vector("x")
+    v = vector("v")
+    y = pt.cumsum(pt.exp(x))
+
+    yv = Rop(y, x, v, use_op_rop_implementation=True)
+    fn = function([x, v], yv)
+    vx = np.array([0.0, 1.0, 2.0], dtype=config.floatX)
+    vv = np.array([1.0, 2.0, 3.0], dtype=config.floatX)
+    np.testing.assert_allclose(fn(vx, vv), np.cumsum(np.exp(vx) * vv), rtol=1e-6)
+
+
+def _spd(x):
+    return x @ x.mT + 5 * pt.eye(x.shape[-1])
+
+
+@pytest.mark.parametrize(
+    "f",
+    [
+        lambda x: pt.linalg.cholesky(_spd(x)),
+        lambda x: pt.linalg.cholesky(_spd(x), lower=False),
+        lambda x: pt.linalg.solve(_spd(x), x[..., 0], b_ndim=1),
+        lambda x: pt.linalg.solve_triangular(_spd(x), x, lower=True),
+        lambda x: pt.linalg.solve_triangular(x, x**2, unit_diagonal=True),
+        lambda x: pt.linalg.det(_spd(x)),
+        lambda x: pt.linalg.inv(_spd(x)),
+    ],
+    ids=[
+        "cholesky",
+        "cholesky_upper",
+        "solve",
+        "solve_triangular",
+        "unit",
+        "det",
+        "inv",
+    ],
+)
+@pytest.mark.parametrize("batched", (False, True))
+def test_linalg_rop(f, batched):
+    x = pt.tensor("x", shape=(2, 3, 3) if batched else (3, 3))
+    v = x.type("v")
+    y = f(x)
+
+    yv = Rop(y, x, v, use_op_rop_implementation=True)
+    yv_through_lop = Rop(y, x, v, use_op_rop_implementation=False)
+    fn = function([x, v], [yv, yv_through_lop])
+
+    rng = np.random.default_rng(utt.fetch_seed())
+    vx = rng.normal(size=x.type.shape).astype(config.floatX)
+    vv = rng.normal(size=x.type.shape).astype(config.floatX)
+    res, expected = fn(vx, vv)
+    np.testing.assert_allclose(res, expected, rtol=1e-5, atol=1e-8)
+
+
+@pytest.mark.parametrize(
+    "use_op_rop_implementation", (True, False), ids=("forward", "pullback")
+)
+def test_rop_benchmark(use_op_rop_implementation, benchmark):
+    rng = np.random.default_rng(utt.fetch_seed())
+    x = matrix("x")
+    v = matrix("v")
+
+    y = x
+    for _ in range(10):
+        y = pt.tanh(dot(y, rng.normal(size=(32, 32)) / 8) + pt.exp(-(y**2)))
+    y = pt.linalg.solve(_spd(y), y.sum(axis=0), b_ndim=1)
+
+    yv = Rop(y, x, v, use_op_rop_implementation=use_op_rop_implementation)
+    fn = function([x, v], yv, trust_input=True)
+    benchmark.extra_info["n_nodes"] = len(fn.maker.fgraph.apply_nodes)
+
+    vx = rng.normal(size=(32, 32)).astype(config.floatX)
+    vv = rng.normal(size=(32, 32)).astype(config.floatX)
+    benchmark(fn, vx, vv)